@@ -1,9 +1,13 @@
+from collections import deque
+
 VERSION = "1.0.0-dev"
 PROJECT_NAME = "artix-ocean"
 FRAPPE_VERSION = None
 current_path = None
 updated_path = None
-LOG_BUFFER = []
+# entries of the dynamic feed, only the latest are kept as older ones are never redrawn
+LOG_BUFFER_SIZE = 500
+LOG_BUFFER = deque(maxlen=LOG_BUFFER_SIZE)
 
 
 def set_frappe_version(ocean_path="."):
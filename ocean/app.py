@@ -9,7 +9,8 @@ import sys
 import typing
 from collections import OrderedDict
 from datetime import date
-from functools import lru_cache
+from functools import lru_cache, partial
+from shlex import split
 from urllib.parse import urlparse
 
 # imports - third party imports
@@ -18,25 +19,34 @@ import git
 
 # imports - module imports
 import ocean
-from ocean.exceptions import NotInOceanDirectoryError
+from ocean.exceptions import CommandFailedError, NotInOceanDirectoryError
 from ocean.utils import (
 	UNSET_ARG,
+	_dict,
+	exec_cmd,
+	exec_cmd_with_log,
 	fetch_details_from_tag,
 	get_available_folder_name,
+	get_cmd_output,
 	is_ocean_directory,
 	is_git_url,
 	is_valid_frappe_branch,
 	log,
 	run_frappe_cmd,
 )
-from ocean.utils.ocean import build_assets, install_python_dev_dependencies
-from ocean.utils.render import step
+from ocean.utils.ocean import (
+	build_assets,
+	install_python_dev_dependencies,
+	update_yarn_packages,
+)
+from ocean.utils.render import job, step
 
 if typing.TYPE_CHECKING:
 	from ocean.ocean import Ocean
 
 
 logger = logging.getLogger(ocean.PROJECT_NAME)
+DEFAULT_PULL_JOBS = 4
 
 
 class AppMeta:
@@ -178,24 +188,61 @@ class App(AppMeta):
 
 	@step(title="Fetching App {repo}", success="App {repo} Fetched")
 	def get(self):
+		fetch_txt = f"Getting {self.repo}"
+		click.secho(fetch_txt, fg="yellow")
+		logger.log(fetch_txt)
+
+		self.clone()
+
+	def clone(self, log_file=None):
+		"""Clones or links the app into the ocean's apps. If log_file is passed, output of
+		the commands is written to it instead of the terminal, so that apps can be cloned
+		from multiple threads without rendering anything"""
 		branch = f"--branch {self.tag}" if self.tag else ""
 		shallow = "--depth 1" if self.ocean.shallow_clone else ""
+		apps_path = os.path.join(self.ocean.name, "apps")
 
-		if not self.soft_link:
-			cmd = "git clone"
-			args = f"{self.url} {branch} {shallow} --origin upstream"
+		if log_file:
+			run = partial(exec_cmd_with_log, log_file=log_file)
 		else:
-			cmd = "ln -s"
-			args = f"{self.name}"
+			run = self.ocean.run
 
-		fetch_txt = f"Getting {self.repo}"
-		click.secho(fetch_txt, fg="yellow")
-		logger.log(fetch_txt)
+		if self.soft_link:
+			return run(f"ln -s {self.name}", cwd=apps_path)
 
-		self.ocean.run(
-			f"{cmd} {args}",
-			cwd=os.path.join(self.ocean.name, "apps"),
-		)
+		args = f"{self.url} {branch} {shallow} --origin upstream"
+
+		with self.use_mirror(run) as mirror_path:
+			if mirror_path and shallow:
+				# a shallow clone of the local mirror, file:// as --depth is ignored for paths
+				args = f"file://{mirror_path} {self.repo} {branch} {shallow} --origin upstream"
+			elif mirror_path:
+				# only objects missing from the mirror are downloaded, --dissociate copies the
+				# rest so the clone doesn't break when the mirror is evicted
+				args = f"--reference {mirror_path} --dissociate {args}"
+
+			run(f"git clone {args}", cwd=apps_path)
+
+		if mirror_path and shallow:
+			run(f"git remote set-url upstream {self.url}", cwd=os.path.join(apps_path, self.repo))
+
+		if mirror_path:
+			from ocean.utils.git_cache import DEFAULT_GIT_CACHE_SIZE, evict_mirrors
+
+			evict_mirrors(self.ocean.conf.get("git_cache_size") or DEFAULT_GIT_CACHE_SIZE)
+
+	def use_mirror(self, run=exec_cmd):
+		"""Context manager yielding path of the host's git mirror of the app updated to its
+		remote, if git_cache is enabled in common_site_config.json, else None. Commands are
+		run with run."""
+		from contextlib import nullcontext
+
+		from ocean.utils.git_cache import use_mirror
+
+		if not self.ocean.conf.get("git_cache") or self.on_disk or self.from_apps:
+			return nullcontext()
+
+		return use_mirror(self.url, run=run)
 
 	@step(title="Archiving App {repo}", success="App {repo} Archived")
 	def remove(self, no_backup: bool = False):
@@ -228,6 +275,7 @@ class App(AppMeta):
 		resolved=False,
 		restart_ocean=True,
 		ignore_resolution=False,
+		skip_pip=False,
 	):
 		import ocean.cli
 		from ocean.utils.app import get_app_name
@@ -248,6 +296,7 @@ class App(AppMeta):
 			skip_assets=skip_assets,
 			restart_ocean=restart_ocean,
 			resolution=self.local_resolution,
+			skip_pip=skip_pip,
 		)
 
 	@step(title="Cloning and installing {repo}", success="App {repo} Installed")
@@ -347,15 +396,16 @@ def get_app(
 	soft_link=False,
 	init_ocean=False,
 	resolve_deps=False,
+	jobs=1,
 ):
 	"""ocean get-app clones a Frappe App from remote (GitHub or any other git server),
 	and installs it on the current ocean. This also resolves dependencies based on the
-	apps' required_apps defined in the hooks.py file.
+	apps' required_apps defined in the hooks.py file. With jobs > 1, the resolved apps
+	are cloned concurrently before being installed in dependency order.
 
 	If the ocean_path is not a ocean directory, a new ocean is created named using the
 	git_url parameter.
 	"""
-	import ocean as _ocean
 	import ocean.cli as ocean_cli
 	from ocean.ocean import Ocean
 	from ocean.utils.app import check_existing_dir
@@ -400,13 +450,10 @@ def get_app(
 		ocean_setup = True
 
 	if ocean_setup and ocean_cli.from_command_line and ocean_cli.dynamic_feed:
-		_ocean.LOG_BUFFER.append(
-			{
-				"message": f"Fetching App {repo_name}",
-				"prefix": click.style("⏼", fg="bright_yellow"),
-				"is_parent": True,
-				"color": None,
-			}
+		from ocean.utils.render import get_feed
+
+		get_feed().add(
+			f"Fetching App {repo_name}", click.style("⏼", fg="bright_yellow"), is_parent=True
 		)
 
 	if resolve_deps:
@@ -416,6 +463,7 @@ def get_app(
 			ocean_path=ocean_path,
 			skip_assets=skip_assets,
 			verbose=verbose,
+			jobs=jobs,
 		)
 		return
 
@@ -451,9 +499,12 @@ def install_resolved_deps(
 	ocean_path=".",
 	skip_assets=False,
 	verbose=False,
+	jobs=1,
 ):
 	from ocean.utils.app import check_existing_dir
 
+	to_install = []
+
 	if "frappe" in resolution:
 		# Terminal dependency
 		del resolution["frappe"]
@@ -512,7 +563,56 @@ def install_resolved_deps(
 				shutil.rmtree(path_to_app)
 			else:
 				continue
-		app.install_resolved_apps(skip_assets=skip_assets, verbose=verbose)
+
+		if jobs > 1:
+			to_install.append(app)
+		else:
+			app.install_resolved_apps(skip_assets=skip_assets, verbose=verbose)
+
+	if not to_install:
+		return
+
+	# clone everything at once, installs still happen in order of dependency
+	clone_resolved_apps(to_install, jobs=jobs)
+
+	for app in to_install:
+		app.install(skip_assets=skip_assets, verbose=verbose, resolved=True)
+
+
+@job(title="Fetching Resolved Apps", success="Resolved Apps Fetched")
+def clone_resolved_apps(apps: typing.List[App], jobs: int = 4):
+	"""Clones apps concurrently using a bounded thread pool of size jobs. Only the git
+	commands run in the pool, with output in logs/get-app/{repo}.log, progress is printed
+	from this thread in the order of apps. Every clone is attempted even if some fail,
+	the failures are raised together at the end."""
+	from concurrent.futures import ThreadPoolExecutor
+
+	failed = []
+
+	with ThreadPoolExecutor(max_workers=jobs) as executor:
+		futures = [
+			(
+				app,
+				executor.submit(
+					app.clone,
+					log_file=os.path.join(app.ocean.name, "logs", "get-app", f"{app.repo}.log"),
+				),
+			)
+			for app in apps
+		]
+
+		for app, future in futures:
+			try:
+				future.result()
+			except Exception:
+				logger.warning(f"fetching {app.repo} failed", exc_info=True)
+				log(f"Fetching {app.repo} failed, see logs/get-app/{app.repo}.log", level=2)
+				failed.append(app.repo)
+			else:
+				log(f"Fetched {app.repo}", level=1)
+
+	if failed:
+		raise CommandFailedError(f"Failed to fetch apps: {', '.join(failed)}")
 
 
 def new_app(app, no_git=None, ocean_path="."):
@@ -551,9 +651,11 @@ def install_app(
 	restart_ocean=True,
 	skip_assets=False,
 	resolution=UNSET_ARG,
+	skip_pip=False,
 ):
 	import ocean.cli as ocean_cli
 	from ocean.ocean import Ocean
+	from ocean.utils.wheels import get_wheelhouse_args
 
 	install_text = f"Installing {app}"
 	click.secho(install_text, fg="yellow")
@@ -570,19 +672,22 @@ def install_app(
 	cache_flag = "--no-cache-dir" if no_cache else ""
 
 	app_path = os.path.realpath(os.path.join(ocean_path, "apps", app))
+	wheelhouse_args = get_wheelhouse_args(conf)
 
-	ocean.run(
-		f"{ocean.python} -m pip install {quiet_flag} --upgrade -e {app_path} {cache_flag}"
-	)
+	# python dependencies may have been installed for a batch of apps already
+	if not skip_pip:
+		ocean.run(
+			f"{ocean.python} -m pip install {quiet_flag} --upgrade {wheelhouse_args} -e {app_path} {cache_flag}"
+		)
 
 	if conf.get("developer_mode"):
 		install_python_dev_dependencies(apps=app, ocean_path=ocean_path, verbose=verbose)
 
 	if os.path.exists(os.path.join(app_path, "package.json")):
-		yarn_install = "yarn install --verbose" if verbose else "yarn install"
-		ocean.run(yarn_install, cwd=app_path)
+		update_yarn_packages(ocean_path=ocean_path, apps=[app], verbose=verbose)
 
 	ocean.apps.sync(app_name=app, required=resolution, branch=tag, app_dir=app_path)
+	ocean.apps.update_fingerprint(app)
 
 	if not skip_assets:
 		build_assets(ocean_path=ocean_path, app=app)
@@ -593,15 +698,22 @@ def install_app(
 		ocean.reload(_raise=False)
 
 
-def pull_apps(apps=None, ocean_path=".", reset=False):
-	"""Check all apps if there no local changes, pull"""
+def pull_apps(apps=None, ocean_path=".", reset=False, jobs=None, timeout=None):
+	"""Check all apps if there no local changes, pull
+
+	Remote changes for all apps are fetched concurrently using `jobs` workers (each fetch
+	is killed after `timeout` seconds if set), the fetched changes are then merged or
+	reset into each app serially.
+	"""
 	from ocean.ocean import Ocean
 	from ocean.utils.app import get_current_branch, get_remote
 
 	ocean = Ocean(ocean_path)
 	rebase = "--rebase" if ocean.conf.get("rebase_on_pull") else ""
+	shallow_clone = ocean.conf.get("shallow_clone")
 	apps = apps or ocean.apps
 	excluded_apps = ocean.excluded_apps
+	jobs = jobs or DEFAULT_PULL_JOBS
 
 	# check for local changes
 	if not reset:
@@ -629,13 +741,15 @@ Here are your choices:
 					)
 					sys.exit(1)
 
+	to_pull = []
+
 	for app in apps:
 		if app in excluded_apps:
 			print(f"Skipping pull for app {app}")
 			continue
 		app_dir = get_repo_dir(app, ocean_path=ocean_path)
 		if os.path.exists(os.path.join(app_dir, ".git")):
-			remote = get_remote(app)
+			remote = get_remote(app, ocean_path=ocean_path)
 			if not remote:
 				# remote is False, i.e. remote doesn't exist, add the app to excluded_apps.txt
 				add_to_excluded_apps_txt(app, ocean_path=ocean_path)
@@ -645,28 +759,131 @@ Here are your choices:
 				)
 				continue
 
-			if not ocean.conf.get("shallow_clone") or not reset:
+			fetch_cmds = []
+			if not shallow_clone or not reset:
 				is_shallow = os.path.exists(os.path.join(app_dir, ".git", "shallow"))
 				if is_shallow:
 					s = " to safely pull remote changes." if not reset else ""
 					print(f"Unshallowing {app}{s}")
-					ocean.run(f"git fetch {remote} --unshallow", cwd=app_dir)
+					fetch_cmds.append(f"git fetch {remote} --unshallow")
 
 			branch = get_current_branch(app, ocean_path=ocean_path)
-			logger.log(f"pulling {app}")
-			if reset:
-				reset_cmd = f"git reset --hard {remote}/{branch}"
-				if ocean.conf.get("shallow_clone"):
-					ocean.run(f"git fetch --depth=1 --no-tags {remote} {branch}", cwd=app_dir)
-					ocean.run(reset_cmd, cwd=app_dir)
-					ocean.run("git reflog expire --all", cwd=app_dir)
-					ocean.run("git gc --prune=all", cwd=app_dir)
-				else:
-					ocean.run("git fetch --all", cwd=app_dir)
-					ocean.run(reset_cmd, cwd=app_dir)
+			if reset and shallow_clone:
+				fetch_cmds.append(f"git fetch --depth=1 --no-tags {remote} {branch}")
+			elif reset:
+				fetch_cmds.append("git fetch --all")
 			else:
-				ocean.run(f"git pull {rebase} {remote} {branch}", cwd=app_dir)
-			ocean.run('find . -name "*.pyc" -delete', cwd=app_dir)
+				fetch_cmds.append(f"git fetch {remote} {branch}")
+
+			to_pull.append(
+				_dict(app=app, app_dir=app_dir, remote=remote, branch=branch, fetch_cmds=fetch_cmds)
+			)
+
+	fetch_apps(to_pull, jobs=jobs, timeout=timeout)
+
+	for app in to_pull:
+		if app.error:
+			continue
+
+		app.old_head = get_cmd_output("git rev-parse HEAD", cwd=app.app_dir)
+		logger.log(f"pulling {app.app}")
+		if reset:
+			ocean.run(f"git reset --hard {app.remote}/{app.branch}", cwd=app.app_dir)
+			if shallow_clone:
+				ocean.run("git reflog expire --all", cwd=app.app_dir)
+				ocean.run("git gc --prune=all", cwd=app.app_dir)
+		else:
+			merge_cmd = "git rebase FETCH_HEAD" if rebase else get_merge_cmd(app.app_dir)
+			try:
+				ocean.run(merge_cmd, cwd=app.app_dir)
+			except CommandFailedError:
+				app.error = f"couldn't be merged with {app.remote}/{app.branch}, pull it manually"
+				log(f"Pulling {app.app} failed: {app.error}", level=2)
+				continue
+		ocean.run('find . -name "*.pyc" -delete', cwd=app.app_dir)
+
+		app.new_head = get_cmd_output("git rev-parse HEAD", cwd=app.app_dir)
+		app.commits = int(
+			get_cmd_output(f"git rev-list --count {app.old_head}..{app.new_head}", cwd=app.app_dir)
+			or 0
+		)
+
+	print_pull_summary(to_pull)
+
+	failed = [app.app for app in to_pull if app.error]
+	if failed:
+		raise CommandFailedError(f"Failed to update apps: {', '.join(failed)}")
+
+
+def get_merge_cmd(app_dir) -> str:
+	"""Returns the command to merge fetched changes into the app the way git pull would
+	with the repo's pull.rebase & pull.ff, fast-forward only if neither is set"""
+	if get_cmd_output("git config --bool pull.rebase", cwd=app_dir, _raise=False) == "true":
+		return "git rebase FETCH_HEAD"
+
+	pull_ff = get_cmd_output("git config pull.ff", cwd=app_dir, _raise=False)
+	if pull_ff == "false":
+		return "git merge --no-ff --no-edit FETCH_HEAD"
+	if pull_ff == "true":
+		return "git merge --no-edit FETCH_HEAD"
+	return "git merge --ff-only FETCH_HEAD"
+
+
+def fetch_apps(apps: typing.List[dict], jobs: int = DEFAULT_PULL_JOBS, timeout: int = None):
+	"""Runs each app's `fetch_cmds` using a pool of `jobs` threads, sets `error` on the
+	apps for which fetching failed or timed out instead of raising"""
+	from concurrent.futures import ThreadPoolExecutor
+
+	def _fetch(app):
+		for cmd in app.fetch_cmds:
+			click.secho(f"$ {cmd}", fg="bright_black")
+			logger.debug(f"cd {app.app_dir} && {cmd}")
+			try:
+				subprocess.run(
+					split(cmd),
+					cwd=app.app_dir,
+					capture_output=True,
+					check=True,
+					timeout=timeout,
+					# output is captured, a credentials prompt would hang till the timeout
+					env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+				)
+			except subprocess.TimeoutExpired:
+				app.error = f"timed out after {timeout}s"
+			except subprocess.CalledProcessError as e:
+				app.error = (e.stderr or b"").decode("utf-8").strip() or f"exit code {e.returncode}"
+
+			if app.error:
+				logger.warning(f"{cmd} failed for {app.app}: {app.error}")
+				log(f"Fetching {app.app} failed: {app.error}", level=2)
+				return
+
+	if not apps:
+		return
+
+	with ThreadPoolExecutor(max_workers=min(jobs, len(apps))) as executor:
+		list(executor.map(_fetch, apps))
+
+
+def print_pull_summary(apps: typing.List[dict]):
+	from ocean.utils.render import render_table
+
+	if not apps:
+		return
+
+	rows = []
+	for app in apps:
+		if app.error:
+			status, commits = "failed", "-"
+		elif app.commits:
+			status, commits = "updated", app.commits
+		elif app.old_head != app.new_head:
+			status, commits = "reset", 0
+		else:
+			status, commits = "up to date", 0
+		rows.append([app.app, app.branch, status, commits])
+
+	print("\n" + render_table(["App", "Branch", "Status", "Commits"], rows) + "\n")
 
 
 def use_rq(ocean_path):
@@ -1,5 +1,6 @@
 # imports - standard imports
 import atexit
+from collections import deque
 from contextlib import contextmanager
 from logging import Logger
 import os
@@ -36,7 +37,7 @@ dynamic_feed = False
 verbose = False
 is_envvar_warn_set = None
 from_command_line = False  # set when commands are executed via the CLI
-ocean.LOG_BUFFER = []
+ocean.LOG_BUFFER = deque(maxlen=ocean.LOG_BUFFER_SIZE)
 
 change_uid_msg = "You should not run this command as root"
 src = os.path.dirname(__file__)
@@ -72,7 +72,9 @@ ocean_command.add_command(switch_to_develop)
 
 
 from ocean.commands.utils import (
+	autoscale,
 	backup_all_sites,
+	clear_command_cache,
 	ocean_src,
 	disable_production,
 	download_translations,
@@ -108,6 +110,8 @@ ocean_command.add_command(disable_production)
 ocean_command.add_command(ocean_src)
 ocean_command.add_command(find_oceanes)
 ocean_command.add_command(migrate_env)
+ocean_command.add_command(clear_command_cache)
+ocean_command.add_command(autoscale)
 
 from ocean.commands.setup import setup
 
@@ -127,3 +131,7 @@ ocean_command.add_command(remote_urls)
 from ocean.commands.install import install
 
 ocean_command.add_command(install)
+
+from ocean.commands.wheels import wheels
+
+ocean_command.add_command(wheels)
@@ -55,6 +55,46 @@ def config_http_timeout(seconds):
 	update_config({"http_timeout": seconds})
 
 
+@click.command(
+	"gunicorn_workers",
+	help="Recommend gunicorn workers, threads & worker class for the CPU and memory limits",
+)
+@click.option(
+	"--measure",
+	is_flag=True,
+	default=False,
+	help="Size workers by the memory used by the running gunicorn workers",
+)
+@click.option(
+	"--set", "set_config", is_flag=True, default=False, help="Save the recommendation"
+)
+def config_gunicorn_workers(measure, set_config):
+	from ocean.config.common_site_config import (
+		get_cpu_limit,
+		get_gunicorn_worker_rss,
+		get_gunicorn_workers,
+		get_memory_limit,
+	)
+
+	worker_rss = None
+	if measure:
+		worker_rss = get_gunicorn_worker_rss(".")
+		if not worker_rss:
+			click.secho("No running gunicorn workers found to measure", fg="yellow")
+
+	recommendation = get_gunicorn_workers(worker_rss)
+	if worker_rss:
+		recommendation["gunicorn_worker_rss"] = worker_rss
+
+	click.echo(f"CPUs: {get_cpu_limit()}, memory: {get_memory_limit() // 1024 ** 2} MB")
+	for key, value in recommendation.items():
+		click.echo(f"{key}: {value}")
+
+	if set_config:
+		update_config(recommendation)
+		click.echo("Run `ocean setup supervisor` or `ocean setup systemd` to apply")
+
+
 @click.command("set-common-config", help="Set value in common config")
 @click.option("configs", "-c", "--config", multiple=True, type=(str, str))
 def set_common_config(configs):
@@ -95,5 +135,6 @@ config.add_command(config_dns_multitenant)
 config.add_command(config_rebase_on_pull)
 config.add_command(config_serve_default_site)
 config.add_command(config_http_timeout)
+config.add_command(config_gunicorn_workers)
 config.add_command(set_common_config)
 config.add_command(remove_common_config)
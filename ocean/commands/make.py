@@ -1,6 +1,9 @@
 # imports - third party imports
 import click
 
+# imports - module imports
+from ocean.utils.cli import SugaredOption
+
 
 @click.command("init", help="Initialize a new ocean instance in the specified path")
 @click.argument("path")
@@ -45,6 +48,11 @@ import click
 	default=False,
 	help="Enable developer mode and install development dependencies.",
 )
+@click.option(
+	"--profile-steps",
+	is_flag=True,
+	help="Print time & resources taken by each step of the setup at the end",
+)
 def init(
 	path,
 	apps_path,
@@ -61,10 +69,12 @@ def init(
 	python="python3",
 	install_app=None,
 	dev=False,
+	profile_steps=False,
 ):
 	import os
 
 	from ocean.utils import log
+	from ocean.utils.render import print_step_timings_on_exit
 	from ocean.utils.system import init
 
 	if not ignore_exist and os.path.exists(path):
@@ -72,22 +82,23 @@ def init(
 		return
 
 	try:
-		init(
-			path,
-			apps_path=apps_path,  # can be used from --config flag? Maybe config file could have more info?
-			no_procfile=no_procfile,
-			no_backups=no_backups,
-			frappe_path=frappe_path,
-			frappe_branch=frappe_branch,
-			install_app=install_app,
-			clone_from=clone_from,
-			skip_redis_config_generation=skip_redis_config_generation,
-			clone_without_update=clone_without_update,
-			skip_assets=skip_assets,
-			python=python,
-			verbose=verbose,
-			dev=dev,
-		)
+		with print_step_timings_on_exit(profile_steps):
+			init(
+				path,
+				apps_path=apps_path,  # can be used from --config flag? Maybe config file could have more info?
+				no_procfile=no_procfile,
+				no_backups=no_backups,
+				frappe_path=frappe_path,
+				frappe_branch=frappe_branch,
+				install_app=install_app,
+				clone_from=clone_from,
+				skip_redis_config_generation=skip_redis_config_generation,
+				clone_without_update=clone_without_update,
+				skip_assets=skip_assets,
+				python=python,
+				verbose=verbose,
+				dev=dev,
+			)
 		log(f"ocean {path} initialized", level=1)
 	except SystemExit:
 		raise
@@ -151,6 +162,15 @@ def drop(path):
 	default=False,
 	help="Resolve dependencies before installing app",
 )
+@click.option(
+	"--jobs",
+	"-j",
+	type=click.IntRange(min=1),
+	default=1,
+	help="Number of resolved apps to clone concurrently",
+	only_if_set=["resolve_deps"],
+	cls=SugaredOption,
+)
 def get_app(
 	git_url,
 	branch,
@@ -160,6 +180,7 @@ def get_app(
 	soft_link=False,
 	init_ocean=False,
 	resolve_deps=False,
+	jobs=1,
 ):
 	"clone an app from the internet and set it up in your ocean"
 	from ocean.app import get_app
@@ -172,6 +193,7 @@ def get_app(
 		soft_link=soft_link,
 		init_ocean=init_ocean,
 		resolve_deps=resolve_deps,
+		jobs=jobs,
 	)
 
 
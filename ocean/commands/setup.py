@@ -39,10 +39,25 @@ def setup_sudoers(user):
 @click.option(
 	"--yes", help="Yes to regeneration of nginx config file", default=False, is_flag=True
 )
-def setup_nginx(yes=False, logging="combined", log_format=None):
-	from bench.config.nginx import make_nginx_conf
+@click.option(
+	"--quiet", "-q", is_flag=True, default=False, help="Don't print the ports assigned to sites"
+)
+@click.option(
+	"--port-report",
+	type=click.Path(dir_okay=False, writable=True, allow_dash=True),
+	help="Write the ports assigned to sites as JSON to this file. Use - for stdout",
+)
+def setup_nginx(yes=False, logging="combined", log_format=None, quiet=False, port_report=None):
+	from ocean.config.nginx import make_nginx_conf
 
-	make_nginx_conf(bench_path=".", yes=yes, logging=logging, log_format=log_format)
+	make_nginx_conf(
+		ocean_path=".",
+		yes=yes,
+		logging=logging,
+		log_format=log_format,
+		quiet=quiet,
+		port_report=port_report,
+	)
 
 
 @click.command("reload-nginx", help="Checks NGINX config file and reloads service")
@@ -213,28 +228,33 @@ def setup_socketio():
 	default=False,
 	is_flag=True,
 )
+@click.option(
+	"--batch/--no-batch",
+	default=None,
+	help="Install python dependencies of all apps with a single pip install, after checking for conflicts with a dry run. Defaults to batch_pip_install from common config",
+)
 @click.argument("apps", nargs=-1)
-def setup_requirements(node=False, python=False, dev=False, apps=None):
+def setup_requirements(node=False, python=False, dev=False, apps=None, batch=None):
 	"""
 	Setup Python and Node dependencies.
 
 	You can optionally specify one or more apps to setup dependencies for.
 	"""
-	from bench.bench import Ocean
+	from ocean.ocean import Ocean
 
 	bench = Ocean(".")
 
 	if not (node or python or dev):
-		bench.setup.requirements(apps=apps)
+		bench.setup.requirements(apps=apps, batch=batch)
 
 	elif not node and not dev:
-		bench.setup.python(apps=apps)
+		bench.setup.python(apps=apps, batch=batch)
 
 	elif not python and not dev:
 		bench.setup.node(apps=apps)
 
 	else:
-		from ocean.utils.bench import install_python_dev_dependencies
+		from ocean.utils.ocean import install_python_dev_dependencies
 
 		install_python_dev_dependencies(apps=apps)
 
@@ -17,7 +17,12 @@ from ocean.utils.ocean import post_upgrade, patch_sites, build_assets
 @click.option(
 	"--requirements",
 	is_flag=True,
-	help="Update requirements. If run alone, equivalent to `ocean setup requirements`",
+	help="Update requirements of apps whose dependency manifests changed since they were last installed",
+)
+@click.option(
+	"--force-requirements",
+	is_flag=True,
+	help="Reinstall requirements of all apps, even if their dependencies haven't changed",
 )
 @click.option(
 	"--restart-supervisor", is_flag=True, help="Restart supervisor processes after update"
@@ -41,34 +46,69 @@ from ocean.utils.ocean import post_upgrade, patch_sites, build_assets
 	is_flag=True,
 	help="Hard resets git branch's to their new states overriding any changes and overriding rebase on pull",
 )
+@click.option(
+	"--jobs",
+	"-j",
+	type=click.IntRange(min=1),
+	default=None,
+	help="Number of apps to fetch updates for concurrently (default: 4)",
+)
+@click.option(
+	"--migrate-jobs",
+	type=click.IntRange(min=1),
+	default=1,
+	help="Number of sites to migrate concurrently, with output written to logs/migrate/ if more than 1",
+)
+@click.option(
+	"--fetch-timeout",
+	type=click.IntRange(min=1),
+	default=None,
+	help="Seconds after which fetching updates for an app is aborted",
+)
+@click.option(
+	"--profile-steps",
+	is_flag=True,
+	help="Print time & resources taken by each step of the update at the end",
+)
 def update(
 	pull,
 	apps,
 	patch,
 	build,
 	requirements,
+	force_requirements,
 	restart_supervisor,
 	restart_systemd,
 	no_backup,
 	no_compile,
 	force,
 	reset,
+	jobs,
+	migrate_jobs,
+	fetch_timeout,
+	profile_steps,
 ):
 	from ocean.utils.ocean import update
+	from ocean.utils.render import print_step_timings_on_exit
 
-	update(
-		pull=pull,
-		apps=apps,
-		patch=patch,
-		build=build,
-		requirements=requirements,
-		restart_supervisor=restart_supervisor,
-		restart_systemd=restart_systemd,
-		backup=not no_backup,
-		compile=not no_compile,
-		force=force,
-		reset=reset,
-	)
+	with print_step_timings_on_exit(profile_steps):
+		update(
+			pull=pull,
+			apps=apps,
+			patch=patch,
+			build=build,
+			requirements=requirements or force_requirements,
+			force_requirements=force_requirements,
+			restart_supervisor=restart_supervisor,
+			restart_systemd=restart_systemd,
+			backup=not no_backup,
+			compile=not no_compile,
+			force=force,
+			reset=reset,
+			jobs=jobs,
+			migrate_jobs=migrate_jobs,
+			fetch_timeout=fetch_timeout,
+		)
 
 
 @click.command("retry-upgrade", help="Retry a failed upgrade")
@@ -32,13 +32,31 @@ def start(no_dev, concurrency, procfile, no_prefix, man):
 @click.option("--web", is_flag=True, default=False)
 @click.option("--supervisor", is_flag=True, default=False)
 @click.option("--systemd", is_flag=True, default=False)
-def restart(web, supervisor, systemd):
-	from ocean.ocean import ocean
+@click.option(
+	"--rolling/--no-rolling",
+	default=None,
+	help="Gracefully reload gunicorn and restart workers in batches. Defaults to rolling_restart in common_site_config",
+)
+def restart(web, supervisor, systemd, rolling):
+	from ocean.ocean import Ocean
 
 	if not systemd and not web:
 		supervisor = True
 
-	ocean(".").reload(web, supervisor, systemd)
+	Ocean(".").reload(web, supervisor, systemd, rolling=rolling)
+
+
+@click.command(
+	"autoscale", help="Scale background workers up & down based on queued jobs"
+)
+@click.option("--once", is_flag=True, default=False, help="Poll queues once and exit")
+@click.option(
+	"--dry-run", is_flag=True, default=False, help="Only log how workers would be scaled"
+)
+def autoscale(once, dry_run):
+	from ocean.utils.autoscale import autoscale
+
+	autoscale(ocean_path=".", once=once, dry_run=dry_run)
 
 
 @click.command("set-nginx-port", help="Set NGINX port for site")
@@ -135,10 +153,26 @@ def renew_lets_encrypt():
 
 
 @click.command("backup-all-sites", help="Backup all sites in current ocean")
-def backup_all_sites():
+@click.option(
+	"--jobs",
+	"-j",
+	type=click.IntRange(min=1),
+	help="Number of sites to backup concurrently. Defaults to backup_jobs from common config or 1",
+)
+@click.option(
+	"--nice",
+	type=click.IntRange(min=-20, max=19),
+	help="CPU scheduling niceness for backup processes. Defaults to backup_nice from common config",
+)
+@click.option(
+	"--ionice-class",
+	type=click.Choice(["2", "3"]),
+	help="I/O scheduling class for backup processes: 2 (best-effort) or 3 (idle). Defaults to backup_ionice_class from common config",
+)
+def backup_all_sites(jobs=None, nice=None, ionice_class=None):
 	from ocean.utils.system import backup_all_sites
 
-	backup_all_sites(ocean_path=".")
+	backup_all_sites(ocean_path=".", jobs=jobs, nice=nice, ionice_class=ionice_class)
 
 
 @click.command(
@@ -161,10 +195,39 @@ def ocean_src():
 
 @click.command("find", help="Finds oceanes recursively from location")
 @click.argument("location", default="")
-def find_oceanes(location):
+@click.option(
+	"--max-depth", type=int, help="Levels below location to look in, unlimited by default"
+)
+@click.option(
+	"--jobs",
+	type=click.IntRange(min=1),
+	help="Number of directories to scan concurrently",
+)
+@click.option(
+	"--json",
+	"as_json",
+	is_flag=True,
+	help="Print apps, sites & frappe version of found oceanes as JSON",
+)
+def find_oceanes(location, max_depth=None, jobs=None, as_json=False):
+	import json
+
 	from ocean.utils import find_oceanes
 
-	find_oceanes(directory=location)
+	oceanes = find_oceanes(directory=location, max_depth=max_depth, jobs=jobs, quiet=as_json)
+
+	if as_json:
+		click.echo(json.dumps(oceanes, indent=1))
+
+
+@click.command(
+	"clear-command-cache",
+	help="Clears cached framework commands, regenerated on the next command run",
+)
+def clear_command_cache():
+	from ocean.utils import clear_command_cache
+
+	clear_command_cache(ocean_path=".")
 
 
 @click.command(
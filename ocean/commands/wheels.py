@@ -0,0 +1,24 @@
+# imports - third party imports
+import click
+
+
+@click.group(help="Manage the host's wheelhouse of prebuilt python packages")
+def wheels():
+	pass
+
+
+@click.command(
+	"build",
+	help="Build wheels of the dependencies of all or given apps into the wheelhouse, /var/cache/ocean/wheels if writable else the user's cache. Set use_wheelhouse (and wheelhouse_only to stay offline) in common_site_config.json to install from it",
+)
+@click.argument("apps", nargs=-1)
+@click.option("--verbose", is_flag=True, default=False)
+def build_wheels(apps, verbose=False):
+	from ocean.utils import log
+	from ocean.utils.wheels import build_wheels, get_wheelhouse
+
+	wheels = build_wheels(ocean_path=".", apps=list(apps), verbose=verbose)
+	log(f"{len(wheels)} wheels in {get_wheelhouse()}", level=1)
+
+
+wheels.add_command(build_wheels)
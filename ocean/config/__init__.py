@@ -1,7 +1,33 @@
 """Module for setting up system and respective ocean configurations"""
+# imports - standard imports
+import os
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def env():
+	"""Returns the Jinja environment for config templates, shared across the process.
+	Compiled templates are cached on disk per ocean version, see get_bytecode_cache"""
 	from jinja2 import Environment, PackageLoader
 
-	return Environment(loader=PackageLoader("ocean.config"))
+	return Environment(
+		loader=PackageLoader("ocean.config"), bytecode_cache=get_bytecode_cache()
+	)
+
+
+def get_bytecode_cache():
+	from jinja2 import FileSystemBytecodeCache
+
+	from ocean import VERSION
+	from ocean.utils import get_cache_path
+
+	cache_dir = get_cache_path("jinja", VERSION)
+
+	try:
+		os.makedirs(cache_dir, exist_ok=True)
+	except OSError:
+		# templates are still compiled in memory, just not shared across runs
+		return None
+
+	return FileSystemBytecodeCache(cache_dir)
+
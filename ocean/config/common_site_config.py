@@ -1,7 +1,9 @@
 # imports - standard imports
 import getpass
 import json
+import math
 import os
+from contextlib import contextmanager
 
 default_config = {
 	"restart_supervisor_on_update": False,
@@ -15,7 +17,24 @@ default_config = {
 	"live_reload": True,
 }
 
+default_ports = {
+	"webserver_port": 8000,
+	"socketio_port": 9000,
+	"file_watcher_port": 6787,
+	"redis_queue": 11000,
+	"redis_cache": 13000,
+	"redis_socketio": 13000,
+}
+redis_port_keys = ("redis_cache", "redis_queue", "redis_socketio")
+# shared by all users of the host if its directory exists & is writable, it isn't
+# created here as making it writable for every user that runs ocean is up to the admin
+HOST_PORT_REGISTRY = "/var/lib/ocean/ports.json"
+
 DEFAULT_MAX_REQUESTS = 5000
+DEFAULT_GUNICORN_WORKER_RSS = 256 * 1024 * 1024
+# rest of the memory is left for background workers, redis & the database
+GUNICORN_MEMORY_FRACTION = 0.5
+MAX_GUNICORN_THREADS = 4
 
 
 def setup_config(ocean_path, additional_config=None):
@@ -58,12 +77,123 @@ def get_config_path(ocean_path):
 	return os.path.join(ocean_path, "sites", "common_site_config.json")
 
 
-def get_gunicorn_workers():
-	"""This function will return the maximum workers that can be started depending upon
-	number of cpu's present on the machine"""
-	import multiprocessing
-
-	return {"gunicorn_workers": multiprocessing.cpu_count() * 2 + 1}
+def get_gunicorn_workers(worker_rss=None):
+	"""Returns the gunicorn workers, threads & worker class that fit the machine or container.
+
+	Workers are capped at 2 * CPUs + 1, CPUs being the cgroup CPU quota if any, and at
+	as many workers of worker_rss bytes (defaults to DEFAULT_GUNICORN_WORKER_RSS) as
+	fit in GUNICORN_MEMORY_FRACTION of the memory limit. When memory is what limits
+	workers, the gthread worker class makes up for the missing concurrency with threads.
+	"""
+	cpus = get_cpu_limit()
+	memory = get_memory_limit()
+	worker_rss = worker_rss or DEFAULT_GUNICORN_WORKER_RSS
+
+	cpu_workers = cpus * 2 + 1
+	memory_workers = max(int(memory * GUNICORN_MEMORY_FRACTION // worker_rss), 1)
+	workers = min(cpu_workers, memory_workers)
+
+	if workers < cpu_workers:
+		return {
+			"gunicorn_workers": workers,
+			"gunicorn_threads": min(math.ceil(cpu_workers / workers), MAX_GUNICORN_THREADS),
+			"gunicorn_worker_class": "gthread",
+		}
+
+	return {"gunicorn_workers": workers, "gunicorn_threads": 1, "gunicorn_worker_class": "sync"}
+
+
+def get_gunicorn_config(config) -> dict:
+	"""Returns gunicorn sizing from common_site_config, filling in recommended values. If
+	gunicorn_workers is already set, sync workers are assumed as existing setups expect"""
+	if "gunicorn_workers" in config:
+		recommended = {
+			"gunicorn_workers": config["gunicorn_workers"],
+			"gunicorn_threads": 1,
+			"gunicorn_worker_class": "sync",
+		}
+	else:
+		recommended = get_gunicorn_workers(config.get("gunicorn_worker_rss"))
+
+	return {key: config.get(key, value) for key, value in recommended.items()}
+
+
+def get_gunicorn_preload(config) -> bool:
+	"""Returns if gunicorn should preload the app. It's off by default with
+	rolling_restart, as a preloaded app only loads new code when gunicorn restarts"""
+	return bool(config.get("gunicorn_preload", not config.get("rolling_restart")))
+
+
+def get_cpu_limit() -> int:
+	"""Returns CPUs available to this process, honouring cgroup v2 & v1 CPU quotas"""
+	try:
+		cpus = len(os.sched_getaffinity(0))
+	except AttributeError:
+		cpus = os.cpu_count() or 1
+
+	quota = period = None
+	try:
+		with open("/sys/fs/cgroup/cpu.max") as f:
+			quota, period = f.read().split()
+	except (OSError, ValueError):
+		try:
+			with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+				quota = f.read().strip()
+			with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+				period = f.read().strip()
+		except OSError:
+			pass
+
+	if quota and quota not in ("max", "-1"):
+		cpus = min(cpus, max(math.ceil(int(quota) / int(period)), 1))
+
+	return cpus
+
+
+def get_memory_limit() -> int:
+	"""Returns memory in bytes available to this process, the cgroup limit if lower than
+	physical memory"""
+	memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+	for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+		try:
+			with open(path) as f:
+				limit = f.read().strip()
+		except OSError:
+			continue
+
+		# cgroup v1 reports no limit as a huge number
+		if limit.isdigit():
+			memory = min(memory, int(limit))
+		break
+
+	return memory
+
+
+def get_gunicorn_worker_rss(ocean_path=".") -> int:
+	"""Returns the average RSS in bytes of the ocean's running gunicorn workers, if any"""
+	gunicorn = os.path.join(os.path.abspath(ocean_path), "env", "bin", "gunicorn")
+	processes = {}
+
+	for pid in filter(str.isdigit, os.listdir("/proc")):
+		try:
+			with open(f"/proc/{pid}/cmdline") as f:
+				if gunicorn not in f.read():
+					continue
+			with open(f"/proc/{pid}/status") as f:
+				status = dict(line.split(":", 1) for line in f if ":" in line)
+		except OSError:
+			continue
+
+		# zombies & kernel threads have no memory of their own
+		if not status.get("VmRSS"):
+			continue
+		processes[pid] = (status["PPid"].strip(), int(status["VmRSS"].split()[0]) * 1024)
+
+	# workers are the processes whose parent is gunicorn too, the master is left out
+	workers = [rss for ppid, rss in processes.values() if ppid in processes]
+	if workers:
+		return sum(workers) // len(workers)
 
 
 def compute_max_requests_jitter(max_requests: int) -> int:
@@ -81,7 +211,7 @@ def get_default_max_requests(worker_count: int):
 
 
 def update_config_for_frappe(config, ocean_path):
-	ports = make_ports(ocean_path)
+	ports = make_ports(ocean_path, config)
 
 	for key in ("redis_cache", "redis_queue", "redis_socketio"):
 		if key not in config:
@@ -92,50 +222,167 @@ def update_config_for_frappe(config, ocean_path):
 			config[key] = ports[key]
 
 
-def make_ports(ocean_path):
+def make_ports(ocean_path, config=None):
+	"""Returns ports for the ocean, allocated from the host's port registry. Ports already
+	set in config are kept & registered as they are. Allocation is done under a lock, so
+	oceanes created concurrently never get the same ports, and ports something is already
+	listening on are skipped."""
+	from urllib.parse import urlparse
+
+	ocean_path = os.path.abspath(ocean_path)
+	config = config or {}
+
+	with port_registry(ocean_path) as registry:
+		oceanes = registry["oceanes"]
+		ports = oceanes.get(ocean_path, {}).copy()
+
+		for key in default_ports:
+			value = config.get(key)
+			if value and key in redis_port_keys:
+				value = urlparse(value).port
+			if value:
+				ports[key] = value
+
+		other_oceanes = [used for path, used in oceanes.items() if path != ocean_path]
+		reserved = {port for used in other_oceanes for port in used.values()}
+
+		for key, default in default_ports.items():
+			if key in ports:
+				continue
+
+			# Backward compatbility: always keep redis_cache and redis_socketio port same
+			# Note: not required from v15
+			if key == "redis_socketio":
+				ports[key] = ports["redis_cache"]
+				continue
+
+			# new port value = max of existing port value + 1
+			port = max([used[key] for used in other_oceanes if key in used] or [default - 1]) + 1
+			while port in reserved or port in ports.values() or is_port_in_use(port):
+				port += 1
+			ports[key] = port
+
+		oceanes[ocean_path] = ports
+
+	return ports
+
+
+def release_ports(ocean_path):
+	"""Removes the ocean's ports from the host's port registry"""
+	with port_registry() as registry:
+		registry["oceanes"].pop(os.path.abspath(ocean_path), None)
+
+
+@contextmanager
+def port_registry(ocean_path="."):
+	"""Yields the host's port registry locked for exclusive use, changes to it are saved
+	on exit. Oceanes that don't exist anymore are dropped from it. A new registry starts
+	with the ports of oceanes next to ocean_path, as does one that can't be read.
+
+	{"oceanes": {"/home/frappe/ocean-1": {"webserver_port": 8000, ...}}}
+	"""
+	import fcntl
+	import logging
+
+	import ocean
+
+	registry_path = get_port_registry_path()
+	os.makedirs(os.path.dirname(registry_path), exist_ok=True)
+
+	# opened read only, as the lock file may have been created by another user
+	lock = os.open(f"{registry_path}.lock", os.O_RDONLY | os.O_CREAT, 0o666)
+
+	try:
+		fcntl.flock(lock, fcntl.LOCK_EX)
+
+		try:
+			with open(registry_path) as f:
+				registry = json.load(f)
+			registry["oceanes"].items()
+		except FileNotFoundError:
+			registry = {"oceanes": get_sibling_ports(ocean_path)}
+		except (ValueError, TypeError, KeyError, AttributeError):
+			# starting empty would hand out ports registered oceanes are using
+			logging.getLogger(ocean.PROJECT_NAME).warning(
+				f"Port registry {registry_path} is corrupt, rebuilding it from oceanes next"
+				f" to {os.path.abspath(ocean_path)}"
+			)
+			registry = {"oceanes": get_sibling_ports(ocean_path)}
+
+		registry["oceanes"] = {
+			path: ports for path, ports in registry["oceanes"].items() if os.path.isdir(path)
+		}
+
+		yield registry
+
+		tmp_path = f"{registry_path}.{os.getpid()}.tmp"
+		with open(tmp_path, "w") as f:
+			json.dump(registry, f, indent=1, sort_keys=True)
+		os.replace(tmp_path, registry_path)
+	finally:
+		os.close(lock)
+
+
+def get_port_registry_path():
+	"""Returns OCEAN_PORT_REGISTRY if set, else the host wide registry if it's writable,
+	else the user's, which only knows of oceanes of that user"""
+	from ocean.utils import get_cache_path
+
+	if os.environ.get("OCEAN_PORT_REGISTRY"):
+		return os.environ["OCEAN_PORT_REGISTRY"]
+
+	if os.access(os.path.dirname(HOST_PORT_REGISTRY), os.W_OK):
+		return HOST_PORT_REGISTRY
+
+	return get_cache_path("ports.json")
+
+
+def get_sibling_ports(ocean_path="."):
+	"""Returns ports of oceanes next to ocean_path, to seed a new port registry with the
+	ports oceanes set up before it existed are using"""
 	from urllib.parse import urlparse
 
 	oceanes_path = os.path.dirname(os.path.abspath(ocean_path))
+	oceanes = {}
 
-	default_ports = {
-		"webserver_port": 8000,
-		"socketio_port": 9000,
-		"file_watcher_port": 6787,
-		"redis_queue": 11000,
-		"redis_socketio": 13000,
-		"redis_cache": 13000,
-	}
-
-	# collect all existing ports
-	existing_ports = {}
 	for folder in os.listdir(oceanes_path):
-		ocean_path = os.path.join(oceanes_path, folder)
-		if os.path.isdir(ocean_path):
-			ocean_config = get_config(ocean_path)
-			for key in list(default_ports.keys()):
-				value = ocean_config.get(key)
+		path = os.path.join(oceanes_path, folder)
+		if not os.path.isdir(path):
+			continue
 
-				# extract port from redis url
-				if value and (key in ("redis_cache", "redis_queue", "redis_socketio")):
-					value = urlparse(value).port
+		try:
+			ocean_config = get_config(path)
+		except ValueError:
+			continue
 
-				if value:
-					existing_ports.setdefault(key, []).append(value)
+		ports = {}
+		for key in default_ports:
+			value = ocean_config.get(key)
 
-	# new port value = max of existing port value + 1
-	ports = {}
-	for key, value in list(default_ports.items()):
-		existing_value = existing_ports.get(key, [])
-		if existing_value:
-			value = max(existing_value) + 1
+			# extract port from redis url
+			if value and key in redis_port_keys:
+				value = urlparse(value).port
 
-		ports[key] = value
+			if value:
+				ports[key] = value
 
-	# Backward compatbility: always keep redis_cache and redis_socketio port same
-	# Note: not required from v15
-	ports["redis_socketio"] = ports["redis_cache"]
+		if ports:
+			oceanes[path] = ports
 
-	return ports
+	return oceanes
+
+
+def is_port_in_use(port, host="127.0.0.1") -> bool:
+	import socket
+
+	with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+		# ports of connections in TIME_WAIT are free to listen on
+		sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+		try:
+			sock.bind((host, port))
+		except OSError:
+			return True
+	return False
 
 
 def make_pid_folder(ocean_path):
@@ -1,7 +1,8 @@
 # imports - standard imports
 import hashlib
+import json
+import logging
 import os
-import random
 import string
 
 # imports - third party imports
@@ -13,22 +14,31 @@ import ocean.config
 from ocean.ocean import Ocean
 from ocean.utils import get_ocean_name
 
+logger = logging.getLogger(ocean.PROJECT_NAME)
+NGINX_MANIFEST = "nginx.manifest.json"
+NGINX_SITE_CONFIG_KEYS = ("nginx_port", "ssl_certificate", "ssl_certificate_key", "domains")
 
-def make_nginx_conf(ocean_path, yes=False, logging=None, log_format=None):
-	conf_path = os.path.join(ocean_path, "config", "nginx.conf")
 
-	if not yes and os.path.exists(conf_path):
-		if not click.confirm(
-			"nginx.conf already exists and this will overwrite it. Do you want to continue?"
-		):
-			return
+def make_nginx_conf(
+	ocean_path, yes=False, logging=None, log_format=None, quiet=False, port_report=None
+) -> bool:
+	"""Generates config/nginx.conf for the ocean. Site configs and rendered server blocks
+	of sites are cached in config/nginx.manifest.json so that only sites whose config
+	changed are re-read and re-rendered. Returns False if the generated config is the
+	same as the existing one, in which case the file isn't rewritten (or reloaded).
+
+	quiet and port_report are passed on to prepare_sites"""
+	conf_path = os.path.join(ocean_path, "config", "nginx.conf")
 
 	template = ocean.config.env().get_template("nginx.conf")
 	ocean_path = os.path.abspath(ocean_path)
 	sites_path = os.path.join(ocean_path, "sites")
 
 	config = Ocean(ocean_path).conf
-	sites = prepare_sites(config, ocean_path)
+	manifest = get_nginx_manifest(ocean_path)
+	sites = prepare_sites(
+		config, ocean_path, manifest=manifest, quiet=quiet, port_report=port_report
+	)
 	ocean_name = get_ocean_name(ocean_path)
 
 	allow_rate_limiting = config.get("allow_rate_limiting", False)
@@ -36,14 +46,15 @@ def make_nginx_conf(ocean_path, yes=False, logging=None, log_format=None):
 	template_vars = {
 		"sites_path": sites_path,
 		"http_timeout": config.get("http_timeout"),
-		"sites": sites,
 		"webserver_port": config.get("webserver_port"),
 		"socketio_port": config.get("socketio_port"),
 		"ocean_name": ocean_name,
 		"error_pages": get_error_pages(),
 		"allow_rate_limiting": allow_rate_limiting,
-		# for nginx map variable
-		"random_string": "".join(random.choice(string.ascii_lowercase) for i in range(7)),
+		# for nginx map variable, unique per ocean but stable across generations
+		"random_string": "".join(
+			string.ascii_lowercase[int(c, 16)] for c in hashlib.sha1(ocean_path.encode()).hexdigest()[:7]
+		),
 	}
 
 	if logging and logging != "none":
@@ -55,16 +66,111 @@ def make_nginx_conf(ocean_path, yes=False, logging=None, log_format=None):
 	if allow_rate_limiting:
 		template_vars.update(
 			{
-				"ocean_name_hash": hashlib.sha256(ocean_name).hexdigest()[:16],
+				"ocean_name_hash": hashlib.sha256(ocean_name.encode()).hexdigest()[:16],
 				"limit_conn_shared_memory": get_limit_conn_shared_memory(),
 			}
 		)
 
-	nginx_conf = template.render(**template_vars)
+	nginx_conf = render_nginx_conf(template, template_vars, sites, manifest)
+
+	if os.path.exists(conf_path):
+		with open(conf_path) as f:
+			if f.read() == nginx_conf:
+				put_nginx_manifest(manifest, ocean_path)
+				return False
+
+		if not yes and not click.confirm(
+			"nginx.conf already exists and this will overwrite it. Do you want to continue?"
+		):
+			return False
 
 	with open(conf_path, "w") as f:
 		f.write(nginx_conf)
 
+	put_nginx_manifest(manifest, ocean_path)
+
+	return True
+
+
+def render_nginx_conf(template, template_vars, sites, manifest) -> str:
+	"""Renders nginx.conf & appends server blocks of sites that use SSL or a port, which
+	the template leaves out. Blocks are rendered one at a time with its server_block
+	macro, reusing those from the manifest whose inputs haven't changed"""
+	template_source = template.environment.loader.get_source(
+		template.environment, template.name
+	)[0]
+	template_key = get_hash([template_source, template_vars])
+
+	# shared parts: upstreams, maps & blocks for sites that use dns or wildcard ssl
+	nginx_conf = template.render(sites=sites, **template_vars)
+
+	module = None
+	blocks = {}
+	block_kwargs = []
+	site_name_variable = "$host"
+	if sites.get("domain_map"):
+		site_name_variable = f"$site_name_{template_vars['random_string']}"
+
+	for site in sites["that_use_ssl"]:
+		block_kwargs.append(
+			{
+				"port": 443,
+				"server_names": [site.get("domain") or site["name"]],
+				"site_name": site_name_variable,
+				"ssl_certificate": site["ssl_certificate"],
+				"ssl_certificate_key": site["ssl_certificate_key"],
+			}
+		)
+
+	for site in sites["that_use_port"]:
+		block_kwargs.append(
+			{"port": site["port"], "server_names": [site["name"]], "site_name": site["name"]}
+		)
+
+	cached_blocks = manifest.get("blocks", {})
+	for kwargs in block_kwargs:
+		key = get_hash([template_key, kwargs])
+		if key not in cached_blocks:
+			if not module:
+				module = template.make_module({**template_vars, "sites": {}})
+			cached_blocks[key] = str(
+				module.server_block(
+					template_vars["ocean_name"], sites_path=template_vars["sites_path"], **kwargs
+				)
+			)
+		blocks[key] = cached_blocks[key]
+		nginx_conf += "\n" + blocks[key]
+
+	# only keep blocks used in this generation
+	manifest["blocks"] = blocks
+
+	return nginx_conf.rstrip("\n") + "\n"
+
+
+def get_nginx_manifest(ocean_path) -> dict:
+	try:
+		with open(os.path.join(ocean_path, "config", NGINX_MANIFEST)) as f:
+			manifest = json.load(f)
+	except (OSError, ValueError):
+		manifest = {}
+
+	if manifest.get("version") != ocean.VERSION:
+		manifest = {"version": ocean.VERSION}
+
+	return manifest
+
+
+def put_nginx_manifest(manifest, ocean_path):
+	try:
+		with open(os.path.join(ocean_path, "config", NGINX_MANIFEST), "w") as f:
+			json.dump(manifest, f)
+	except OSError:
+		logger.warning("Couldn't write nginx manifest", exc_info=True)
+
+
+def get_hash(value) -> str:
+	return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
 
 def make_ocean_manager_nginx_conf(ocean_path, yes=False, port=23624, domain=None):
 	from ocean.config.site_config import get_site_config
@@ -105,7 +211,12 @@ def make_ocean_manager_nginx_conf(ocean_path, yes=False, port=23624, domain=None
 		myfile.write(ocean_manager_nginx_conf)
 
 
-def prepare_sites(config, ocean_path):
+def prepare_sites(config, ocean_path, manifest=None, quiet=False, port_report=None):
+	"""Groups sites by how nginx serves them. Sites of a port based ocean without an
+	nginx_port are assigned the first free port, starting from 80 and then 8001.
+
+	The port assignment is printed unless quiet is set. If port_report is passed, it is
+	written there as JSON instead, `-` writes it to stdout"""
 	sites = {
 		"that_use_port": [],
 		"that_use_dns": [],
@@ -114,21 +225,20 @@ def prepare_sites(config, ocean_path):
 	}
 
 	domain_map = {}
+	# port: [site names]
 	ports_in_use = {}
 
 	dns_multitenant = config.get("dns_multitenant")
-
-	shared_port_exception_found = False
-	sites_configs = get_sites_with_config(ocean_path=ocean_path)
+	sites_configs = get_sites_with_config(ocean_path=ocean_path, manifest=manifest)
 
 	# preload all preset site ports to avoid conflicts
-
 	if not dns_multitenant:
 		for site in sites_configs:
 			if site.get("port"):
-				if not site["port"] in ports_in_use:
-					ports_in_use[site["port"]] = []
-				ports_in_use[site["port"]].append(site["name"])
+				ports_in_use.setdefault(site["port"], []).append(site["name"])
+
+	# ports are only ever added, so the next free port never moves backwards
+	next_port = 8001
 
 	for site in sites_configs:
 		if dns_multitenant:
@@ -155,57 +265,72 @@ def prepare_sites(config, ocean_path):
 
 		else:
 			if not site.get("port"):
-				site["port"] = 80
-				if site["port"] in ports_in_use:
-					site["port"] = 8001
-				while site["port"] in ports_in_use:
-					site["port"] += 1
-
-			if site["port"] in ports_in_use and not site["name"] in ports_in_use[site["port"]]:
-				shared_port_exception_found = True
-				ports_in_use[site["port"]].append(site["name"])
-			else:
-				ports_in_use[site["port"]] = []
-				ports_in_use[site["port"]].append(site["name"])
+				if 80 not in ports_in_use:
+					site["port"] = 80
+				else:
+					while next_port in ports_in_use:
+						next_port += 1
+					site["port"] = next_port
+				ports_in_use[site["port"]] = [site["name"]]
 
 			sites["that_use_port"].append(site)
 
-	if not dns_multitenant and shared_port_exception_found:
-		message = "Port conflicts found:"
-		port_conflict_index = 0
-		for port_number in ports_in_use:
-			if len(ports_in_use[port_number]) > 1:
-				port_conflict_index += 1
-				message += f"\n{port_conflict_index} - Port {port_number} is shared among sites:"
-				for site_name in ports_in_use[port_number]:
-					message += f" {site_name}"
-		raise Exception(message)
-
 	if not dns_multitenant:
-		message = "Port configuration list:"
-		for site in sites_configs:
-			message += f"\n\nSite {site['name']} assigned port: {site['port']}"
+		conflicts = {port: names for port, names in ports_in_use.items() if len(names) > 1}
+		if conflicts:
+			message = ["Port conflicts found:"]
+			for idx, (port, names) in enumerate(conflicts.items(), start=1):
+				message.append(f"{idx} - Port {port} is shared among sites: {' '.join(names)}")
+			raise Exception("\n".join(message))
 
-		print(message)
+		site_ports = {site["name"]: site["port"] for site in sites_configs}
+
+		if port_report:
+			write_port_report(site_ports, port_report)
+
+		if not quiet and port_report != "-":
+			print(
+				"Port configuration list:\n"
+				+ "\n".join(f"Site {site} assigned port: {port}" for site, port in site_ports.items())
+			)
 
 	sites["domain_map"] = domain_map
 
 	return sites
 
 
-def get_sites_with_config(ocean_path):
+def write_port_report(site_ports, path):
+	report = json.dumps(
+		[{"site": site, "port": port} for site, port in site_ports.items()], indent=1
+	)
+
+	if path == "-":
+		print(report)
+		return
+
+	with open(path, "w") as f:
+		f.write(report)
+
+
+def get_sites_with_config(ocean_path, manifest=None):
+	"""Returns the nginx related config of all sites. If a manifest is passed, site configs
+	are only read for sites whose site_config.json changed since the manifest was built"""
 	from ocean.ocean import Ocean
-	from ocean.config.site_config import get_site_config
 
 	ocean = Ocean(ocean_path)
 	sites = ocean.sites
 	conf = ocean.conf
 	dns_multitenant = conf.get("dns_multitenant")
 
+	cached_configs = (manifest or {}).get("sites", {})
+	site_configs = {}
+
 	ret = []
 	for site in sites:
 		try:
-			site_config = get_site_config(site, ocean_path=ocean_path)
+			site_config = site_configs[site] = get_nginx_site_config(
+				site, ocean_path=ocean_path, cached=cached_configs.get(site)
+			)
 		except Exception as e:
 			strict_nginx = conf.get("strict_nginx")
 			if strict_nginx:
@@ -239,15 +364,43 @@ def get_sites_with_config(ocean_path):
 				# domain can be a string or a dict with 'domain', 'ssl_certificate', 'ssl_certificate_key'
 				if isinstance(domain, str):
 					domain = {"domain": domain}
+				else:
+					# copy, site configs may be cached in the nginx manifest
+					domain = dict(domain)
 
 				domain["name"] = site
 				ret.append(domain)
 
+	if manifest is not None:
+		manifest["sites"] = site_configs
+
 	use_wildcard_certificate(ocean_path, ret)
 
 	return ret
 
 
+def get_nginx_site_config(site, ocean_path=".", cached=None) -> dict:
+	"""Returns keys of the site's config that are used in nginx.conf along with the stat
+	of site_config.json they were read from. cached is reused if the stat is unchanged"""
+	from ocean.config.site_config import get_site_config
+
+	config_path = os.path.join(ocean_path, "sites", site, "site_config.json")
+	try:
+		stat = os.stat(config_path)
+		stat = [stat.st_mtime_ns, stat.st_size]
+	except FileNotFoundError:
+		stat = None
+
+	if cached and stat and cached.get("_stat") == stat:
+		return cached
+
+	site_config = get_site_config(site, ocean_path=ocean_path)
+	nginx_site_config = {key: site_config.get(key) for key in NGINX_SITE_CONFIG_KEYS}
+	nginx_site_config["_stat"] = stat
+
+	return nginx_site_config
+
+
 def use_wildcard_certificate(ocean_path, ret):
 	"""
 	stored in common_site_config.json as:
@@ -52,9 +52,10 @@ def setup_production(user, ocean_path=".", yes=False):
 		generate_supervisor_config(ocean_path=ocean_path, user=user, yes=yes)
 
 	print("Setting Up NGINX...")
-	make_nginx_conf(ocean_path=ocean_path, yes=yes)
+	nginx_conf_changed = make_nginx_conf(ocean_path=ocean_path, yes=yes)
 	fix_prod_setup_perms(ocean_path, frappe_user=user)
-	remove_default_nginx_configs()
+	if remove_default_nginx_configs():
+		nginx_conf_changed = True
 
 	ocean_name = get_ocean_name(ocean_path)
 	nginx_conf = f"/etc/nginx/conf.d/{ocean_name}.conf"
@@ -77,6 +78,7 @@ def setup_production(user, ocean_path=".", yes=False):
 		os.symlink(
 			os.path.abspath(os.path.join(ocean_path, "config", "nginx.conf")), nginx_conf
 		)
+		nginx_conf_changed = True
 
 	if conf.get("restart_supervisor_on_update"):
 		reload_supervisor()
@@ -84,7 +86,10 @@ def setup_production(user, ocean_path=".", yes=False):
 	if os.environ.get("NO_SERVICE_RESTART"):
 		return
 
-	reload_nginx()
+	if nginx_conf_changed:
+		reload_nginx()
+	else:
+		print("nginx.conf unchanged, skipping nginx reload")
 
 
 def disable_production(ocean_path="."):
@@ -149,14 +154,19 @@ def get_supervisor_confdir():
 
 
 def remove_default_nginx_configs():
+	"""Removes default nginx configs, returns True if any were removed"""
 	default_nginx_configs = [
 		"/etc/nginx/conf.d/default.conf",
 		"/etc/nginx/sites-enabled/default",
 	]
+	removed = False
 
 	for conf_file in default_nginx_configs:
 		if os.path.exists(conf_file):
 			os.unlink(conf_file)
+			removed = True
+
+	return removed
 
 
 def is_centos7():
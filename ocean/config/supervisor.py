@@ -14,10 +14,12 @@ from ocean.config.common_site_config import (
 	compute_max_requests_jitter,
 	get_config,
 	get_default_max_requests,
-	get_gunicorn_workers,
+	get_gunicorn_config,
+	get_gunicorn_preload,
 	update_config,
 )
 from ocean.utils import get_ocean_name, which
+from ocean.utils.autoscale import get_autoscale_config
 
 logger = logging.getLogger(ocean.PROJECT_NAME)
 
@@ -31,13 +33,18 @@ def generate_supervisor_config(ocean_path, user=None, yes=False, skip_redis=Fals
 	template = ocean.config.env().get_template("supervisor.conf")
 	ocean_dir = os.path.abspath(ocean_path)
 
-	web_worker_count = config.get(
-		"gunicorn_workers", get_gunicorn_workers()["gunicorn_workers"]
-	)
+	gunicorn_config = get_gunicorn_config(config)
+	web_worker_count = gunicorn_config["gunicorn_workers"]
 	max_requests = config.get(
 		"gunicorn_max_requests", get_default_max_requests(web_worker_count)
 	)
 
+	multi_queue_consumption = can_enable_multi_queue_consumption(ocean_path)
+	autoscale_queues = get_autoscale_config(config, multi_queue_consumption)["queues"]
+	burst_queues = [
+		queue for queue, queue_conf in autoscale_queues.items() if queue_conf["max"] > queue_conf["min"]
+	]
+
 	config = template.render(
 		**{
 			"ocean_dir": ocean_dir,
@@ -51,14 +58,19 @@ def generate_supervisor_config(ocean_path, user=None, yes=False, skip_redis=Fals
 			"redis_queue_config": os.path.join(ocean_dir, "config", "redis_queue.conf"),
 			"webserver_port": config.get("webserver_port", 8000),
 			"gunicorn_workers": web_worker_count,
+			"gunicorn_threads": gunicorn_config["gunicorn_threads"],
+			"gunicorn_worker_class": gunicorn_config["gunicorn_worker_class"],
 			"gunicorn_max_requests": max_requests,
 			"gunicorn_max_requests_jitter": compute_max_requests_jitter(max_requests),
+			"gunicorn_preload": get_gunicorn_preload(config),
 			"ocean_name": get_ocean_name(ocean_path),
 			"background_workers": config.get("background_workers") or 1,
 			"ocean_cmd": which("ocean"),
 			"skip_redis": skip_redis,
 			"workers": config.get("workers", {}),
-			"multi_queue_consumption": can_enable_multi_queue_consumption(ocean_path),
+			"multi_queue_consumption": multi_queue_consumption,
+			"autoscale_queues": autoscale_queues,
+			"burst_queues": burst_queues,
 		}
 	)
 
@@ -10,12 +10,14 @@ import ocean
 from ocean.app import use_rq
 from ocean.ocean import Ocean
 from ocean.config.common_site_config import (
-	get_gunicorn_workers,
+	get_gunicorn_config,
+	get_gunicorn_preload,
 	update_config,
 	get_default_max_requests,
 	compute_max_requests_jitter,
 )
 from ocean.utils import exec_cmd, which, get_ocean_name
+from ocean.utils.autoscale import get_autoscale_config
 
 
 def generate_systemd_config(
@@ -50,25 +52,18 @@ def generate_systemd_config(
 		return
 
 	number_of_workers = config.get("background_workers") or 1
+	# autoscaled queues only start their min workers, ocean autoscale starts the rest
+	autoscale_queues = get_autoscale_config(config)["queues"]
 	background_workers = []
-	for i in range(number_of_workers):
-		background_workers.append(
-			get_ocean_name(ocean_path) + "-frappe-default-worker@" + str(i + 1) + ".service"
-		)
-
-	for i in range(number_of_workers):
-		background_workers.append(
-			get_ocean_name(ocean_path) + "-frappe-short-worker@" + str(i + 1) + ".service"
-		)
-
-	for i in range(number_of_workers):
-		background_workers.append(
-			get_ocean_name(ocean_path) + "-frappe-long-worker@" + str(i + 1) + ".service"
-		)
-
-	web_worker_count = config.get(
-		"gunicorn_workers", get_gunicorn_workers()["gunicorn_workers"]
-	)
+	for queue in ("default", "short", "long"):
+		queue_workers = autoscale_queues.get(queue, {}).get("min", number_of_workers)
+		for i in range(queue_workers):
+			background_workers.append(
+				get_ocean_name(ocean_path) + f"-frappe-{queue}-worker@" + str(i + 1) + ".service"
+			)
+
+	gunicorn_config = get_gunicorn_config(config)
+	web_worker_count = gunicorn_config["gunicorn_workers"]
 	max_requests = config.get(
 		"gunicorn_max_requests", get_default_max_requests(web_worker_count)
 	)
@@ -85,8 +80,11 @@ def generate_systemd_config(
 		"redis_queue_config": os.path.join(ocean_dir, "config", "redis_queue.conf"),
 		"webserver_port": config.get("webserver_port", 8000),
 		"gunicorn_workers": web_worker_count,
+		"gunicorn_threads": gunicorn_config["gunicorn_threads"],
+		"gunicorn_worker_class": gunicorn_config["gunicorn_worker_class"],
 		"gunicorn_max_requests": max_requests,
 		"gunicorn_max_requests_jitter": compute_max_requests_jitter(max_requests),
+		"gunicorn_preload": get_gunicorn_preload(config),
 		"ocean_name": get_ocean_name(ocean_path),
 		"worker_target_wants": " ".join(background_workers),
 		"ocean_cmd": which("ocean"),
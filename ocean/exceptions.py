@@ -30,6 +30,10 @@ class CannotUpdateReleaseOcean(ValidationError):
 	pass
 
 
+class DependencyConflictError(ValidationError):
+	pass
+
+
 class FeatureDoesNotExistError(CommandFailedError):
 	pass
 
@@ -1,4 +1,5 @@
 # imports - standard imports
+import hashlib
 import subprocess
 from functools import lru_cache
 import os
@@ -14,12 +15,14 @@ from ocean.exceptions import AppNotInstalledError, InvalidRemoteException
 from ocean.config.common_site_config import setup_config
 from ocean.utils import (
 	UNSET_ARG,
+	canonicalize_name,
 	paths_in_ocean,
 	exec_cmd,
 	is_ocean_directory,
-	is_frappe_app,
-	get_cmd_output,
+	get_frappe_apps,
+	get_git_head,
 	get_git_version,
+	get_installed_distributions,
 	log,
 	run_frappe_cmd,
 )
@@ -41,6 +44,14 @@ if TYPE_CHECKING:
 	from ocean.app import App
 
 logger = logging.getLogger(ocean.PROJECT_NAME)
+DEPENDENCY_MANIFESTS = (
+	"pyproject.toml",
+	"setup.py",
+	"setup.cfg",
+	"requirements.txt",
+	"package.json",
+	"yarn.lock",
+)
 
 
 class Base:
@@ -96,7 +107,7 @@ class Ocean(Base, Validator):
 		return [
 			path
 			for path in os.listdir(os.path.join(self.name, "sites"))
-			if os.path.exists(os.path.join("sites", path, "site_config.json"))
+			if os.path.exists(os.path.join(self.name, "sites", path, "site_config.json"))
 		]
 
 	@property
@@ -113,6 +124,7 @@ class Ocean(Base, Validator):
 	def drop(self):
 		self.teardown.backups()
 		self.teardown.dirs()
+		self.teardown.ports()
 
 	def install(self, app, branch=None):
 		from ocean.app import App
@@ -142,28 +154,32 @@ class Ocean(Base, Validator):
 		run_frappe_cmd("build", ocean_path=self.name)
 
 	@step(title="Reloading Ocean Processes", success="Ocean Processes Reloaded")
-	def reload(self, web=False, supervisor=True, systemd=True, _raise=True):
-		"""If web is True, only web workers are restarted"""
+	def reload(self, web=False, supervisor=True, systemd=True, _raise=True, rolling=None):
+		"""If web is True, only web workers are restarted. If rolling is True (defaults to
+		rolling_restart from common_site_config), supervisor processes are restarted in parts
+		so that requests & jobs are still served during the restart"""
 		conf = self.conf
 
+		if rolling is None:
+			rolling = bool(conf.get("rolling_restart"))
+
 		if conf.get("developer_mode"):
 			restart_process_manager(ocean_path=self.name, web_workers=web)
 		if supervisor or conf.get("restart_supervisor_on_update"):
-			restart_supervisor_processes(ocean_path=self.name, web_workers=web, _raise=_raise)
+			restart_supervisor_processes(
+				ocean_path=self.name, web_workers=web, _raise=_raise, rolling=rolling
+			)
 		if systemd and conf.get("restart_systemd_on_update"):
 			restart_systemd_processes(ocean_path=self.name, web_workers=web, _raise=_raise)
 
 	def get_installed_apps(self) -> List:
 		"""Returns list of installed apps on ocean, not in excluded_apps.txt"""
-		try:
-			installed_packages = get_cmd_output(f"{self.python} -m pip freeze", cwd=self.name)
-		except Exception:
-			installed_packages = []
+		installed_packages = get_installed_distributions(self.name)
 
 		return [
 			app
 			for app in self.apps
-			if app not in self.excluded_apps and app in installed_packages
+			if app not in self.excluded_apps and canonicalize_name(app) in installed_packages
 		]
 
 
@@ -182,6 +198,48 @@ class OceanApps(MutableSequence):
 		except FileNotFoundError:
 			self.states = {}
 
+	def get_fingerprint(self, app: str) -> dict:
+		"""Returns what the installed dependencies of an app depend on: the app's commit,
+		hashes of its dependency manifests and the identity of the env they're installed in"""
+		app_path = os.path.join(self.apps_path, app)
+		pyvenv_cfg = os.path.join(self.ocean.name, "env", "pyvenv.cfg")
+		manifests = {}
+
+		for manifest in DEPENDENCY_MANIFESTS:
+			manifest_path = os.path.join(app_path, manifest)
+			if os.path.exists(manifest_path):
+				with open(manifest_path, "rb") as f:
+					manifests[manifest] = hashlib.sha256(f.read()).hexdigest()
+
+		return {
+			"commit_hash": get_git_head(app_path),
+			"manifests": manifests,
+			"env": os.stat(pyvenv_cfg).st_mtime_ns if os.path.exists(pyvenv_cfg) else None,
+		}
+
+	def has_changed_dependencies(self, app: str) -> bool:
+		"""Checks if the dependency manifests of app changed since it was last installed"""
+		installed = self.states.get(app, {}).get("fingerprint")
+		if not installed:
+			return True
+
+		current = self.get_fingerprint(app)
+		return (installed.get("manifests"), installed.get("env")) != (
+			current["manifests"],
+			current["env"],
+		)
+
+	def update_fingerprint(self, app: str):
+		"""Records the fingerprint of app's dependencies in apps.json after an install"""
+		self.set_states()
+		if app not in self.states:
+			return
+
+		self.states[app]["fingerprint"] = self.get_fingerprint(app)
+
+		with open(self.states_path, "w") as f:
+			f.write(json.dumps(self.states, indent=4))
+
 	def update_apps_states(
 		self,
 		app_dir: str = None,
@@ -274,11 +332,7 @@ class OceanApps(MutableSequence):
 
 	def initialize_apps(self):
 		try:
-			self.apps = [
-				x
-				for x in os.listdir(os.path.join(self.ocean.name, "apps"))
-				if is_frappe_app(os.path.join(self.ocean.name, "apps", x))
-			]
+			self.apps = get_frappe_apps(self.ocean.name)
 			self.apps.remove("frappe")
 			self.apps.insert(0, "frappe")
 		except FileNotFoundError:
@@ -449,25 +503,53 @@ class OceanSetup(Base):
 		logger.log("backups were set up")
 
 	@job(title="Setting Up Ocean Dependencies", success="Ocean Dependencies Set Up")
-	def requirements(self, apps=None):
-		"""Install and upgrade specified / all installed apps on given Ocean"""
+	def requirements(self, apps=None, skip_unchanged=False, batch=None):
+		"""Install and upgrade specified / all installed apps on given Ocean
+
+		If skip_unchanged is set, apps whose dependency manifests haven't changed since
+		they were last installed are skipped. If batch is set, or batch_pip_install in
+		common_site_config.json if it isn't passed, python dependencies of all apps are
+		installed with a single pip install
+		"""
 		from ocean.app import App
+		from ocean.utils.ocean import install_python_requirements, update_yarn_packages
 
 		apps = apps or self.ocean.apps
 
+		if skip_unchanged:
+			unchanged = [app for app in apps if not self.ocean.apps.has_changed_dependencies(app)]
+			apps = [app for app in apps if app not in unchanged]
+
+			if unchanged:
+				log(f"Skipping apps with unchanged dependencies: {', '.join(unchanged)}")
+
+			if not apps:
+				return
+
 		self.pip()
 
+		if batch is None:
+			batch = self.ocean.conf.get("batch_pip_install")
+
+		if batch:
+			install_python_requirements(apps, ocean_path=self.ocean.name)
+
+		# node dependencies of all apps at once, installing each app then finds them unchanged
+		update_yarn_packages(ocean_path=self.ocean.name, apps=apps)
+
 		print(f"Installing {len(apps)} applications...")
 
 		for app in apps:
 			path_to_app = os.path.join(self.ocean.name, "apps", app)
 			app = App(path_to_app, ocean=self.ocean, to_clone=False).install(
-				skip_assets=True, restart_ocean=False, ignore_resolution=True
+				skip_assets=True, restart_ocean=False, ignore_resolution=True, skip_pip=batch
 			)
 
-	def python(self, apps=None):
+	def python(self, apps=None, batch=None):
 		"""Install and upgrade Python dependencies for specified / all installed apps on given Ocean"""
 		import ocean.cli
+		from ocean.utils.ocean import install_python_requirements
+		from ocean.utils.wheels import get_wheelhouse_args
 
 		apps = apps or self.ocean.apps
 
@@ -475,10 +557,22 @@ class OceanSetup(Base):
 
 		self.pip()
 
+		if batch is None:
+			batch = self.ocean.conf.get("batch_pip_install")
+
+		if batch:
+			return install_python_requirements(
+				list(apps), ocean_path=self.ocean.name, verbose=ocean.cli.verbose
+			)
+
+		wheelhouse_args = get_wheelhouse_args(self.ocean.conf)
+
 		for app in apps:
 			app_path = os.path.join(self.ocean.name, "apps", app)
 			log(f"\nInstalling python dependencies for {app}", level=3, no_log=True)
-			self.run(f"{self.ocean.python} -m pip install {quiet_flag} --upgrade -e {app_path}")
+			self.run(
+				f"{self.ocean.python} -m pip install {quiet_flag} --upgrade {wheelhouse_args} -e {app_path}"
+			)
 
 	def node(self, apps=None):
 		"""Install and upgrade Node dependencies for specified / all apps on given Ocean"""
@@ -496,3 +590,8 @@ class OceanTearDown:
 
 	def dirs(self):
 		shutil.rmtree(self.ocean.name)
+
+	def ports(self):
+		from ocean.config.common_site_config import release_ports
+
+		release_ports(self.ocean.name)
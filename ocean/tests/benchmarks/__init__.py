@@ -0,0 +1,5 @@
+"""Benchmarks for ocean's hot paths, run against a synthetic ocean
+
+	python -m ocean.tests.benchmarks --sites 1000 --output before.json
+	python -m ocean.tests.benchmarks --sites 1000 --compare before.json
+"""
@@ -0,0 +1,66 @@
+# imports - standard imports
+import json
+
+# imports - third party imports
+import click
+
+# imports - module imports
+from ocean.tests.benchmarks.suite import (
+	BENCHMARKS,
+	compare_results,
+	format_duration,
+	load_results,
+	run_benchmarks,
+)
+from ocean.utils.render import render_table
+
+
+@click.command(help="Benchmark ocean's hot paths against a synthetic ocean")
+@click.argument("names", nargs=-1, type=click.Choice(list(BENCHMARKS)))
+@click.option("--repeat", default=5, help="Timed runs per benchmark")
+@click.option("--apps", default=10, help="Apps in the synthetic ocean")
+@click.option("--sites", default=100, help="Sites in the synthetic ocean")
+@click.option("--oceanes", default=5, help="Oceanes next to the synthetic ocean")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write results as JSON")
+@click.option(
+	"--compare",
+	type=click.Path(exists=True, dir_okay=False),
+	help="JSON results of an earlier run to compare against",
+)
+def main(names, repeat, apps, sites, oceanes, output, compare):
+	results = run_benchmarks(
+		names=names, repeat=repeat, apps=apps, sites=sites, oceanes=oceanes
+	)
+
+	if output:
+		with open(output, "w") as f:
+			json.dump(results, f, indent=1)
+
+	if compare:
+		baseline = load_results(compare)
+		if baseline["meta"]["params"] != results["meta"]["params"]:
+			click.secho("Baseline was run with different parameters", fg="yellow")
+
+		click.echo(
+			render_table(
+				["Benchmark", "Baseline", "Current", "Change"],
+				compare_results(baseline, results),
+			)
+		)
+	else:
+		click.echo(
+			render_table(
+				["Benchmark", "Median", "Min"],
+				[get_result_row(name, result) for name, result in results["results"].items()],
+			)
+		)
+
+
+def get_result_row(name, result) -> list:
+	if "error" in result:
+		return [name, "error", result["error"]]
+	return [name, format_duration(result.get("median")), format_duration(result.get("min"))]
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,96 @@
+# imports - standard imports
+import json
+import os
+
+# imports - module imports
+from ocean.utils import paths_in_app, paths_in_ocean
+
+
+def make_synthetic_ocean(path, apps=10, sites=100, files_per_app=50):
+	"""Creates an ocean directory at path with apps & sites that look real enough for
+	config generation, without any git repos, env or database
+
+	Sites cycle through the site config shapes nginx.conf handles: plain, custom
+	nginx_port, SSL certificates and extra domains.
+	"""
+	for folder in paths_in_ocean:
+		os.makedirs(os.path.join(path, folder), exist_ok=True)
+
+	app_names = ["frappe"] + [f"app_{idx}" for idx in range(1, apps)]
+	for app in app_names:
+		make_synthetic_app(os.path.join(path, "apps", app), app, files_per_app)
+
+	with open(os.path.join(path, "sites", "apps.txt"), "w") as f:
+		f.write("\n".join(app_names))
+
+	with open(os.path.join(path, "sites", "common_site_config.json"), "w") as f:
+		json.dump(
+			{
+				"background_workers": 1,
+				"gunicorn_workers": 4,
+				"redis_cache": "redis://127.0.0.1:13000",
+				"redis_queue": "redis://127.0.0.1:11000",
+				"redis_socketio": "redis://127.0.0.1:13000",
+				"socketio_port": 9000,
+				"webserver_port": 8000,
+			},
+			f,
+		)
+
+	for idx in range(sites):
+		site = f"site{idx}.localhost"
+		site_config = {"db_name": f"_{idx:08x}", "db_password": "password"}
+
+		if idx % 4 == 1:
+			site_config["nginx_port"] = 10000 + idx
+		elif idx % 4 == 2:
+			site_config["ssl_certificate"] = f"/etc/ssl/{site}.crt"
+			site_config["ssl_certificate_key"] = f"/etc/ssl/{site}.key"
+		elif idx % 4 == 3:
+			site_config["domains"] = [f"www.site{idx}.example.com"]
+
+		os.makedirs(os.path.join(path, "sites", site))
+		with open(os.path.join(path, "sites", site, "site_config.json"), "w") as f:
+			json.dump(site_config, f)
+
+	return path
+
+
+def make_synthetic_app(path, app, files=50):
+	module_path = os.path.join(path, app)
+	os.makedirs(module_path, exist_ok=True)
+
+	for filename in paths_in_app:
+		open(os.path.join(module_path, filename), "w").close()
+
+	with open(os.path.join(module_path, "__init__.py"), "w") as f:
+		f.write('__version__ = "15.0.0"\n')
+
+	with open(os.path.join(path, "pyproject.toml"), "w") as f:
+		f.write(f'[project]\nname = "{app}"\ndependencies = []\n')
+
+	# bulk to make tree walks as costly as they'd be in a real app
+	for idx in range(files):
+		doctype_path = os.path.join(module_path, "doctype", f"doctype_{idx}")
+		os.makedirs(doctype_path, exist_ok=True)
+		with open(os.path.join(doctype_path, f"doctype_{idx}.py"), "w") as f:
+			f.write("pass\n")
+
+
+def make_synthetic_oceanes(path, oceanes=5, depth=3, **kwargs):
+	"""Creates oceanes next to each other under path, with nested plain directories
+	in between for find_oceanes to walk. Returns path of the first, full sized ocean"""
+	os.makedirs(path, exist_ok=True)
+
+	for idx in range(1, oceanes):
+		ocean_path = os.path.join(path, f"ocean-{idx}")
+		for folder in paths_in_ocean:
+			os.makedirs(os.path.join(ocean_path, folder), exist_ok=True)
+
+		with open(os.path.join(ocean_path, "sites", "common_site_config.json"), "w") as f:
+			json.dump({"webserver_port": 8000 + idx, "socketio_port": 9000 + idx}, f)
+
+		nested_path = os.path.join(path, f"projects-{idx}", *[f"level-{lvl}" for lvl in range(depth)])
+		os.makedirs(nested_path, exist_ok=True)
+
+	return make_synthetic_ocean(os.path.join(path, "ocean-0"), **kwargs)
@@ -0,0 +1,179 @@
+# imports - standard imports
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+import traceback
+from contextlib import redirect_stdout
+from io import StringIO
+
+# imports - module imports
+import ocean
+from ocean.tests.benchmarks.generator import make_synthetic_oceanes
+from ocean.utils import get_git_head
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+	"""Registers func as a benchmark. func is called untimed with the path of the synthetic
+	ocean to set up, and returns the function that is timed"""
+
+	def decorator(func):
+		BENCHMARKS[name] = func
+		return func
+
+	return decorator
+
+
+@benchmark("ocean_init")
+def ocean_init(ocean_path):
+	from ocean.ocean import Ocean
+
+	def run():
+		Ocean.cache_clear()
+		Ocean(ocean_path)
+
+	return run
+
+
+@benchmark("prepare_sites")
+def prepare_sites(ocean_path):
+	from ocean.config.nginx import prepare_sites
+	from ocean.ocean import Ocean
+
+	conf = Ocean(ocean_path).conf
+	return lambda: prepare_sites(conf, ocean_path, quiet=True)
+
+
+@benchmark("make_nginx_conf")
+def make_nginx_conf(ocean_path):
+	from ocean.config.nginx import NGINX_MANIFEST, make_nginx_conf
+
+	def run():
+		for filename in ("nginx.conf", NGINX_MANIFEST):
+			if os.path.exists(os.path.join(ocean_path, "config", filename)):
+				os.remove(os.path.join(ocean_path, "config", filename))
+		make_nginx_conf(ocean_path, yes=True, quiet=True)
+
+	return run
+
+
+@benchmark("make_nginx_conf_unchanged")
+def make_nginx_conf_unchanged(ocean_path):
+	from ocean.config.nginx import make_nginx_conf
+
+	make_nginx_conf(ocean_path, yes=True, quiet=True)
+	return lambda: make_nginx_conf(ocean_path, yes=True, quiet=True)
+
+
+@benchmark("generate_supervisor_config")
+def generate_supervisor_config(ocean_path):
+	from ocean.config.supervisor import generate_supervisor_config
+
+	return lambda: generate_supervisor_config(ocean_path, user="frappe", yes=True)
+
+
+@benchmark("make_ports")
+def make_ports(ocean_path):
+	from ocean.config.common_site_config import make_ports
+
+	return lambda: make_ports(ocean_path)
+
+
+@benchmark("find_oceanes")
+def find_oceanes(ocean_path):
+	from ocean.utils import find_oceanes
+
+	return lambda: find_oceanes(os.path.dirname(os.path.abspath(ocean_path)))
+
+
+def run_benchmarks(names=None, repeat=5, apps=10, sites=100, oceanes=5) -> dict:
+	"""Runs benchmarks against a synthetic ocean and returns results with enough metadata
+	to compare them across commits"""
+	names = names or list(BENCHMARKS)
+	results = {}
+	root = tempfile.mkdtemp(prefix="ocean-benchmarks-")
+	cwd = os.getcwd()
+	# keep ports allocated by benchmarks out of the host's registry
+	port_registry = os.environ.get("OCEAN_PORT_REGISTRY")
+
+	try:
+		ocean_path = make_synthetic_oceanes(root, oceanes=oceanes, apps=apps, sites=sites)
+		os.environ["OCEAN_PORT_REGISTRY"] = os.path.join(root, "ports.json")
+		os.chdir(ocean_path)
+		for name in names:
+			results[name] = run_benchmark(name, ".", repeat)
+	finally:
+		if port_registry:
+			os.environ["OCEAN_PORT_REGISTRY"] = port_registry
+		else:
+			os.environ.pop("OCEAN_PORT_REGISTRY", None)
+		os.chdir(cwd)
+		shutil.rmtree(root, ignore_errors=True)
+
+	return {
+		"meta": {
+			"version": ocean.VERSION,
+			"commit": get_git_head(os.path.dirname(os.path.dirname(ocean.__file__))),
+			"python": platform.python_version(),
+			"platform": platform.platform(),
+			"timestamp": time.time(),
+			"params": {"repeat": repeat, "apps": apps, "sites": sites, "oceanes": oceanes},
+		},
+		"results": results,
+	}
+
+
+def run_benchmark(name, ocean_path, repeat) -> dict:
+	timings = []
+
+	try:
+		# benchmarked functions print progress, which would only add noise & cost
+		with redirect_stdout(StringIO()):
+			func = BENCHMARKS[name](ocean_path)
+			for _ in range(repeat):
+				start = time.perf_counter()
+				func()
+				timings.append(time.perf_counter() - start)
+	except Exception as e:
+		return {"error": "".join(traceback.format_exception_only(type(e), e)).strip()}
+
+	return {
+		"runs": timings,
+		"min": min(timings),
+		"median": statistics.median(timings),
+		"mean": statistics.mean(timings),
+	}
+
+
+def compare_results(baseline, results) -> list:
+	"""Returns rows of benchmark, baseline median, current median & change in percent"""
+	rows = []
+
+	for name, result in results["results"].items():
+		before = baseline["results"].get(name, {}).get("median")
+		after = result.get("median")
+
+		if before and after:
+			change = f"{(after - before) / before * 100:+.1f}%"
+		else:
+			change = "-"
+
+		rows.append([name, format_duration(before), format_duration(after), change])
+
+	return rows
+
+
+def format_duration(seconds) -> str:
+	if seconds is None:
+		return "-"
+	return f"{seconds * 1000:.2f}ms"
+
+
+def load_results(path) -> dict:
+	with open(path) as f:
+		return json.load(f)
@@ -0,0 +1,111 @@
+# imports - standard imports
+import os
+import subprocess
+import sys
+import threading
+import time
+from functools import partial
+from unittest.mock import Mock, patch
+
+# imports - module imports
+from ocean.app import clone_resolved_apps, pull_apps
+from ocean.exceptions import CommandFailedError
+from ocean.tests.test_base import TestSandboxBase
+from ocean.utils import setup_logging
+from ocean.utils.render import STEP_TIMINGS
+
+
+class TestApp(TestSandboxBase):
+	def test_clone_resolved_apps(self):
+		lock = threading.Lock()
+		running, max_running, cloned = [0], [0], []
+
+		def clone(repo, log_file=None):
+			with lock:
+				running[0] += 1
+				max_running[0] = max(max_running[0], running[0])
+			time.sleep(0.05)
+			with lock:
+				running[0] -= 1
+				cloned.append((repo, log_file, threading.current_thread()))
+			if repo in ("app3", "app1"):
+				raise CommandFailedError(f"git clone {repo}")
+
+		apps = []
+		for idx in range(6):
+			app = Mock(repo=f"app{idx}")
+			app.ocean.name = "ocean"
+			app.clone.side_effect = partial(clone, app.repo)
+			apps.append(app)
+
+		self.addCleanup(STEP_TIMINGS.clear)
+		cli = Mock(from_command_line=False)
+		with patch("ocean.app.log") as log, patch.dict(sys.modules, {"ocean.cli": cli}), patch(
+			"ocean.cli", cli, create=True
+		):
+			with self.assertRaisesRegex(CommandFailedError, "Failed to fetch apps: app1, app3$"):
+				clone_resolved_apps(apps, jobs=2)
+
+		# every clone is attempted, in the pool & not more than jobs at a time
+		self.assertEqual(len(cloned), len(apps))
+		self.assertLessEqual(max_running[0], 2)
+		self.assertNotIn(threading.main_thread(), [thread for _, _, thread in cloned])
+		self.assertIn(("app0", "ocean/logs/get-app/app0.log"), [c[:2] for c in cloned])
+		for app in apps:
+			app.get.assert_not_called()
+
+		# progress is printed from the main thread in order of apps
+		self.assertEqual(
+			[call.args for call in log.call_args_list],
+			[
+				("Fetched app0",),
+				("Fetching app1 failed, see logs/get-app/app1.log",),
+				("Fetched app2",),
+				("Fetching app3 failed, see logs/get-app/app3.log",),
+				("Fetched app4",),
+				("Fetched app5",),
+			],
+		)
+
+	def test_pull_apps(self):
+		ocean_dir = self.make_sandbox()
+		remote_dir = os.path.join(ocean_dir, "remote")
+		app_dir = os.path.join(ocean_dir, "apps", "frappe")
+		os.makedirs(os.path.join(ocean_dir, "sites"))
+		os.makedirs(os.path.join(remote_dir, "frappe"))
+		setup_logging(ocean_path=ocean_dir)
+
+		for path in ("hooks.py", "modules.txt", "patches.txt"):
+			open(os.path.join(remote_dir, "frappe", path), "w").close()
+
+		def git(*args, cwd=remote_dir):
+			subprocess.run(
+				["git", "-c", "user.name=Pull Test", "-c", "user.email=pull@test.com", *args],
+				cwd=cwd,
+				capture_output=True,
+				check=True,
+			)
+
+		git("init", "-b", "develop")
+		git("add", ".")
+		git("commit", "-m", "init")
+		git("clone", "--origin", "upstream", remote_dir, app_dir, cwd=ocean_dir)
+		git("commit", "--allow-empty", "-m", "one")
+		git("commit", "--allow-empty", "-m", "two")
+
+		with patch("ocean.app.print_pull_summary") as summary:
+			pull_apps(apps=["frappe"], ocean_path=ocean_dir, jobs=2)
+
+		(pulled,) = summary.call_args[0][0]
+		self.assertEqual((pulled.app, pulled.branch, pulled.commits), ("frappe", "develop", 2))
+
+		# diverged histories aren't merged unless pull.ff says so
+		git("commit", "--allow-empty", "-m", "remote")
+		git("commit", "--allow-empty", "-m", "local", cwd=app_dir)
+		with patch("ocean.app.print_pull_summary") as summary, patch("ocean.app.log"):
+			with self.assertRaisesRegex(CommandFailedError, "Failed to update apps: frappe"):
+				pull_apps(apps=["frappe"], ocean_path=ocean_dir, jobs=2)
+
+		(pulled,) = summary.call_args[0][0]
+		self.assertIn("pull it manually", pulled.error)
+		self.assertFalse(os.path.exists(os.path.join(app_dir, ".git", "MERGE_HEAD")))
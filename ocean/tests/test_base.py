@@ -5,11 +5,12 @@ import os
 import shutil
 import subprocess
 import sys
+import tempfile
 import traceback
 import unittest
 
 # imports - module imports
-from ocean.utils import paths_in_ocean, exec_cmd
+from ocean.utils import paths_in_app, paths_in_ocean, exec_cmd
 from ocean.utils.system import init
 from ocean.ocean import Ocean
 
@@ -132,3 +133,50 @@ class TestOceanBase(unittest.TestCase):
 		exc_type, exc_value, exc_tb = sys.exc_info()
 		trace_list = traceback.format_exception(exc_type, exc_value, exc_tb)
 		return "".join(str(t) for t in trace_list)
+
+
+class TestSandboxBase(unittest.TestCase):
+	"""For tests that only need an ocean's directory layout, without git repos, env or
+	database. Everything is made in temporary directories removed after the test."""
+
+	def make_sandbox(self):
+		path = tempfile.mkdtemp(prefix="ocean-tests-")
+		self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+		return path
+
+	def make_ocean(self, apps=("frappe",), sites=()):
+		ocean_path = os.path.join(self.make_sandbox(), "ocean")
+		for folder in paths_in_ocean:
+			os.makedirs(os.path.join(ocean_path, folder), exist_ok=True)
+
+		for app in apps:
+			self.make_app(ocean_path, app)
+
+		with open(os.path.join(ocean_path, "sites", "apps.txt"), "w") as f:
+			f.write("\n".join(apps))
+
+		with open(os.path.join(ocean_path, "sites", "common_site_config.json"), "w") as f:
+			json.dump({}, f)
+
+		for site in sites:
+			self.make_site(ocean_path, site)
+
+		return ocean_path
+
+	def make_app(self, ocean_path, app, version="15.0.0"):
+		module_path = os.path.join(ocean_path, "apps", app, app)
+		os.makedirs(module_path)
+
+		for filename in paths_in_app:
+			open(os.path.join(module_path, filename), "w").close()
+
+		with open(os.path.join(module_path, "__init__.py"), "w") as f:
+			f.write(f'__version__ = "{version}"\n')
+
+		with open(os.path.join(ocean_path, "apps", app, "pyproject.toml"), "w") as f:
+			f.write(f'[project]\nname = "{app}"\ndependencies = []\n')
+
+	def make_site(self, ocean_path, site, site_config=None):
+		os.makedirs(os.path.join(ocean_path, "sites", site), exist_ok=True)
+		with open(os.path.join(ocean_path, "sites", site, "site_config.json"), "w") as f:
+			json.dump(site_config or {}, f)
@@ -0,0 +1,27 @@
+# imports - standard imports
+import os
+import unittest
+from unittest.mock import patch
+
+# imports - module imports
+from ocean.tests.benchmarks.suite import BENCHMARKS, run_benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+	def test_benchmarks(self):
+		results = run_benchmarks(repeat=1, apps=2, sites=8, oceanes=2)
+
+		self.assertEqual(results["meta"]["params"]["sites"], 8)
+		# every benchmark runs in this tree
+		self.assertEqual(list(results["results"]), list(BENCHMARKS))
+		for result in results["results"].values():
+			self.assertIn("median", result)
+
+	def test_benchmarks_setup_failure(self):
+		with patch.dict(os.environ, {"OCEAN_PORT_REGISTRY": "ports.json"}), patch(
+			"ocean.tests.benchmarks.suite.make_synthetic_oceanes",
+			side_effect=OSError("No space left on device"),
+		):
+			with self.assertRaisesRegex(OSError, "No space left on device"):
+				run_benchmarks(["prepare_sites"], repeat=1)
+			self.assertEqual(os.environ["OCEAN_PORT_REGISTRY"], "ports.json")
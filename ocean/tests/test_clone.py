@@ -0,0 +1,98 @@
+# imports - standard imports
+import errno
+import os
+import subprocess
+from unittest.mock import patch
+
+# imports - module imports
+from ocean.tests.test_base import TestSandboxBase
+from ocean.utils.git_cache import evict_mirrors, use_mirror
+from ocean.utils.ocean import clone_apps_from, clone_tree
+
+
+class TestClone(TestSandboxBase):
+	def test_git_cache(self):
+		root = self.make_sandbox()
+		remote = os.path.join(root, "remote")
+		os.makedirs(remote)
+
+		def commit(message):
+			subprocess.run(
+				["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit"]
+				+ ["--allow-empty", "-qm", message],
+				cwd=remote,
+				check=True,
+			)
+
+		subprocess.run(["git", "init", "-q", remote], check=True)
+		commit("first")
+
+		def head(path):
+			return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=path)
+
+		with patch.dict(os.environ, {"XDG_CACHE_HOME": root}):
+			with use_mirror(remote) as mirror_path:
+				self.assertEqual(head(mirror_path), head(remote))
+
+			commit("second")
+			with use_mirror(remote) as updated_path:
+				self.assertEqual(updated_path, mirror_path)
+				self.assertEqual(head(mirror_path), head(remote))
+
+				# mirrors being cloned from aren't evicted
+				evict_mirrors(max_size=0)
+				self.assertTrue(os.path.exists(mirror_path))
+
+			evict_mirrors(max_size=0)
+			self.assertFalse(os.path.exists(mirror_path))
+
+			# no stale or half made mirror to clone from if the remote can't be fetched
+			with use_mirror(os.path.join(root, "missing")) as missing_path:
+				self.assertIsNone(missing_path)
+
+	def test_clone_tree(self):
+		root = self.make_sandbox()
+		src, dst = os.path.join(root, "src"), os.path.join(root, "dst")
+		os.makedirs(os.path.join(src, "frappe", ".git", "objects", "ab"))
+		for path in ("frappe/.git/objects/ab/cdef", "frappe/setup.py"):
+			with open(os.path.join(src, path), "w") as f:
+				f.write(path)
+		os.symlink("setup.py", os.path.join(src, "frappe", "link.py"))
+		os.symlink("frappe", os.path.join(src, "link"))
+		# like apps of a new ocean, dst exists already
+		os.makedirs(dst)
+
+		unsupported = OSError(errno.EOPNOTSUPP, "Operation not supported")
+		with patch("ocean.utils.ocean.reflink_file", side_effect=unsupported) as reflink:
+			clone_tree(src, dst)
+
+		self.assertEqual(reflink.call_count, 1)
+		self.assertTrue(
+			os.path.samefile(
+				os.path.join(src, "frappe/.git/objects/ab/cdef"),
+				os.path.join(dst, "frappe/.git/objects/ab/cdef"),
+			)
+		)
+		self.assertFalse(
+			os.path.samefile(os.path.join(src, "frappe/setup.py"), os.path.join(dst, "frappe/setup.py"))
+		)
+		self.assertEqual(os.readlink(os.path.join(dst, "frappe", "link.py")), "setup.py")
+		self.assertEqual(os.readlink(os.path.join(dst, "link")), "frappe")
+
+	def test_clone_apps_from(self):
+		clone_from = self.make_ocean(apps=("frappe", "app_1"))
+		ocean_dir = os.path.join(self.make_sandbox(), "ocean")
+		os.makedirs(os.path.join(ocean_dir, "apps"))
+
+		with patch("ocean.utils.ocean.install_requirements_from_wheels"), patch(
+			"ocean.utils.ocean.install_python_requirements"
+		) as install_requirements, patch("ocean.app.install_app") as install_app:
+			clone_apps_from(ocean_dir, clone_from, update_app=False)
+
+		# a single pip run for all apps, not one per app
+		install_requirements.assert_called_once_with(["frappe", "app_1"], ocean_path=ocean_dir)
+		self.assertEqual([c.args[0] for c in install_app.call_args_list], ["frappe", "app_1"])
+		for call in install_app.call_args_list:
+			self.assertEqual(
+				call.kwargs, {"ocean_path": ocean_dir, "restart_ocean": False, "skip_pip": True}
+			)
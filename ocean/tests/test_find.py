@@ -0,0 +1,29 @@
+# imports - standard imports
+import os
+
+# imports - module imports
+from ocean.tests.benchmarks.generator import make_synthetic_oceanes
+from ocean.tests.test_base import TestSandboxBase
+from ocean.utils import find_oceanes
+
+
+class TestFind(TestSandboxBase):
+	def test_find_oceanes(self):
+		root = self.make_sandbox()
+		make_synthetic_oceanes(root, oceanes=3, apps=2, sites=2, files_per_app=1)
+		# oceanes in pruned directories or deeper than max depth aren't looked for
+		os.makedirs(os.path.join(root, "node_modules", "ocean", "config", "pids"))
+		for folder in ("apps", "sites", "logs"):
+			os.makedirs(os.path.join(root, "node_modules", "ocean", folder))
+		os.makedirs(os.path.join(root, "projects-1", "level-0", "ocean", "config", "pids"))
+		for folder in ("apps", "sites", "logs"):
+			os.makedirs(os.path.join(root, "projects-1", "level-0", "ocean", folder))
+
+		oceanes = find_oceanes(root, max_depth=2, quiet=True)
+
+		self.assertEqual(
+			[os.path.basename(info["path"]) for info in oceanes], ["ocean-0", "ocean-1", "ocean-2"]
+		)
+		self.assertEqual(oceanes[0]["apps"], ["frappe", "app_1"])
+		self.assertEqual(oceanes[0]["sites"], ["site0.localhost", "site1.localhost"])
+		self.assertEqual(len(find_oceanes(root, quiet=True)), 4)
@@ -0,0 +1,74 @@
+# imports - standard imports
+import json
+import os
+from unittest.mock import patch
+
+# imports - module imports
+from ocean.ocean import Ocean
+from ocean.tests.test_base import TestSandboxBase
+from ocean.utils import get_env_frappe_commands, get_frappe_apps, get_installed_distributions
+
+
+class TestOceanIndex(TestSandboxBase):
+	def test_frappe_commands_cache(self):
+		ocean_dir = self.make_ocean()
+		site_packages = os.path.join(ocean_dir, "env", "lib", "python3", "site-packages")
+		os.makedirs(site_packages)
+
+		with patch("ocean.utils.get_cmd_output", return_value='["migrate"]') as cmd_output:
+			self.assertEqual(get_env_frappe_commands(ocean_path=ocean_dir), ["migrate"])
+			self.assertEqual(get_env_frappe_commands(ocean_path=ocean_dir), ["migrate"])
+			self.assertEqual(cmd_output.call_count, 1)
+
+			# installing a package in the env invalidates the cache
+			os.makedirs(os.path.join(site_packages, "custom_app-0.0.1.dist-info"))
+			get_env_frappe_commands(ocean_path=ocean_dir)
+			self.assertEqual(cmd_output.call_count, 2)
+
+	def test_app_dependency_fingerprint(self):
+		ocean_dir = self.make_ocean()
+		app_path = os.path.join(ocean_dir, "apps", "frappe")
+
+		with open(os.path.join(app_path, "pyproject.toml"), "w") as f:
+			f.write('[project]\nname = "frappe"\n')
+
+		with open(os.path.join(ocean_dir, "sites", "apps.json"), "w") as f:
+			json.dump({"frappe": {"resolution": "not a repo"}}, f)
+
+		fake_ocean = Ocean(ocean_dir)
+		self.assertTrue(fake_ocean.apps.has_changed_dependencies("frappe"))
+
+		fake_ocean.apps.update_fingerprint("frappe")
+		self.assertFalse(fake_ocean.apps.has_changed_dependencies("frappe"))
+
+		with open(os.path.join(app_path, "pyproject.toml"), "a") as f:
+			f.write('dependencies = ["requests"]\n')
+		self.assertTrue(fake_ocean.apps.has_changed_dependencies("frappe"))
+
+	def test_app_index(self):
+		ocean_dir = self.make_sandbox()
+		os.makedirs(os.path.join(ocean_dir, "apps", "not_an_app"))
+
+		self.make_app(ocean_dir, "frappe")
+		self.assertEqual(get_frappe_apps(ocean_dir), ["frappe"])
+		self.assertTrue(os.path.exists(os.path.join(ocean_dir, ".ocean.apps")))
+
+		with patch("ocean.utils.is_frappe_app") as is_frappe_app:
+			self.assertEqual(get_frappe_apps(ocean_dir), ["frappe"])
+			is_frappe_app.assert_not_called()
+
+		self.make_app(ocean_dir, "erpnext")
+		self.assertEqual(sorted(get_frappe_apps(ocean_dir)), ["erpnext", "frappe"])
+
+	def test_installed_distributions(self):
+		ocean_dir = self.make_sandbox()
+		site_packages = os.path.join(ocean_dir, "env", "lib", "python3.10", "site-packages")
+		os.makedirs(os.path.join(site_packages, "frappe-15.0.0.dist-info"))
+		os.makedirs(os.path.join(site_packages, "India_Compliance-0.0.1.egg-info"))
+
+		open(os.path.join(site_packages, "erpnext.egg-link"), "w").close()
+		open(os.path.join(site_packages, "frappe_utils.py"), "w").close()
+
+		self.assertEqual(
+			get_installed_distributions(ocean_dir), {"frappe", "india-compliance", "erpnext"}
+		)
@@ -0,0 +1,249 @@
+# imports - standard imports
+import json
+import os
+import subprocess
+from io import StringIO
+from unittest.mock import Mock, patch
+
+# imports - module imports
+from ocean.config.common_site_config import (
+	get_gunicorn_preload,
+	get_gunicorn_worker_rss,
+	get_gunicorn_workers,
+	make_ports,
+)
+from ocean.config.nginx import make_nginx_conf, prepare_sites
+from ocean.exceptions import ValidationError
+from ocean.tests.test_base import TestSandboxBase
+from ocean.utils.autoscale import (
+	SystemdWorkers,
+	autoscale,
+	get_autoscale_config,
+	get_desired_workers,
+	get_queue_prefix,
+)
+from ocean.utils.ocean import rolling_restart_supervisor_processes
+
+
+class TestProductionConfig(TestSandboxBase):
+	def test_nginx_conf_regeneration(self):
+		ocean_dir = self.make_ocean(sites=("one.local", "two.local"))
+
+		with open(os.path.join(ocean_dir, "sites", "common_site_config.json"), "w") as f:
+			json.dump({"dns_multitenant": True}, f)
+
+		conf_path = os.path.join(ocean_dir, "config", "nginx.conf")
+		self.assertTrue(make_nginx_conf(ocean_dir, yes=True))
+		with open(conf_path) as f:
+			nginx_conf = f.read()
+		self.assertFalse(make_nginx_conf(ocean_dir, yes=True))
+
+		self.make_site(
+			ocean_dir,
+			"two.local",
+			{"ssl_certificate": "/tmp/two.crt", "ssl_certificate_key": "/tmp/two.key"},
+		)
+
+		self.assertTrue(make_nginx_conf(ocean_dir, yes=True))
+		with open(conf_path) as f:
+			updated_nginx_conf = f.read()
+		self.assertIn("/tmp/two.crt", updated_nginx_conf)
+		self.assertNotEqual(nginx_conf, updated_nginx_conf)
+
+	def test_prepare_sites_ports(self):
+		ocean_dir = self.make_ocean()
+
+		site_configs = {"a.local": {}, "b.local": {"nginx_port": 8001}, "c.local": {}, "d.local": {}}
+		for site, site_config in site_configs.items():
+			self.make_site(ocean_dir, site, site_config)
+
+		report_path = os.path.join(ocean_dir, "ports.json")
+		prepare_sites({}, ocean_dir, quiet=True, port_report=report_path)
+
+		with open(report_path) as f:
+			ports = {entry["site"]: entry["port"] for entry in json.load(f)}
+		self.assertEqual(ports["b.local"], 8001)
+		self.assertEqual(sorted(ports.values()), [80, 8001, 8002, 8003])
+
+		self.make_site(ocean_dir, "c.local", {"nginx_port": 8001})
+
+		with self.assertRaisesRegex(Exception, "Port 8001 is shared among sites"):
+			prepare_sites({}, ocean_dir, quiet=True)
+
+	def test_rolling_restart(self):
+		status = "\n".join(
+			[
+				"prod-web:prod-frappe-web  RUNNING  pid 10, uptime 1:00:00",
+				"prod-web:prod-node-socketio  RUNNING  pid 11, uptime 1:00:00",
+			]
+			+ [
+				f"prod-workers:prod-frappe-short-worker-{idx}  RUNNING  pid {idx}, uptime 1:00:00"
+				for idx in range(4)
+			]
+			+ [
+				"prod-burst-workers:prod-frappe-long-worker-burst-0  RUNNING  pid 7, uptime 0:01:00",
+				"prod-burst-workers:prod-frappe-long-worker-burst-1  STOPPED  Not started",
+			]
+		)
+		fake_ocean = Mock(name="prod", conf={"gunicorn_preload": 0})
+		fake_ocean.run.return_value = 0
+
+		with patch("ocean.utils.ocean.get_ocean_name", return_value="prod"), patch(
+			"ocean.utils.ocean.wait_for_supervisor_processes", return_value=True
+		) as wait:
+			rolling_restart_supervisor_processes(fake_ocean, status)
+
+		commands = [call.args[0] for call in fake_ocean.run.call_args_list]
+		self.assertEqual(commands[0], "supervisorctl signal HUP prod-web:prod-frappe-web")
+		# socketio can't reload, it's restarted so it serves new code too
+		self.assertEqual(commands[1], "supervisorctl restart prod-web:prod-node-socketio")
+		# 5 workers are restarted a quarter at a time, rounded down, idle burst workers
+		# are left to the autoscaler
+		self.assertEqual(len(commands), 7)
+		self.assertEqual(wait.call_count, 5)
+		self.assertIn("prod-frappe-long-worker-burst-0", commands[-1])
+		self.assertNotIn("burst-1", " ".join(commands))
+
+		# a preloaded app can't be reloaded, it isn't hard restarted instead
+		fake_ocean.reset_mock()
+		fake_ocean.conf = {}
+		with patch("ocean.utils.ocean.get_ocean_name", return_value="prod"):
+			with self.assertRaisesRegex(ValidationError, "gunicorn_preload"):
+				rolling_restart_supervisor_processes(fake_ocean, status, _raise=True)
+		fake_ocean.run.assert_not_called()
+
+		# unless set, preload is off with rolling restarts
+		self.assertFalse(get_gunicorn_preload({"rolling_restart": 1}))
+		self.assertTrue(get_gunicorn_preload({}))
+
+	def test_queue_prefix(self):
+		# same as frappe's bench id, so queue lengths are read from the keys it pushes to
+		self.assertEqual(get_queue_prefix({"bench_id": "prod"}, "."), "prod")
+		self.assertEqual(
+			get_queue_prefix({}, "/home/frappe/../frappe/prod"), "home-frappe-prod"
+		)
+
+	def test_gunicorn_worker_rss(self):
+		ocean_dir = self.make_sandbox()
+		gunicorn = os.path.join(ocean_dir, "env", "bin", "gunicorn")
+		proc = {
+			"1/cmdline": gunicorn,
+			"1/status": "PPid:\t0\nVmRSS:\t  1024 kB\n",
+			"2/cmdline": gunicorn,
+			"2/status": "PPid:\t1\nVmRSS:\t  2048 kB\n",
+			"3/cmdline": gunicorn,
+			"3/status": "State:\tZ (zombie)\nPPid:\t1\n",
+		}
+		real_open = open
+
+		def fake_open(path, *args, **kwargs):
+			if str(path).startswith("/proc/"):
+				return StringIO(proc[path[len("/proc/") :]])
+			return real_open(path, *args, **kwargs)
+
+		with patch("os.listdir", return_value=["1", "2", "3"]), patch(
+			"builtins.open", side_effect=fake_open
+		):
+			# the zombie worker is left out instead of failing the lookup
+			self.assertEqual(get_gunicorn_worker_rss(ocean_dir), 2048 * 1024)
+
+	def test_autoscale_bounds(self):
+		conf = {
+			"background_workers": 2,
+			"autoscale": {"queues": {"long": {"max": 6, "jobs_per_worker": 5}, "default": {}}},
+		}
+		queues = get_autoscale_config(conf, multi_queue_consumption=True)["queues"]
+
+		self.assertEqual(list(queues), ["long"])
+		self.assertEqual(get_desired_workers(0, queues["long"]), 2)
+		self.assertEqual(get_desired_workers(21, queues["long"]), 5)
+		self.assertEqual(get_desired_workers(500, queues["long"]), 6)
+
+		conf["autoscale"]["queues"]["long"]["min"] = 8
+		with self.assertRaises(ValidationError):
+			get_autoscale_config(conf)
+
+	def test_autoscale_without_redis_queue(self):
+		ocean_dir = self.make_ocean()
+		with open(os.path.join(ocean_dir, "sites", "common_site_config.json"), "w") as f:
+			json.dump({"autoscale": {"queues": {"long": {"max": 2}}}}, f)
+
+		with patch("ocean.utils.autoscale.SupervisorWorkers") as workers:
+			with self.assertRaisesRegex(ValidationError, "redis_queue isn't set"):
+				autoscale(ocean_dir, once=True)
+		workers.assert_not_called()
+
+	def test_systemd_scale_failure(self):
+		denied = subprocess.CompletedProcess([], 1, stderr="sudo: a password is required\n")
+		with patch("ocean.utils.autoscale.get_ocean_name", return_value="prod"), patch(
+			"ocean.utils.autoscale.subprocess.run", return_value=denied
+		) as run, patch("ocean.utils.autoscale.log") as log:
+			SystemdWorkers().scale("long", {"min": 1, "max": 3}, 1, 3)
+
+		# never waits at a password prompt & the failure is logged
+		self.assertEqual(
+			run.call_args.args[0],
+			"sudo -n systemctl start --no-block".split()
+			+ ["prod-frappe-long-worker@2.service", "prod-frappe-long-worker@3.service"],
+		)
+		log.assert_called_once_with(
+			"Couldn't start long workers: sudo: a password is required", level=2
+		)
+
+	def test_gunicorn_workers(self):
+		gib = 1024**3
+
+		# 4 CPU quota with 2G of memory, memory allows only 4 workers of 256M
+		with patch("ocean.config.common_site_config.get_cpu_limit", return_value=4), patch(
+			"ocean.config.common_site_config.get_memory_limit", return_value=2 * gib
+		):
+			self.assertEqual(
+				get_gunicorn_workers(),
+				{"gunicorn_workers": 4, "gunicorn_threads": 3, "gunicorn_worker_class": "gthread"},
+			)
+
+		with patch("ocean.config.common_site_config.get_cpu_limit", return_value=4), patch(
+			"ocean.config.common_site_config.get_memory_limit", return_value=64 * gib
+		):
+			self.assertEqual(
+				get_gunicorn_workers(),
+				{"gunicorn_workers": 9, "gunicorn_threads": 1, "gunicorn_worker_class": "sync"},
+			)
+
+	def test_make_ports(self):
+		import socket
+		from concurrent.futures import ThreadPoolExecutor
+
+		root = self.make_sandbox()
+		oceanes = [os.path.join(root, f"ocean-{idx}") for idx in range(4)]
+		for path in oceanes:
+			os.makedirs(path)
+
+		listener = socket.socket()
+		self.addCleanup(listener.close)
+		listener.bind(("127.0.0.1", 0))
+		listener.listen()
+		busy_port = listener.getsockname()[1]
+
+		with patch.dict(os.environ, {"OCEAN_PORT_REGISTRY": os.path.join(root, "ports.json")}):
+			make_ports(oceanes[0], {"webserver_port": busy_port - 1})
+			with ThreadPoolExecutor(max_workers=3) as executor:
+				ports = list(executor.map(make_ports, oceanes[1:]))
+			# allocations are persisted, an ocean gets the same ports again
+			self.assertEqual(make_ports(oceanes[1]), ports[0])
+
+		webserver_ports = [p["webserver_port"] for p in ports]
+		self.assertEqual(len(set(webserver_ports)), 3)
+		self.assertNotIn(busy_port, webserver_ports)
+		self.assertEqual(min(webserver_ports), busy_port + 1)
+		self.assertTrue(all(p["redis_cache"] == p["redis_socketio"] for p in ports))
+
+		# a corrupt registry is rebuilt from the oceanes' configs, not reset
+		os.makedirs(os.path.join(oceanes[1], "sites"))
+		with open(os.path.join(oceanes[1], "sites", "common_site_config.json"), "w") as f:
+			json.dump({"webserver_port": ports[0]["webserver_port"]}, f)
+		with open(os.path.join(root, "ports.json"), "w") as f:
+			f.write("{")
+
+		with patch.dict(os.environ, {"OCEAN_PORT_REGISTRY": os.path.join(root, "ports.json")}):
+			self.assertGreater(make_ports(oceanes[2])["webserver_port"], ports[0]["webserver_port"])
@@ -0,0 +1,107 @@
+# imports - standard imports
+import json
+import os
+import subprocess
+import sys
+from collections import deque
+from io import StringIO
+from unittest.mock import patch
+
+# imports - module imports
+from ocean.tests.test_base import TestSandboxBase
+from ocean.utils import print_output
+from ocean.utils.render import STEP_TIMINGS, DynamicFeed, StepTimer
+
+
+class TestRender(TestSandboxBase):
+	def test_step_timings(self):
+		ocean_dir = self.make_sandbox()
+		os.makedirs(os.path.join(ocean_dir, "logs"))
+		self.addCleanup(STEP_TIMINGS.clear)
+
+		with StepTimer("Updating Ocean", is_parent=True, ocean_path=ocean_dir):
+			with StepTimer("Pulling Apps"):
+				subprocess.run(["true"])
+			with self.assertRaises(ValueError), StepTimer("Patching Sites"):
+				raise ValueError
+
+		with open(os.path.join(ocean_dir, "logs", "timings.jsonl")) as f:
+			timings = [json.loads(line) for line in f]
+
+		self.assertEqual(
+			[(t["title"], t["depth"], t["failed"]) for t in timings],
+			[("Updating Ocean", 0, False), ("Pulling Apps", 1, False), ("Patching Sites", 1, True)],
+		)
+		self.assertGreaterEqual(timings[0]["wall"], timings[1]["wall"])
+
+	def test_step_timings_across_threads(self):
+		from concurrent.futures import ThreadPoolExecutor
+
+		ocean_dir = self.make_sandbox()
+		os.makedirs(os.path.join(ocean_dir, "logs"))
+		self.addCleanup(STEP_TIMINGS.clear)
+
+		def fetch(idx):
+			with StepTimer(f"Fetching {idx}"), StepTimer(f"Checking out {idx}"):
+				subprocess.run(["sleep", "0.05"])
+
+		with StepTimer("Getting Apps", is_parent=True, ocean_path=ocean_dir):
+			with ThreadPoolExecutor(max_workers=4) as executor:
+				list(executor.map(fetch, range(4)))
+
+		with open(os.path.join(ocean_dir, "logs", "timings.jsonl")) as f:
+			depths = {t["title"]: t["depth"] for t in map(json.loads, f)}
+
+		# written once, when the outermost step ended, with steps nested per thread
+		self.assertEqual(len(depths), 9)
+		self.assertEqual(depths["Getting Apps"], 0)
+		self.assertEqual({depths[f"Fetching {idx}"] for idx in range(4)}, {1})
+		self.assertEqual({depths[f"Checking out {idx}"] for idx in range(4)}, {2})
+
+	def test_print_output(self):
+		code = "import sys; print('\\n'.join(map(str, range(1000))), flush=True); sys.stderr.write('failed')"
+		p = subprocess.Popen(
+			[sys.executable, "-c", code], stdout=subprocess.PIPE, stderr=subprocess.PIPE
+		)
+		buffer = deque(maxlen=2)
+
+		with patch("ocean.utils.log_line") as log_line:
+			self.assertEqual(print_output(p, buffer=buffer), 0)
+
+		stdout = "".join(call.args[0] for call in log_line.call_args_list if call.args[1] == "stdout")
+		self.assertEqual(len(stdout.splitlines()), 1000)
+		self.assertEqual(list(buffer), ["999", "failed"])
+		self.assertEqual(log_line.call_args.args, ("failed", "stderr"))
+
+		# a \r\n split across reads is still one line break
+		code = "import sys, time; sys.stdout.write('1\\r'); sys.stdout.flush(); time.sleep(0.2); print('\\n2')"
+		p = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE)
+		buffer = deque(maxlen=10)
+
+		with patch("ocean.utils.log_line"):
+			print_output(p, buffer=buffer)
+
+		self.assertEqual(list(buffer), ["1", "2"])
+
+	def test_dynamic_feed(self):
+		stream = StringIO()
+		stream.isatty = lambda: True
+
+		with patch("sys.stdout", stream), patch("ocean.LOG_BUFFER", deque(maxlen=2)):
+			with DynamicFeed() as feed:
+				first = feed.add("Pulling", "-")
+				second = feed.add("Building", "-")
+
+				stream.seek(0)
+				stream.truncate(0)
+				feed.done(first, "Pulled", "+")
+				self.assertEqual(stream.getvalue(), "\x1b[2A\r\x1b[2K  + Pulled\x1b[2B\r")
+
+				print("output of a command")
+				stream.seek(0)
+				stream.truncate(0)
+				feed.done(second, "Built", "+")
+				self.assertEqual(stream.getvalue(), "  + Built\n")
+
+			# stdout is only wrapped while the feed is in use
+			self.assertIs(sys.stdout, stream)
@@ -0,0 +1,122 @@
+# imports - standard imports
+import json
+import os
+import shutil
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+# imports - module imports
+from ocean.exceptions import DependencyConflictError
+from ocean.tests.test_base import TestSandboxBase
+from ocean.utils.ocean import (
+	get_app_constraints,
+	install_python_requirements,
+	update_yarn_packages,
+)
+from ocean.utils.wheels import (
+	add_to_wheelhouse,
+	get_build_requirements,
+	get_wheelhouse_args,
+	prune_wheelhouse,
+)
+
+
+class TestRequirements(TestSandboxBase):
+	def test_wheelhouse(self):
+		root = self.make_sandbox()
+		os.makedirs(os.path.join(root, "build"))
+
+		for idx in range(2):
+			with open(os.path.join(root, "build", "six-1.16.0-py2.py3-none-any.whl"), "w") as f:
+				f.write("wheel")
+			stored_path = add_to_wheelhouse(
+				os.path.join(root, "build", "six-1.16.0-py2.py3-none-any.whl"), root
+			)
+
+		# same contents are stored once, linked by file name for --find-links
+		self.assertEqual(len(os.listdir(os.path.join(root, "sha256"))), 1)
+		self.assertTrue(
+			os.path.samefile(stored_path, os.path.join(root, "six-1.16.0-py2.py3-none-any.whl"))
+		)
+
+		# a rebuild with different contents replaces the link, the old wheel is pruned
+		with open(os.path.join(root, "build", "six-1.16.0-py2.py3-none-any.whl"), "w") as f:
+			f.write("rebuilt wheel")
+		add_to_wheelhouse(os.path.join(root, "build", "six-1.16.0-py2.py3-none-any.whl"), root)
+		self.assertEqual(prune_wheelhouse(root), len("wheel"))
+		self.assertFalse(os.path.exists(stored_path))
+		self.assertEqual(prune_wheelhouse(root), 0)
+		self.assertFalse([name for name in os.listdir(root) if name.endswith(".tmp")])
+
+		with open(os.path.join(root, "pyproject.toml"), "w") as f:
+			f.write('[build-system]\nrequires = ["flit_core >=3.4,<4"]\n')
+		self.assertEqual(
+			get_build_requirements([root, os.path.join(root, "build")]),
+			["flit_core >=3.4,<4", "setuptools>=40.8.0", "wheel"],
+		)
+
+		self.assertEqual(get_wheelhouse_args({}), "")
+		self.assertTrue(
+			get_wheelhouse_args({"use_wheelhouse": 1, "wheelhouse_only": 1}).endswith("--no-index")
+		)
+
+	def test_batch_python_requirements(self):
+		ocean_dir = self.make_ocean(apps=("frappe", "app_1", "app_2"))
+		with open(os.path.join(ocean_dir, "apps", "app_2", "app_2", "__init__.py"), "w") as f:
+			f.write('__version__ = "15.x.x-develop"\n')
+		with open(os.path.join(ocean_dir, "sites", "apps.json"), "w") as f:
+			json.dump({app: {"version": None} for app in ("frappe", "app_1", "app_2")}, f)
+
+		self.assertEqual(get_app_constraints(ocean_dir), "frappe==15.0.0\napp_1==15.0.0\n")
+
+		conflict = subprocess.CompletedProcess([], 1, stderr="ResolutionImpossible")
+		with patch("ocean.utils.ocean.is_pip_dry_run_supported", return_value=True), patch(
+			"ocean.utils.ocean.subprocess.run", return_value=conflict
+		) as dry_run, patch("ocean.ocean.exec_cmd") as exec_cmd:
+			with self.assertRaisesRegex(DependencyConflictError, "ResolutionImpossible"):
+				install_python_requirements(["frappe", "app_1"], ocean_path=ocean_dir)
+
+		# a single resolver run for all apps & nothing installed after it failed
+		self.assertEqual(dry_run.call_args.args[0].count("-e"), 2)
+		exec_cmd.assert_not_called()
+
+	def test_yarn_packages(self):
+		ocean_dir = self.make_ocean(apps=("frappe", "app_1", "app_2"))
+		for app in ("frappe", "app_1"):
+			with open(os.path.join(ocean_dir, "apps", app, "package.json"), "w") as f:
+				f.write("{}")
+
+		def fake_yarn(cmd, cwd, **kwargs):
+			os.makedirs(os.path.join(cwd, "node_modules"), exist_ok=True)
+			with open(os.path.join(cwd, "node_modules", ".yarn-integrity"), "w") as f:
+				f.write(cmd[0])
+			return 0
+
+		with patch("ocean.utils.ocean.which", return_value="/usr/bin/yarn"), patch(
+			"ocean.utils.ocean.subprocess.call", side_effect=fake_yarn
+		) as yarn, patch("ocean.utils.ocean.log"), patch.dict(
+			sys.modules, {"ocean.cli": Mock(verbose=False)}
+		), patch.dict(os.environ, {"XDG_CACHE_HOME": os.path.join(ocean_dir, "cache dir")}):
+			update_yarn_packages(ocean_path=ocean_dir, jobs=2)
+			self.assertEqual(yarn.call_count, 2)
+
+			# concurrent installs never share a cache, each is locked against other processes
+			cache_folders = set()
+			for call in yarn.call_args_list:
+				cmd = call.args[0]
+				cache_folder = cmd[cmd.index("--cache-folder") + 1]
+				self.assertTrue(os.path.isdir(cache_folder))
+				self.assertEqual(cmd[cmd.index("--mutex") + 1], f"file:{cache_folder}/.mutex")
+				cache_folders.add(cache_folder)
+			self.assertEqual(len(cache_folders), 2)
+
+			# nothing changed, nothing to install
+			update_yarn_packages(ocean_path=ocean_dir, jobs=2)
+			self.assertEqual(yarn.call_count, 2)
+
+			shutil.rmtree(os.path.join(ocean_dir, "apps", "app_1", "node_modules"))
+			with open(os.path.join(ocean_dir, "apps", "frappe", "yarn.lock"), "w") as f:
+				f.write("# yarn lockfile v1\n")
+			update_yarn_packages(ocean_path=ocean_dir, jobs=2)
+			self.assertEqual(yarn.call_count, 4)
@@ -0,0 +1,52 @@
+# imports - standard imports
+import json
+import os
+from unittest.mock import patch
+
+# imports - module imports
+from ocean.exceptions import PatchError
+from ocean.tests.test_base import TestSandboxBase
+from ocean.utils.ocean import patch_sites_concurrently
+from ocean.utils.system import get_backup_size
+
+
+class TestSystem(TestSandboxBase):
+	def test_patch_sites_concurrently(self):
+		sites = [f"site{idx}.local" for idx in range(5)]
+
+		def fake_migrate(*args, **kwargs):
+			return int(args[1] == "site3.local")
+
+		with patch("ocean.utils.system.run_frappe_cmd_with_log", side_effect=fake_migrate) as cmd, patch(
+			"ocean.utils.system.log"
+		):
+			with self.assertRaisesRegex(PatchError, r"1 site\(s\): site3.local"):
+				patch_sites_concurrently(sites, jobs=3, ocean_path=".")
+
+		# every site is attempted even though one of them failed
+		self.assertEqual(cmd.call_count, len(sites))
+
+	def test_backup_size(self):
+		ocean_dir = self.make_sandbox()
+		site_path = os.path.join(ocean_dir, "sites", "site1.local")
+		os.makedirs(os.path.join(site_path, "private", "backups"))
+		backups_path = os.path.join(ocean_dir, "backups", "site1")
+		os.makedirs(backups_path)
+
+		def make_backup(path, name, size):
+			with open(os.path.join(path, f"20240101_000000-{name}"), "wb") as f:
+				f.write(b"0" * size)
+
+		make_backup(os.path.join(site_path, "private", "backups"), "site1_local-database.sql.gz", 10)
+		make_backup(backups_path, "site1_local-files.tar", 20)
+		self.assertEqual(get_backup_size("site1.local", ocean_path=ocean_dir), 10)
+
+		# backup_path is relative to sites, like the framework resolves it
+		with open(os.path.join(site_path, "site_config.json"), "w") as f:
+			json.dump({"backup_path": "../backups/site1"}, f)
+		self.assertEqual(get_backup_size("site1.local", ocean_path=ocean_dir), 20)
+
+		# in a backup_path shared by sites, only the site's own backups are counted
+		make_backup(backups_path, "site1_local2-database.sql.gz", 40)
+		make_backup(backups_path, "site1_local-database.sql.gz", 80)
+		self.assertEqual(get_backup_size("site1.local", ocean_path=ocean_dir), 100)
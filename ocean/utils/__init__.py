@@ -5,10 +5,11 @@ import os
 import re
 import subprocess
 import sys
+from collections import deque
 from functools import lru_cache
 from glob import glob
 from shlex import split
-from typing import List, Tuple
+from typing import List, Set, Tuple
 
 # imports - third party imports
 import click
@@ -25,17 +26,30 @@ logger = logging.getLogger(PROJECT_NAME)
 paths_in_app = ("hooks.py", "modules.txt", "patches.txt")
 paths_in_ocean = ("apps", "sites", "config", "logs", "config/pids")
 sudoers_file = "/etc/sudoers.d/frappe"
+ocean_cache_file = ".ocean.cmd"
+ocean_app_index_file = ".ocean.apps"
+# never hold an ocean, but can be huge
+find_pruned_directories = {
+	".cache",
+	".git",
+	".npm",
+	".venv",
+	".yarn",
+	"__pycache__",
+	"env",
+	"node_modules",
+	"site-packages",
+	"venv",
+}
+OUTPUT_CHUNK_SIZE = 64 * 1024
+# lines of a framework command's output kept to log if it fails
+OUTPUT_BUFFER_LINES = 200
 UNSET_ARG = object()
 
 
 def is_ocean_directory(directory=os.path.curdir):
-	is_ocean = True
-
-	for folder in paths_in_ocean:
-		path = os.path.abspath(os.path.join(directory, folder))
-		is_ocean = is_ocean and os.path.exists(path)
-
-	return is_ocean
+	# stops at the first missing folder, which for most directories is the first one
+	return all(os.path.exists(os.path.join(directory, folder)) for folder in paths_in_ocean)
 
 
 def is_frappe_app(directory: str) -> bool:
@@ -51,6 +65,61 @@ def is_frappe_app(directory: str) -> bool:
 	return bool(is_frappe_app)
 
 
+def get_frappe_apps(ocean_path=".") -> List[str]:
+	"""Returns names of frappe apps in the ocean's apps folder, in listing order
+
+	Results of is_frappe_app are indexed in .ocean.apps by the mtime of each app's top
+	level directory, so only new or changed apps are looked into. If the mtime of apps/
+	is unchanged too, the folder isn't even listed.
+	"""
+	apps_path = os.path.join(ocean_path, "apps")
+	index_path = os.path.join(ocean_path, ocean_app_index_file)
+	apps_mtime = os.stat(apps_path).st_mtime_ns
+
+	try:
+		with open(index_path) as f:
+			index = json.load(f)
+	except (OSError, ValueError):
+		index = {}
+
+	if not isinstance(index, dict):
+		index = {}
+
+	cached_apps = index.get("apps", {})
+
+	if index.get("mtime") == apps_mtime:
+		dirs = list(cached_apps)
+	else:
+		dirs = os.listdir(apps_path)
+
+	apps = {}
+	for name in dirs:
+		try:
+			mtime = os.stat(os.path.join(apps_path, name)).st_mtime_ns
+		except OSError:
+			continue
+
+		cached = cached_apps.get(name)
+		if cached and cached["mtime"] == mtime:
+			apps[name] = cached
+		else:
+			apps[name] = {
+				"mtime": mtime,
+				"is_app": is_frappe_app(os.path.join(apps_path, name)),
+			}
+
+	if apps != cached_apps or index.get("mtime") != apps_mtime:
+		tmp_path = f"{index_path}.{os.getpid()}.tmp"
+		try:
+			with open(tmp_path, "w") as f:
+				json.dump({"mtime": apps_mtime, "apps": apps}, f)
+			os.replace(tmp_path, index_path)
+		except OSError:
+			logger.warning("Couldn't write ocean app index", exc_info=True)
+
+	return [name for name, app in apps.items() if app["is_app"]]
+
+
 @lru_cache(maxsize=None)
 def is_valid_frappe_branch(frappe_path: str, frappe_branch: str):
 	"""Check if a branch exists in a repo. Throws InvalidRemoteException if branch is not found
@@ -93,7 +162,9 @@ def log(message, level=0, no_log=False, stderr=False):
 	color, prefix = levels.get(level, levels[0])
 
 	if ocean.cli.from_command_line and ocean.cli.dynamic_feed:
-		ocean.LOG_BUFFER.append({"prefix": prefix, "message": message, "color": color})
+		from ocean.utils.render import get_feed
+
+		get_feed().log(message, prefix, color=color)
 
 	if no_log:
 		click.secho(message, fg=color, err=stderr)
@@ -142,6 +213,8 @@ def pause_exec(seconds=10):
 
 
 def exec_cmd(cmd, cwd=".", env=None, _raise=True):
+	from ocean.utils.render import mark_foreign_output
+
 	if env:
 		env.update(os.environ.copy())
 
@@ -151,6 +224,7 @@ def exec_cmd(cmd, cwd=".", env=None, _raise=True):
 	cmd_log = f"{cwd_info}{cmd}"
 	logger.debug(cmd_log)
 	spl_cmd = split(cmd)
+	mark_foreign_output()
 	return_code = subprocess.call(spl_cmd, cwd=cwd, universal_newlines=True, env=env)
 	if return_code:
 		logger.warning(f"{cmd_log} executed with exit code {return_code}")
@@ -232,6 +306,7 @@ def is_root():
 def run_frappe_cmd(*args, **kwargs):
 	from ocean.cli import from_command_line
 	from ocean.utils.ocean import get_env_cmd
+	from ocean.utils.render import mark_foreign_output
 
 	ocean_path = kwargs.get("ocean_path", ".")
 	f = get_env_cmd("python", ocean_path=ocean_path)
@@ -243,6 +318,9 @@ def run_frappe_cmd(*args, **kwargs):
 	else:
 		stderr = stdout = None
 
+	if not is_async:
+		mark_foreign_output()
+
 	p = subprocess.Popen(
 		(f, "-m", "frappe.utils.ocean_helper", "frappe") + args,
 		cwd=sites_dir,
@@ -250,39 +328,131 @@ def run_frappe_cmd(*args, **kwargs):
 		stderr=stderr,
 	)
 
-	return_code = print_output(p) if is_async else p.wait()
+	if is_async:
+		output = deque(maxlen=OUTPUT_BUFFER_LINES)
+		return_code = print_output(p, buffer=output)
+	else:
+		return_code = p.wait()
+
 	if return_code > 0:
+		if is_async:
+			logger.warning(f"frappe {' '.join(args)} failed with output:\n" + "\n".join(output))
 		sys.exit(return_code)
 
 
-def print_output(p):
-	from select import select
+def exec_cmd_with_log(cmd, log_file: str, cwd=".", _raise=True) -> int:
+	"""Runs cmd like exec_cmd, with its stdout & stderr appended to log_file instead of
+	the terminal so that multiple commands can be run concurrently"""
+	os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+	logger.debug(f"cd {cwd} && {cmd} >> {log_file}")
+
+	with open(log_file, "a") as log_f:
+		log_f.write(f"$ {cmd}\n")
+		log_f.flush()
+		return_code = subprocess.call(split(cmd), cwd=cwd, stdout=log_f, stderr=subprocess.STDOUT)
+
+	if return_code:
+		logger.warning(f"{cmd} executed with exit code {return_code}")
+		if _raise:
+			raise CommandFailedError(cmd) from subprocess.CalledProcessError(return_code, cmd)
+	return return_code
+
+
+def run_frappe_cmd_with_log(
+	*args, log_file: str = None, ocean_path=".", nice: int = None, ionice_class: int = None
+) -> int:
+	"""Runs a framework command with its stdout & stderr written to log_file instead of
+	the terminal, so that multiple commands can be run concurrently, or to the terminal if
+	log_file is None. The command's CPU and I/O priority can be lowered using nice &
+	ionice where available. Returns the exit code"""
+	from ocean.utils.ocean import get_env_cmd
+	from ocean.utils.render import mark_foreign_output
+
+	f = get_env_cmd("python", ocean_path=ocean_path)
+	sites_dir = os.path.join(ocean_path, "sites")
+	cmd = (f, "-m", "frappe.utils.ocean_helper", "frappe") + args
 
-	while p.poll() is None:
-		readx = select([p.stdout.fileno(), p.stderr.fileno()], [], [])[0]
-		send_buffer = []
-		for fd in readx:
-			if fd == p.stdout.fileno():
-				while 1:
-					buf = p.stdout.read(1)
-					if not len(buf):
-						break
-					if buf == "\r" or buf == "\n":
-						send_buffer.append(buf)
-						log_line("".join(send_buffer), "stdout")
-						send_buffer = []
-					else:
-						send_buffer.append(buf)
+	if nice is not None and which("nice"):
+		cmd = ("nice", "-n", str(nice)) + cmd
 
-			if fd == p.stderr.fileno():
-				log_line(p.stderr.readline(), "stderr")
-	return p.poll()
+	if ionice_class and which("ionice"):
+		cmd = ("ionice", "-c", str(ionice_class)) + cmd
+
+	if log_file:
+		os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+		logger.debug(f"cd {sites_dir} && {' '.join(cmd)} > {log_file}")
+
+		with open(log_file, "w") as log_f:
+			return_code = subprocess.call(cmd, cwd=sites_dir, stdout=log_f, stderr=subprocess.STDOUT)
+	else:
+		logger.debug(f"cd {sites_dir} && {' '.join(cmd)}")
+		mark_foreign_output()
+		return_code = subprocess.call(cmd, cwd=sites_dir)
+
+	if return_code:
+		logger.warning(f"{' '.join(args)} executed with exit code {return_code}")
+
+	return return_code
+
+
+def print_output(p, buffer=None) -> int:
+	"""Streams stdout & stderr of process p, opened with pipes, to the terminal until it
+	exits and returns its exit code. Output is read in chunks and written a batch of
+	complete lines at a time. buffer, a collections.deque with a maxlen, keeps the last
+	lines of output in memory"""
+	import codecs
+	import selectors
+
+	selector = selectors.DefaultSelector()
+	for pipe, stream in ((p.stdout, "stdout"), (p.stderr, "stderr")):
+		if pipe:
+			decoder = codecs.getincrementaldecoder("utf-8")("replace")
+			selector.register(
+				pipe, selectors.EVENT_READ, {"stream": stream, "decoder": decoder, "pending": ""}
+			)
+
+	while selector.get_map():
+		for key, _ in selector.select():
+			chunk = os.read(key.fd, OUTPUT_CHUNK_SIZE)
+			state = key.data
+
+			data = state["pending"] + state["decoder"].decode(chunk, final=not chunk)
+
+			if chunk:
+				# \r ends lines too, for progress bars that redraw a line. A trailing \r is
+				# held back as it may be the first half of a \r\n split across chunks
+				complete = data[:-1] if data.endswith("\r") else data
+				end = max(complete.rfind("\n"), complete.rfind("\r")) + 1
+			else:
+				# EOF, flush whatever is left of the last line
+				end = len(data)
+				selector.unregister(key.fileobj)
+
+			lines, state["pending"] = data[:end], data[end:]
+
+			if lines:
+				log_line(lines, state["stream"])
+				if buffer is not None:
+					buffer.extend(lines.splitlines())
+
+	selector.close()
+	return p.wait()
 
 
 def log_line(data, stream):
 	if stream == "stderr":
-		return sys.stderr.write(data)
-	return sys.stdout.write(data)
+		sys.stderr.write(data)
+		return sys.stderr.flush()
+	sys.stdout.write(data)
+	return sys.stdout.flush()
+
+
+def get_cache_path(*paths) -> str:
+	"""Returns a path under ocean's host level cache directory, ~/.cache/ocean by default"""
+	cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+		os.path.expanduser("~"), ".cache"
+	)
+	return os.path.join(cache_home, "ocean", *paths)
 
 
 def get_ocean_name(ocean_path):
@@ -325,7 +495,14 @@ def run_playbook(playbook_name, extra_vars=None, tag=None):
 	subprocess.check_call(args, cwd=os.path.join(ocean.__path__[0], "playbooks"))
 
 
-def find_oceanes(directory: str = None) -> List:
+def find_oceanes(
+	directory: str = None, max_depth: int = None, jobs: int = None, quiet: bool = False
+) -> List:
+	"""Returns info of oceanes found under directory, walking a level of the tree at a
+	time with jobs threads. Oceanes aren't descended into & directories that can't hold
+	an ocean, like node_modules or .git, are skipped. max_depth is relative to directory."""
+	from concurrent.futures import ThreadPoolExecutor
+
 	if not directory:
 		directory = os.path.expanduser("~")
 	elif os.path.exists(directory):
@@ -335,29 +512,88 @@ def find_oceanes(directory: str = None) -> List:
 		sys.exit(1)
 
 	if is_ocean_directory(directory):
-		if os.path.curdir == directory:
-			print("You are in a ocean directory!")
-		else:
-			print(f"{directory} is a ocean directory!")
-		return
+		if not quiet:
+			if os.path.curdir == directory:
+				print("You are in a ocean directory!")
+			else:
+				print(f"{directory} is a ocean directory!")
+		return [get_ocean_info(directory)]
 
 	oceanes = []
+	level, depth = [directory], 0
+
+	# directory scans are IO bound, threads keep the disk queue full on slow filesystems
+	with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as executor:
+		while level and (max_depth is None or depth < max_depth):
+			next_level = []
+
+			for found, sub_directories in executor.map(scan_for_oceanes, level):
+				for path in found:
+					if not quiet:
+						print(f"{path} found!")
+					oceanes.append(path)
+				next_level.extend(sub_directories)
+
+			level, depth = next_level, depth + 1
+
+		return sorted(executor.map(get_ocean_info, oceanes), key=lambda info: info["path"])
+
+
+def scan_for_oceanes(directory: str) -> Tuple[List[str], List[str]]:
+	"""Returns oceanes & other sub directories worth walking in directory"""
+	oceanes, sub_directories = [], []
 
 	try:
-		sub_directories = os.listdir(directory)
-	except PermissionError:
-		return oceanes
-
-	for sub in sub_directories:
-		sub = os.path.join(directory, sub)
-		if os.path.isdir(sub) and not os.path.islink(sub):
-			if is_ocean_directory(sub):
-				print(f"{sub} found!")
-				oceanes.append(sub)
-			else:
-				oceanes.extend(find_oceanes(sub))
+		with os.scandir(directory) as entries:
+			directories = [
+				entry.path
+				for entry in entries
+				if entry.name not in find_pruned_directories
+				and entry.is_dir(follow_symlinks=False)
+			]
+	except OSError:
+		return oceanes, sub_directories
+
+	for path in directories:
+		if is_ocean_directory(path):
+			oceanes.append(path)
+		else:
+			sub_directories.append(path)
+
+	return oceanes, sub_directories
+
+
+def get_ocean_info(ocean_path: str) -> dict:
+	"""Returns what can be told about an ocean from its files, without running anything"""
+	from ocean.utils.app import get_version_from_string
+
+	sites_path = os.path.join(ocean_path, "sites")
+	info = {"path": ocean_path, "apps": [], "sites": [], "frappe_version": None}
+
+	try:
+		with open(os.path.join(sites_path, "apps.txt")) as f:
+			info["apps"] = [app.strip() for app in f.read().splitlines() if app.strip()]
+	except OSError:
+		pass
+
+	try:
+		with os.scandir(sites_path) as entries:
+			info["sites"] = sorted(
+				entry.name
+				for entry in entries
+				if entry.is_dir()
+				and os.path.exists(os.path.join(entry.path, "site_config.json"))
+			)
+	except OSError:
+		pass
+
+	try:
+		with open(os.path.join(ocean_path, "apps", "frappe", "frappe", "__init__.py")) as f:
+			info["frappe_version"] = get_version_from_string(f.read())
+	except Exception:
+		pass
 
-	return oceanes
+	return info
 
 
 def is_dist_editable(dist: str) -> bool:
@@ -386,14 +622,21 @@ def find_parent_ocean(path: str) -> str:
 def get_env_frappe_commands(ocean_path=".") -> List:
 	"""Caches all available commands (even custom apps) via Frappe
 	Default caching behaviour: generated the first time any command (for a specific ocean directory)
+	is run and regenerated only when the installed apps or the env's site-packages change
 	"""
 	from ocean.utils.ocean import get_env_cmd
 
+	cache_key = get_command_cache_key(ocean_path)
+	cached_commands = get_cached_commands(cache_key, ocean_path=ocean_path)
+
+	if cached_commands is not None:
+		return cached_commands
+
 	python = get_env_cmd("python", ocean_path=ocean_path)
 	sites_path = os.path.join(ocean_path, "sites")
 
 	try:
-		return json.loads(
+		commands = json.loads(
 			get_cmd_output(
 				f"{python} -m frappe.utils.ocean_helper get-frappe-commands", cwd=sites_path
 			)
@@ -403,7 +646,155 @@ def get_env_frappe_commands(ocean_path=".") -> List:
 		if hasattr(e, "stderr"):
 			print(e.stderr)
 
-	return []
+		return []
+
+	if commands:
+		cache_commands(commands, cache_key, ocean_path=ocean_path)
+
+	return commands
+
+
+def canonicalize_name(name: str) -> str:
+	"""Normalizes a distribution name as per PEP 503"""
+	return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def get_installed_distributions(ocean_path=".") -> Set[str]:
+	"""Returns canonical names of distributions installed in the ocean's env, read from
+	.dist-info, .egg-info & .egg-link entries in its site-packages"""
+	distributions = set()
+
+	for site_packages in glob(
+		os.path.join(ocean_path, "env", "lib", "python*", "site-packages")
+	):
+		try:
+			mtime = os.stat(site_packages).st_mtime_ns
+		except OSError:
+			continue
+		distributions.update(_get_distributions(os.path.abspath(site_packages), mtime))
+
+	return distributions
+
+
+@lru_cache(maxsize=None)
+def _get_distributions(site_packages: str, mtime: int) -> frozenset:
+	# mtime is only part of the cache key, site-packages' mtime changes on every
+	# install or uninstall as those add or remove its entries
+	distributions = set()
+
+	for entry in os.listdir(site_packages):
+		name, ext = os.path.splitext(entry)
+		if ext in (".dist-info", ".egg-info"):
+			# {name}-{version}.dist-info, name can't contain "-" here
+			distributions.add(canonicalize_name(name.partition("-")[0]))
+		elif ext == ".egg-link":
+			distributions.add(canonicalize_name(name))
+
+	return frozenset(distributions)
+
+
+def get_command_cache_key(ocean_path=".") -> str:
+	"""Returns a fingerprint of everything the framework command list depends on: the
+	HEAD commit (or mtime, for non git apps) of each app and the mtime of the env's
+	site-packages. Only stat calls & small file reads, no subprocesses."""
+	import hashlib
+
+	apps_path = os.path.join(ocean_path, "apps")
+	state = [VERSION]
+
+	try:
+		apps = sorted(os.listdir(apps_path))
+	except FileNotFoundError:
+		apps = []
+
+	for app in apps:
+		app_path = os.path.join(apps_path, app)
+		try:
+			app_mtime = os.stat(app_path).st_mtime_ns
+		except OSError:
+			continue
+		state.append(f"{app}:{get_git_head(app_path) or app_mtime}")
+
+	for site_packages in sorted(
+		glob(os.path.join(ocean_path, "env", "lib", "python*", "site-packages"))
+	):
+		state.append(f"{site_packages}:{os.stat(site_packages).st_mtime_ns}")
+
+	return hashlib.sha1("\n".join(state).encode()).hexdigest()
+
+
+def get_git_head(repo_path: str) -> str:
+	"""Returns the commit hash HEAD points to by reading the git directory directly"""
+	git_dir = os.path.join(repo_path, ".git")
+
+	try:
+		if os.path.isfile(git_dir):
+			# worktrees & submodules: .git is a file pointing to the actual git dir
+			with open(git_dir) as f:
+				git_dir = os.path.join(repo_path, f.read().strip().split("gitdir: ", 1)[-1])
+
+		with open(os.path.join(git_dir, "HEAD")) as f:
+			head = f.read().strip()
+	except OSError:
+		return None
+
+	if not head.startswith("ref: "):
+		return head
+
+	ref = head[5:]
+	try:
+		with open(os.path.join(git_dir, ref)) as f:
+			return f.read().strip()
+	except OSError:
+		pass
+
+	try:
+		with open(os.path.join(git_dir, "packed-refs")) as f:
+			for line in f:
+				if line.rstrip().endswith(f" {ref}"):
+					return line.split(" ", 1)[0]
+	except OSError:
+		pass
+
+	return None
+
+
+def get_cached_commands(cache_key: str, ocean_path=".") -> List:
+	"""Returns cached framework commands if the cache is still valid for cache_key"""
+	try:
+		with open(os.path.join(ocean_path, ocean_cache_file)) as f:
+			cache = json.load(f)
+	except (OSError, ValueError):
+		return None
+
+	if isinstance(cache, dict) and cache.get("key") == cache_key:
+		return cache.get("commands")
+
+
+def cache_commands(commands: List, cache_key: str, ocean_path="."):
+	cache_path = os.path.join(ocean_path, ocean_cache_file)
+	tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+
+	try:
+		with open(tmp_path, "w") as f:
+			json.dump({"key": cache_key, "commands": commands}, f)
+		os.replace(tmp_path, cache_path)
+	except OSError:
+		# cache is an optimization, a read only ocean directory shouldn't break the CLI
+		logger.warning("Couldn't write ocean command cache", exc_info=True)
+
+
+def clear_command_cache(ocean_path="."):
+	"""Clears commands cached
+	The cache is invalidated automatically when apps or the env change, this is for
+	edge cases like editing an app's commands without committing
+	"""
+	cache_path = os.path.join(ocean_path, ocean_cache_file)
+
+	if os.path.exists(cache_path):
+		os.remove(cache_path)
+	else:
+		print("Ocean command cache doesn't exist in this folder!")
 
 
 def find_org(org_repo):
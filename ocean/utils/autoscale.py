@@ -0,0 +1,240 @@
+# imports - standard imports
+import logging
+import math
+import os
+import subprocess
+import time
+
+# imports - module imports
+import ocean
+from ocean.exceptions import ValidationError
+from ocean.utils import get_cmd_output, get_ocean_name, log, which
+
+logger = logging.getLogger(ocean.PROJECT_NAME)
+
+AUTOSCALED_QUEUES = ("default", "short", "long")
+DEFAULT_INTERVAL = 10
+DEFAULT_COOLDOWN = 120
+DEFAULT_JOBS_PER_WORKER = 10
+
+
+def get_autoscale_config(conf, multi_queue_consumption=False) -> dict:
+	"""Returns the autoscale config from common_site_config with defaults filled in
+
+	"autoscale": {
+	        "interval": 10,
+	        "cooldown": 120,
+	        "queues": {
+	                "long": {"min": 1, "max": 6, "jobs_per_worker": 5}
+	        }
+	}
+
+	min workers are always running, up to max - min more are started as jobs queue up.
+	Workers are only stopped once a queue has needed fewer of them for cooldown seconds.
+	"""
+	autoscale = conf.get("autoscale") or {}
+	background_workers = conf.get("background_workers") or 1
+	queues = {}
+
+	for queue, queue_conf in (autoscale.get("queues") or {}).items():
+		if queue not in AUTOSCALED_QUEUES:
+			raise ValidationError(
+				f"Only {', '.join(AUTOSCALED_QUEUES)} queues can be autoscaled, not {queue}"
+			)
+
+		# with multi queue consumption, default jobs are picked up by short & long workers
+		if queue == "default" and multi_queue_consumption:
+			continue
+
+		min_workers = queue_conf.get("min") or background_workers
+		max_workers = queue_conf.get("max") or min_workers
+		if not 1 <= min_workers <= max_workers:
+			raise ValidationError(f"Invalid autoscale bounds for {queue}: 1 <= min <= max")
+
+		queues[queue] = {
+			"min": min_workers,
+			"max": max_workers,
+			"jobs_per_worker": queue_conf.get("jobs_per_worker") or DEFAULT_JOBS_PER_WORKER,
+		}
+
+	return {
+		"interval": autoscale.get("interval") or DEFAULT_INTERVAL,
+		"cooldown": autoscale.get("cooldown", DEFAULT_COOLDOWN),
+		"queues": queues,
+	}
+
+
+def get_queue_lengths(conf, queues, ocean_path=".") -> dict:
+	"""Returns number of jobs waiting in each RQ queue, read with a single redis-cli call"""
+	queue_prefix = get_queue_prefix(conf, ocean_path)
+	# older frappe versions don't prefix queue names
+	keys = {queue: [f"rq:queue:{queue_prefix}:{queue}", f"rq:queue:{queue}"] for queue in queues}
+	commands = "\n".join(f"LLEN {key}" for queue in queues for key in keys[queue])
+
+	output = subprocess.run(
+		[which("redis-cli", raise_err=True), "-u", conf.get("redis_queue")],
+		input=commands,
+		capture_output=True,
+		text=True,
+		check=True,
+	).stdout.split()
+	lengths = iter(int(length) for length in output)
+
+	return {queue: sum(next(lengths) for _ in keys[queue]) for queue in queues}
+
+
+def get_queue_prefix(conf, ocean_path=".") -> str:
+	"""Returns what frappe prefixes queue names with: bench_id from common_site_config.json
+	or the ocean's resolved path with / replaced by -"""
+	return conf.get("bench_id") or os.path.realpath(ocean_path).strip("/").replace("/", "-")
+
+
+def get_desired_workers(queue_length, queue_conf) -> int:
+	desired = math.ceil(queue_length / queue_conf["jobs_per_worker"])
+	return min(max(desired, queue_conf["min"]), queue_conf["max"])
+
+
+class SupervisorWorkers:
+	"""Workers beyond min run as the {ocean}-frappe-{queue}-worker-burst program, which
+	supervisor doesn't autostart. These are in the {ocean}-burst-workers group so that
+	restarting the ocean only restarts those that are running"""
+
+	def __init__(self, ocean_path="."):
+		self.ocean_name = get_ocean_name(ocean_path)
+		self.sudo = ""
+		self.processes = []
+
+		status = get_cmd_output("supervisorctl status", _raise=False)
+		if "Permission denied" in status:
+			self.sudo = "sudo "
+
+	def burst_processes(self, queue, queue_conf):
+		program = f"{self.ocean_name}-frappe-{queue}-worker-burst"
+		return [
+			f"{self.ocean_name}-burst-workers:{program}-{idx}"
+			for idx in range(queue_conf["max"] - queue_conf["min"])
+		]
+
+	def running(self, queue, queue_conf) -> int:
+		processes = self.burst_processes(queue, queue_conf)
+		if not processes:
+			return queue_conf["min"]
+
+		status = get_cmd_output(
+			f"{self.sudo}supervisorctl status {' '.join(processes)}", _raise=False
+		)
+		running = [
+			line
+			for line in status.splitlines()
+			if line.split()[1:2] in (["RUNNING"], ["STARTING"])
+		]
+		return queue_conf["min"] + len(running)
+
+	def scale(self, queue, queue_conf, current, target):
+		processes = self.burst_processes(queue, queue_conf)
+		start, end = sorted((current, target))
+		processes = processes[start - queue_conf["min"] : end - queue_conf["min"]]
+		action = "start" if target > current else "stop"
+
+		# stopping waits for running jobs to finish, don't block polling other queues on it
+		self.processes = [process for process in self.processes if process.poll() is None]
+		self.processes.append(
+			subprocess.Popen(
+				f"{self.sudo}supervisorctl {action} {' '.join(processes)}".split(),
+				stdout=subprocess.DEVNULL,
+			)
+		)
+
+
+class SystemdWorkers:
+	"""Workers are instances of the {ocean}-frappe-{queue}-worker@ template unit, the
+	ocean's target only wants the first min of them"""
+
+	def __init__(self, ocean_path="."):
+		self.ocean_name = get_ocean_name(ocean_path)
+
+	def units(self, queue, start, end):
+		return [
+			f"{self.ocean_name}-frappe-{queue}-worker@{idx}.service"
+			for idx in range(start + 1, end + 1)
+		]
+
+	def running(self, queue, queue_conf) -> int:
+		units = self.units(queue, 0, queue_conf["max"])
+		status = get_cmd_output(f"systemctl is-active {' '.join(units)}", _raise=False)
+		return sum(state in ("active", "activating") for state in status.split())
+
+	def scale(self, queue, queue_conf, current, target):
+		units = self.units(queue, *sorted((current, target)))
+		action = "start" if target > current else "stop"
+
+		# -n fails instead of waiting for a password, `ocean setup sudoers` allows these
+		result = subprocess.run(
+			f"sudo -n systemctl {action} --no-block {' '.join(units)}".split(),
+			capture_output=True,
+			text=True,
+		)
+		if result.returncode:
+			log(f"Couldn't {action} {queue} workers: {result.stderr.strip()}", level=2)
+
+
+def autoscale(ocean_path=".", once=False, dry_run=False):
+	"""Polls RQ queue lengths & scales the ocean's workers within their autoscale bounds.
+	If once is set, queues are polled a single time and cooldown doesn't apply"""
+	from ocean.config.supervisor import can_enable_multi_queue_consumption
+	from ocean.ocean import Ocean
+
+	conf = Ocean(ocean_path).conf
+	config = get_autoscale_config(conf, can_enable_multi_queue_consumption(ocean_path))
+	queues = config["queues"]
+
+	if not queues:
+		log("No queues are set up for autoscaling in common_site_config.json", level=3)
+		return
+
+	if not conf.get("redis_queue"):
+		raise ValidationError(
+			"redis_queue isn't set in common_site_config.json, queue lengths can't be read"
+		)
+
+	if conf.get("restart_systemd_on_update"):
+		workers = SystemdWorkers(ocean_path)
+	else:
+		workers = SupervisorWorkers(ocean_path)
+
+	# queue: time since when it's needed fewer workers than are running
+	scale_down_since = {}
+
+	while True:
+		try:
+			lengths = get_queue_lengths(conf, queues, ocean_path)
+		except subprocess.CalledProcessError as e:
+			logger.warning(f"Couldn't read queue lengths: {e.stderr}")
+			lengths = {}
+		except FileNotFoundError as e:
+			# redis-cli may be installed while the daemon is running, keep polling
+			logger.warning(f"Couldn't read queue lengths: {e}")
+			lengths = {}
+
+		for queue, length in lengths.items():
+			queue_conf = queues[queue]
+			current = workers.running(queue, queue_conf)
+			target = get_desired_workers(length, queue_conf)
+
+			if target < current and not once:
+				since = scale_down_since.setdefault(queue, time.monotonic())
+				if time.monotonic() - since < config["cooldown"]:
+					continue
+			scale_down_since.pop(queue, None)
+
+			if target == current:
+				continue
+
+			log(f"{queue}: {length} queued jobs, scaling workers {current} -> {target}")
+			if not dry_run:
+				workers.scale(queue, queue_conf, current, target)
+
+		if once:
+			break
+
+		time.sleep(config["interval"])
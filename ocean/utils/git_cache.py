@@ -0,0 +1,125 @@
+# imports - standard imports
+import fcntl
+import logging
+import os
+import re
+import shutil
+import subprocess
+from contextlib import contextmanager
+from hashlib import sha1
+
+# imports - module imports
+import ocean
+from ocean.exceptions import CommandFailedError
+from ocean.utils import exec_cmd, get_cache_path, get_cmd_output
+
+logger = logging.getLogger(ocean.PROJECT_NAME)
+
+# in MB, least recently used mirrors are removed beyond it
+DEFAULT_GIT_CACHE_SIZE = 10 * 1024
+
+
+def get_mirror_path(url: str) -> str:
+	name = re.sub(r"\.git$", "", re.split(r"[/:]", url.rstrip("/"))[-1])
+	return get_cache_path("git", f"{name}-{sha1(url.encode()).hexdigest()[:12]}.git")
+
+
+@contextmanager
+def mirror_lock(mirror_path: str, shared: bool = False, blocking: bool = True, name="lock"):
+	"""Locks a mirror, shared by clones using it & exclusively for eviction. Raises
+	BlockingIOError if blocking isn't set and the lock is held. Updates are serialized
+	with a separate lock, named update, so they can run while others clone."""
+	flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+	if not blocking:
+		flags |= fcntl.LOCK_NB
+
+	with open(f"{mirror_path}.{name}", "w") as lock:
+		fcntl.flock(lock, flags)
+		yield
+
+
+@contextmanager
+def use_mirror(url: str, run=exec_cmd):
+	"""Yields path of the host's bare mirror of url updated to the remote, or None if it
+	couldn't be, in which case the remote should be cloned directly. The mirror can't be
+	evicted until the block exits, clone from it within the block. Commands are run with
+	run, exec_cmd's signature."""
+	mirror_path = get_mirror_path(url)
+	os.makedirs(os.path.dirname(mirror_path), exist_ok=True)
+
+	with mirror_lock(mirror_path, shared=True):
+		with mirror_lock(mirror_path, name="update"):
+			updated = update_mirror(url, mirror_path, run=run)
+
+		yield mirror_path if updated else None
+
+
+def update_mirror(url: str, mirror_path: str, run=exec_cmd) -> bool:
+	"""Creates the mirror the first time & fetches just what changed after that. Only
+	branches & tags are mirrored, not refs like GitHub's refs/pull/*. Returns if the
+	mirror is up to date with the remote."""
+	try:
+		if os.path.exists(mirror_path):
+			run("git fetch --prune --quiet origin", cwd=mirror_path)
+		else:
+			tmp_path = f"{mirror_path}.{os.getpid()}.tmp"
+			try:
+				run(f"git init --bare --quiet {tmp_path}")
+				run(f"git remote add origin {url}", cwd=tmp_path)
+				run("git config remote.origin.fetch +refs/heads/*:refs/heads/*", cwd=tmp_path)
+				run(
+					"git config --add remote.origin.fetch +refs/tags/*:refs/tags/*", cwd=tmp_path
+				)
+				run("git fetch --quiet origin", cwd=tmp_path)
+				os.rename(tmp_path, mirror_path)
+			finally:
+				shutil.rmtree(tmp_path, ignore_errors=True)
+
+		# what the remote's HEAD points to is checked out by clones without a branch
+		head = get_cmd_output("git ls-remote --symref origin HEAD", cwd=mirror_path)
+		if head.startswith("ref: "):
+			run(f"git symbolic-ref HEAD {head.split()[1]}", cwd=mirror_path)
+	except (CommandFailedError, subprocess.CalledProcessError):
+		# a stale mirror would leave the app on old code, while pointing to its remote
+		logger.warning(f"Couldn't update git cache for {url}, cloning without it")
+		return False
+
+	# mtime of the mirror is when it was last used, for eviction
+	os.utime(mirror_path)
+	return True
+
+
+def evict_mirrors(max_size: int = DEFAULT_GIT_CACHE_SIZE):
+	"""Removes least recently used mirrors until the cache is under max_size MB. Mirrors
+	being cloned from, see use_mirror, are left alone."""
+	cache_path = get_cache_path("git")
+	if not os.path.isdir(cache_path):
+		return
+
+	mirrors = []
+	for entry in os.scandir(cache_path):
+		if entry.name.endswith(".git") and entry.is_dir(follow_symlinks=False):
+			mirrors.append((entry.stat().st_mtime, get_directory_size(entry.path), entry.path))
+
+	total_size = sum(size for _, size, _ in mirrors)
+
+	for _, size, mirror_path in sorted(mirrors):
+		if total_size <= max_size * 1024 * 1024:
+			break
+
+		try:
+			with mirror_lock(mirror_path, blocking=False):
+				shutil.rmtree(mirror_path)
+		except BlockingIOError:
+			continue
+
+		logger.info(f"Evicted {mirror_path} from git cache")
+		total_size -= size
+
+
+def get_directory_size(path: str) -> int:
+	return sum(
+		os.path.getsize(os.path.join(root, filename))
+		for root, _, filenames in os.walk(path)
+		for filename in filenames
+	)
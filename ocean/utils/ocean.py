@@ -1,25 +1,42 @@
 # imports - standard imports
 import contextlib
+import errno
+import hashlib
 import json
 import logging
 import os
 import re
+import shutil
 import subprocess
 import sys
 from functools import lru_cache
 from glob import glob
 from json.decoder import JSONDecodeError
+from shlex import split
+from typing import List
 
 # imports - third party imports
 import click
 
 # imports - module imports
 import ocean
-from ocean.exceptions import PatchError, ValidationError
+from ocean.exceptions import CommandFailedError, PatchError, ValidationError
 from ocean.utils import exec_cmd, get_ocean_name, get_cmd_output, log, which
+from ocean.utils.render import StepTimer, job
 
 logger = logging.getLogger(ocean.PROJECT_NAME)
 
+DEFAULT_NODE_INSTALL_JOBS = 4
+YARN_FINGERPRINT_FILE = ".ocean-yarn.json"
+
+# version pattern of PEP 440, what pip accepts in constraints
+PEP_440_VERSION = r"""^v?
+	(?:(?:[0-9]+!)?[0-9]+(?:\.[0-9]+)*
+	(?:[-_\.]?(?:a|b|c|rc|alpha|beta|pre|preview)[-_\.]?[0-9]*)?
+	(?:-[0-9]+|[-_\.]?(?:post|rev|r)[-_\.]?[0-9]*)?
+	(?:[-_\.]?dev[-_\.]?[0-9]*)?)
+	(?:\+[a-z0-9]+(?:[-_\.][a-z0-9]+)*)?$"""
+
 
 @lru_cache(maxsize=None)
 def get_env_cmd(cmd: str, ocean_path: str = ".") -> str:
@@ -94,6 +111,71 @@ def install_python_dev_dependencies(ocean_path=".", apps=None, verbose=False):
 			)
 
 
+def install_python_requirements(apps, ocean_path=".", verbose=False):
+	"""Installs apps & their python dependencies with a single pip install, so that the
+	resolver runs once for all of them. Apps are constrained to the versions checked out,
+	which keeps pip from swapping an app for one from the index to satisfy another app.
+	Conflicts are looked for with a dry run first, leaving the env untouched if any."""
+	import tempfile
+	from shlex import quote
+
+	from ocean.exceptions import DependencyConflictError
+	from ocean.ocean import Ocean
+	from ocean.utils.wheels import get_wheelhouse_args
+
+	ocean = Ocean(ocean_path)
+	quiet_flag = "" if verbose else "--quiet"
+	app_paths = " ".join(
+		f"-e {quote(os.path.abspath(os.path.join(ocean.name, 'apps', app)))}" for app in apps
+	)
+
+	with tempfile.NamedTemporaryFile("w", prefix="constraints-", suffix=".txt") as constraints:
+		constraints.write(get_app_constraints(ocean_path))
+		constraints.flush()
+
+		cmd = f"{ocean.python} -m pip install {quiet_flag} --upgrade {get_wheelhouse_args(ocean.conf)} -c {constraints.name} {app_paths}"
+
+		if is_pip_dry_run_supported(ocean.python):
+			dry_run = subprocess.run(
+				split(f"{cmd} --dry-run"), cwd=ocean.name, capture_output=True, text=True
+			)
+			if dry_run.returncode:
+				raise DependencyConflictError(
+					f"Dependencies of {', '.join(apps)} can't be installed together:\n{dry_run.stderr.strip()}"
+				)
+
+		ocean.run(cmd, cwd=ocean.name)
+
+
+def get_app_constraints(ocean_path=".") -> str:
+	"""Returns pip constraints pinning apps in sites/apps.json to their checked out
+	versions. Versions are read from the apps, apps.json only has them as of install."""
+	from ocean.ocean import Ocean
+	from ocean.utils.app import get_current_version
+
+	constraints = []
+
+	for app, state in Ocean(ocean_path).apps.states.items():
+		try:
+			version = get_current_version(app, ocean_path) or state.get("version")
+		except Exception:
+			version = state.get("version")
+
+		# pip rejects constraints with versions like 15.x.x-develop
+		if version and re.match(PEP_440_VERSION, version, re.VERBOSE | re.IGNORECASE):
+			constraints.append(f"{app}=={version}")
+
+	return "\n".join(constraints) + "\n"
+
+
+def is_pip_dry_run_supported(python) -> bool:
+	version = get_cmd_output(f"{python} -m pip --version", _raise=False).split()
+	try:
+		return tuple(int(part) for part in version[1].split(".")[:2]) >= (22, 2)
+	except (IndexError, ValueError):
+		return False
+
+
 def _generate_dev_deps_pattern(pyproject_path):
 	try:
 		from tomli import loads
@@ -110,9 +192,21 @@ def _generate_dev_deps_pattern(pyproject_path):
 	return requirements_pattern
 
 
-def update_yarn_packages(ocean_path=".", apps=None, verbose=None):
+def update_yarn_packages(ocean_path=".", apps=None, verbose=None, jobs=None, force=False):
+	"""Runs yarn install in apps with a package.json, jobs at a time, which defaults to
+	node_install_jobs from common_site_config.json. Apps whose yarn.lock & package.json
+	haven't changed since their last install, with node_modules as it was left, are
+	skipped unless force is set. Packages are cached per host, in yarn_cache_folder if
+	set or ~/.cache/ocean/yarn, with a cache for each of the jobs as yarn's cache isn't
+	safe for concurrent installs. With more than one app installing at a time, output is
+	written to logs/yarn/{app}.log."""
+	from concurrent.futures import ThreadPoolExecutor
+	from queue import SimpleQueue
+	from shlex import quote
+
 	import ocean.cli as ocean_cli
 	from ocean.ocean import Ocean
+	from ocean.utils import get_cache_path
 
 	verbose = ocean_cli.verbose or verbose
 	ocean = Ocean(ocean_path)
@@ -125,12 +219,113 @@ def update_yarn_packages(ocean_path=".", apps=None, verbose=None):
 		print("`npm install -g yarn`")
 		return
 
-	for app in apps:
-		app_path = os.path.join(apps_dir, app)
-		if os.path.exists(os.path.join(app_path, "package.json")):
-			click.secho(f"\nInstalling node dependencies for {app}", fg="yellow")
-			yarn_install = "yarn install --verbose" if verbose else "yarn install"
-			ocean.run(yarn_install, cwd=app_path)
+	app_paths = {
+		app: os.path.join(apps_dir, app)
+		for app in apps
+		if os.path.exists(os.path.join(apps_dir, app, "package.json"))
+	}
+
+	if not force:
+		unchanged = [
+			app
+			for app, app_path in app_paths.items()
+			if get_yarn_fingerprint(app_path) == get_yarn_fingerprint(app_path, installed=True)
+		]
+		for app in unchanged:
+			del app_paths[app]
+
+		if unchanged:
+			log(f"Skipping apps with unchanged node dependencies: {', '.join(unchanged)}")
+
+	if not app_paths:
+		return
+
+	cache_folder = ocean.conf.get("yarn_cache_folder") or get_cache_path("yarn")
+	jobs = jobs or ocean.conf.get("node_install_jobs") or DEFAULT_NODE_INSTALL_JOBS
+	jobs = min(jobs, len(app_paths))
+	logs_path = os.path.join(ocean.name, "logs", "yarn")
+
+	# a running install has a job's cache to itself, the mutex keeps other processes,
+	# like another ocean's update, out of it till it's done
+	job_caches = SimpleQueue()
+	for job in range(jobs):
+		job_caches.put(os.path.join(cache_folder, f"job-{job}"))
+
+	def get_yarn_install(job_cache):
+		cmd = (
+			f"yarn install --prefer-offline --cache-folder {quote(job_cache)}"
+			f" --mutex {quote('file:' + os.path.join(job_cache, '.mutex'))}"
+		)
+		return f"{cmd} --verbose" if verbose else cmd
+
+	def _install(app):
+		app_path = app_paths[app]
+		job_cache = job_caches.get()
+		os.makedirs(job_cache, exist_ok=True)
+
+		try:
+			if jobs == 1:
+				click.secho(f"\nInstalling node dependencies for {app}", fg="yellow")
+				return_code = ocean.run(get_yarn_install(job_cache), cwd=app_path)
+			else:
+				os.makedirs(logs_path, exist_ok=True)
+				with open(os.path.join(logs_path, f"{app}.log"), "w") as log_file:
+					return_code = subprocess.call(
+						split(get_yarn_install(job_cache)),
+						cwd=app_path,
+						stdout=log_file,
+						stderr=subprocess.STDOUT,
+					)
+		finally:
+			job_caches.put(job_cache)
+
+		if not return_code:
+			put_yarn_fingerprint(app_path)
+
+		return return_code
+
+	if jobs > 1:
+		log(
+			f"Installing node dependencies for {len(app_paths)} apps, {jobs} at a time. Logs: {logs_path}"
+		)
+
+	with ThreadPoolExecutor(max_workers=jobs) as executor:
+		failed = [app for app, code in zip(app_paths, executor.map(_install, app_paths)) if code]
+
+	# retried one by one, with yarn's output on the terminal to see why they failed
+	for app in failed:
+		click.secho(f"\nInstalling node dependencies for {app}", fg="yellow")
+		ocean.run(get_yarn_install(os.path.join(cache_folder, "job-0")), cwd=app_paths[app])
+		put_yarn_fingerprint(app_paths[app])
+
+
+def get_yarn_fingerprint(app_path, installed=False) -> dict:
+	"""Returns hashes of the app's yarn.lock, package.json & node_modules/.yarn-integrity,
+	or what they were after the last yarn install if installed is set"""
+	if installed:
+		try:
+			with open(os.path.join(app_path, "node_modules", YARN_FINGERPRINT_FILE)) as f:
+				return json.load(f)
+		except (OSError, ValueError):
+			return None
+
+	fingerprint = {}
+	for path in ("yarn.lock", "package.json", os.path.join("node_modules", ".yarn-integrity")):
+		try:
+			with open(os.path.join(app_path, path), "rb") as f:
+				fingerprint[path] = hashlib.sha256(f.read()).hexdigest()
+		except OSError:
+			fingerprint[path] = None
+
+	return fingerprint
+
+
+def put_yarn_fingerprint(app_path):
+	# kept in node_modules, so that it goes along with what it describes
+	fingerprint_path = os.path.join(app_path, "node_modules", YARN_FINGERPRINT_FILE)
+	if os.path.isdir(os.path.dirname(fingerprint_path)):
+		with open(fingerprint_path, "w") as f:
+			json.dump(get_yarn_fingerprint(app_path), f)
 
 
 def update_npm_packages(ocean_path=".", apps=None, verbose=None):
@@ -175,6 +370,7 @@ def migrate_env(python, backup=False):
 	from urllib.parse import urlparse
 
 	from ocean.ocean import Ocean
+	from ocean.utils.wheels import get_wheelhouse_args
 
 	ocean = Ocean(".")
 	nvenv = "env"
@@ -222,9 +418,11 @@ def migrate_env(python, backup=False):
 		shutil.move(dest, target)
 
 	# Create virtualenv using specified python
+	wheelhouse_args = get_wheelhouse_args(ocean.conf)
+
 	def _install_app(app):
 		app_path = f"-e {os.path.join('apps', app)}"
-		exec_cmd(f"{pvenv}/bin/python -m pip install --upgrade {app_path}")
+		exec_cmd(f"{pvenv}/bin/python -m pip install --upgrade {wheelhouse_args} {app_path}")
 
 	try:
 		logger.log(f"Setting up a New Virtual {python} Environment")
@@ -268,12 +466,17 @@ def post_upgrade(from_ver, to_ver, ocean_path="."):
 		)
 
 
-def patch_sites(ocean_path="."):
+def patch_sites(ocean_path=".", jobs=None):
+	"""Migrates all sites of the ocean. If jobs is more than 1, sites are migrated
+	concurrently and failures are reported together after every site is attempted"""
 	from ocean.ocean import Ocean
 	from ocean.utils.system import migrate_site
 
 	ocean = Ocean(ocean_path)
 
+	if jobs and jobs > 1:
+		return patch_sites_concurrently(ocean.sites, jobs=jobs, ocean_path=ocean_path)
+
 	for site in ocean.sites:
 		try:
 			migrate_site(site, ocean_path=ocean_path)
@@ -281,7 +484,29 @@ def patch_sites(ocean_path="."):
 			raise PatchError
 
 
-def restart_supervisor_processes(ocean_path=".", web_workers=False, _raise=False):
+def patch_sites_concurrently(sites, jobs, ocean_path="."):
+	from ocean.utils.render import render_table
+	from ocean.utils.system import migrate_sites
+
+	if not sites:
+		return
+
+	results = migrate_sites(sites, jobs=jobs, ocean_path=ocean_path)
+	failed = [site for site, (return_code, *_) in results.items() if return_code]
+
+	rows = [
+		[site, "failed" if return_code else "migrated", f"{duration:.1f}s", log_file]
+		for site, (return_code, duration, log_file) in results.items()
+	]
+	print("\n" + render_table(["Site", "Status", "Duration", "Log"], rows) + "\n")
+
+	if failed:
+		raise PatchError(f"Migration failed for {len(failed)} site(s): {', '.join(failed)}")
+
+
+def restart_supervisor_processes(
+	ocean_path=".", web_workers=False, _raise=False, rolling=False
+):
 	from ocean.ocean import Ocean
 
 	ocean = Ocean(ocean_path)
@@ -309,6 +534,12 @@ def restart_supervisor_processes(ocean_path=".", web_workers=False, _raise=False
 			sudo = "sudo "
 			supervisor_status = get_cmd_output("sudo supervisorctl status", cwd=ocean_path)
 
+		if rolling and f"{ocean_name}-workers:" in supervisor_status:
+			rolling_restart_supervisor_processes(
+				ocean, supervisor_status, sudo=sudo, web_workers=web_workers, _raise=_raise
+			)
+			return
+
 		if web_workers and f"{ocean_name}-web:" in supervisor_status:
 			group = f"{ocean_name}-web:\t"
 
@@ -324,10 +555,120 @@ def restart_supervisor_processes(ocean_path=".", web_workers=False, _raise=False
 			group = "frappe:"
 
 		failure = ocean.run(f"{sudo}supervisorctl restart {group}", _raise=_raise)
+
+		# autoscale burst workers aren't in the workers group, only running ones are restarted
+		burst_workers = get_running_burst_workers(supervisor_status, ocean_name)
+		if not web_workers and burst_workers and not failure:
+			failure = ocean.run(
+				f"{sudo}supervisorctl restart {' '.join(burst_workers)}", _raise=_raise
+			)
+
 		if failure:
 			log("restarting supervisor failed. Use `ocean restart` to retry.", level=3)
 
 
+def get_running_burst_workers(supervisor_status, ocean_name) -> List[str]:
+	"""Returns autoscale burst workers that are running, stopped ones are left to
+	ocean autoscale"""
+	return [
+		line.split()[0]
+		for line in supervisor_status.splitlines()
+		if line.startswith(f"{ocean_name}-burst-workers:")
+		and line.split()[1:2] in (["RUNNING"], ["STARTING"])
+	]
+
+
+def rolling_restart_supervisor_processes(
+	ocean, supervisor_status, sudo="", web_workers=False, _raise=False
+):
+	"""Restarts processes one part at a time so that some are always serving:
+
+	* gunicorn is sent HUP, it starts new workers & gracefully stops the old ones. As
+	  that doesn't load new code into a preloaded app, nothing is restarted if
+	  gunicorn_preload is on
+	* the rest of the web group, like node-socketio, can't reload & is restarted
+	* background workers are restarted in batches of rolling_restart_batch_size
+	  (default: a quarter of them), waiting for each batch to be RUNNING before the next
+	"""
+	from ocean.config.common_site_config import get_gunicorn_preload
+
+	conf = ocean.conf
+	ocean_name = get_ocean_name(ocean.name)
+	gunicorn = f"{ocean_name}-web:{ocean_name}-frappe-web"
+
+	if get_gunicorn_preload(conf):
+		message = (
+			"Rolling restarts need gunicorn_preload to be 0, a preloaded app can only load"
+			" new code by restarting gunicorn. Set it & run `ocean setup supervisor`, or"
+			" restart without --rolling"
+		)
+		if _raise:
+			raise ValidationError(message)
+		log(message, level=2)
+		return
+	web = [
+		line.split()[0]
+		for line in supervisor_status.splitlines()
+		if line.startswith(f"{ocean_name}-web:")
+	]
+
+	if gunicorn in web:
+		ocean.run(f"{sudo}supervisorctl signal HUP {gunicorn}", _raise=_raise)
+
+	others = [process for process in web if process != gunicorn]
+	if others:
+		ocean.run(f"{sudo}supervisorctl restart {' '.join(others)}", _raise=_raise)
+
+	if web_workers:
+		return
+
+	workers = [
+		line.split()[0]
+		for line in supervisor_status.splitlines()
+		if line.startswith(f"{ocean_name}-workers:")
+	] + get_running_burst_workers(supervisor_status, ocean_name)
+	batch_size = conf.get("rolling_restart_batch_size") or max(len(workers) // 4, 1)
+	timeout = conf.get("rolling_restart_timeout", 60)
+
+	for i in range(0, len(workers), batch_size):
+		batch = workers[i : i + batch_size]
+		failure = ocean.run(f"{sudo}supervisorctl restart {' '.join(batch)}", _raise=_raise)
+
+		if failure or not wait_for_supervisor_processes(batch, sudo=sudo, timeout=timeout):
+			log(
+				f"rolling restart stopped as {', '.join(batch)} didn't come up. Use `ocean"
+				" restart` to retry.",
+				level=2,
+			)
+			if _raise:
+				raise CommandFailedError(f"supervisorctl restart {' '.join(batch)}")
+			return
+
+
+def wait_for_supervisor_processes(processes, sudo="", timeout=60) -> bool:
+	"""Returns True once all processes are RUNNING, False if they aren't in timeout seconds"""
+	import time
+
+	deadline = time.monotonic() + timeout
+
+	while True:
+		# supervisorctl exits with a non zero code if any process isn't running
+		status = subprocess.run(
+			f"{sudo}supervisorctl status {' '.join(processes)}".split(),
+			capture_output=True,
+			text=True,
+		).stdout
+
+		running = [line for line in status.splitlines() if "RUNNING" in line.split()[1:2]]
+		if len(running) == len(processes):
+			return True
+
+		if time.monotonic() > deadline:
+			return False
+
+		time.sleep(1)
+
+
 def restart_systemd_processes(ocean_path=".", web_workers=False, _raise=True):
 	ocean_name = get_ocean_name(ocean_path)
 	exec_cmd(
@@ -390,6 +731,7 @@ To avoid seeing this warning, set shallow_clone to false in your common_site_con
 		validate_upgrade(version_upgrade[1], version_upgrade[2], ocean_path=ocean_path)
 
 
+@job(title="Updating Ocean", success="Ocean Updated")
 def update(
 	pull: bool = False,
 	apps: str = None,
@@ -402,6 +744,10 @@ def update(
 	reset: bool = False,
 	restart_supervisor: bool = False,
 	restart_systemd: bool = False,
+	jobs: int = None,
+	fetch_timeout: int = None,
+	force_requirements: bool = False,
+	migrate_jobs: int = 1,
 ):
 	"""command: ocean update"""
 	import re
@@ -440,19 +786,24 @@ def update(
 
 	if backup:
 		print("Backing up sites...")
-		backup_all_sites(ocean_path=ocean_path)
+		with StepTimer("Backing Up Sites", ocean_path=ocean_path):
+			backup_all_sites(ocean_path=ocean_path)
 
 	if pull:
 		print("Updating apps source...")
-		pull_apps(apps=apps, ocean_path=ocean_path, reset=reset)
+		with StepTimer("Pulling Apps", ocean_path=ocean_path):
+			pull_apps(
+				apps=apps, ocean_path=ocean_path, reset=reset, jobs=jobs, timeout=fetch_timeout
+			)
 
 	if requirements:
 		print("Setting up requirements...")
-		ocean.setup.requirements()
+		ocean.setup.requirements(skip_unchanged=not force_requirements)
 
 	if patch:
 		print("Patching sites...")
-		patch_sites(ocean_path=ocean_path)
+		with StepTimer("Patching Sites", ocean_path=ocean_path):
+			patch_sites(ocean_path=ocean_path, jobs=migrate_jobs)
 
 	if build:
 		print("Building assets...")
@@ -478,15 +829,17 @@ def clone_apps_from(ocean_path, clone_from, update_app=True):
 	from ocean.app import install_app
 
 	print(f"Copying apps from {clone_from}...")
-	subprocess.check_output(["cp", "-R", os.path.join(clone_from, "apps"), ocean_path])
+	clone_tree(os.path.join(clone_from, "apps"), os.path.join(ocean_path, "apps"))
 
 	node_modules_path = os.path.join(clone_from, "node_modules")
 	if os.path.exists(node_modules_path):
 		print(f"Copying node_modules from {clone_from}...")
-		subprocess.check_output(["cp", "-R", node_modules_path, ocean_path])
+		clone_tree(node_modules_path, os.path.join(ocean_path, "node_modules"))
+
+	install_requirements_from_wheels(ocean_path, clone_from)
 
-	def setup_app(app):
-		# run git reset --hard in each branch, pull latest updates and install_app
+	def pull_app(app):
+		# run git reset --hard in each branch & pull latest updates
 		app_path = os.path.join(ocean_path, "apps", app)
 
 		# remove .egg-ino
@@ -505,13 +858,113 @@ def clone_apps_from(ocean_path, clone_from, update_app=True):
 			subprocess.check_output(["git", "reset", "--hard"], cwd=app_path)
 			subprocess.check_output(["git", "pull", "--rebase", remote, branch], cwd=app_path)
 
-		install_app(app, ocean_path, restart_ocean=False)
-
 	with open(os.path.join(clone_from, "sites", "apps.txt")) as f:
 		apps = f.read().splitlines()
 
 	for app in apps:
-		setup_app(app)
+		pull_app(app)
+
+	# one editable install of all apps, their dependencies are mostly in from wheels
+	install_python_requirements(apps, ocean_path=ocean_path)
+
+	for app in apps:
+		install_app(app, ocean_path=ocean_path, restart_ocean=False, skip_pip=True)
+
+
+# ioctl of linux to share a file's extents with another, on btrfs, xfs & the like
+FICLONE = 0x40049409
+
+
+def clone_tree(src, dst):
+	"""Copies the src directory to dst, sharing file contents with src wherever that's
+	safe. Files are reflinked where the filesystem supports it, otherwise git objects,
+	which are never modified in place, are hardlinked & the rest copied."""
+	can_reflink = sys.platform == "linux"
+
+	def clone_file(src_file, dst_file):
+		nonlocal can_reflink
+
+		if can_reflink:
+			try:
+				return reflink_file(src_file, dst_file)
+			except OSError as e:
+				if e.errno not in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY):
+					raise
+				can_reflink = False
+
+		if f"{os.sep}.git{os.sep}objects{os.sep}" in src_file:
+			try:
+				return os.link(src_file, dst_file)
+			except OSError:
+				pass
+
+		return shutil.copy2(src_file, dst_file)
+
+	# dst, like a new ocean's apps, may exist already & copytree can only merge into
+	# an existing directory from Python 3.8
+	os.makedirs(dst, exist_ok=True)
+	for entry in os.scandir(src):
+		dst_path = os.path.join(dst, entry.name)
+		if entry.is_symlink():
+			os.symlink(os.readlink(entry.path), dst_path)
+		elif entry.is_dir():
+			shutil.copytree(entry.path, dst_path, symlinks=True, copy_function=clone_file)
+		else:
+			clone_file(entry.path, dst_path)
+
+
+def reflink_file(src_file, dst_file):
+	import fcntl
+
+	with open(src_file, "rb") as src, open(dst_file, "wb") as dst:
+		try:
+			fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+		except OSError:
+			os.remove(dst_file)
+			raise
+
+	shutil.copystat(src_file, dst_file)
+
+
+def install_requirements_from_wheels(ocean_path, clone_from):
+	"""Installs the python packages of clone_from's env, other than its apps, in the
+	ocean's env from wheels in the host's wheel cache. Wheels missing from the cache are
+	built by clone_from's env first. Apps installed later find their dependencies met
+	& don't go to the index for them."""
+	import tempfile
+
+	from ocean.utils.wheels import add_to_wheelhouse, get_wheelhouse, prune_wheelhouse
+
+	wheelhouse = get_wheelhouse()
+	src_python = get_env_cmd("python", ocean_path=clone_from)
+	python = get_env_cmd("python", ocean_path=ocean_path)
+
+	requirements = get_cmd_output(f"{src_python} -m pip freeze --exclude-editable")
+	if not requirements.strip():
+		return
+
+	os.makedirs(wheelhouse, exist_ok=True)
+	print(f"Installing python packages of {clone_from} from {wheelhouse}...")
+
+	with tempfile.TemporaryDirectory(dir=wheelhouse) as wheel_dir:
+		requirements_path = os.path.join(wheel_dir, "requirements.txt")
+		with open(requirements_path, "w") as f:
+			f.write(requirements)
+
+		try:
+			exec_cmd(
+				f"{src_python} -m pip wheel --quiet --find-links {wheelhouse} --wheel-dir {wheel_dir} -r {requirements_path}"
+			)
+			for filename in os.listdir(wheel_dir):
+				if filename.endswith(".whl"):
+					add_to_wheelhouse(os.path.join(wheel_dir, filename), wheelhouse)
+			prune_wheelhouse(wheelhouse)
+			exec_cmd(
+				f"{python} -m pip install --quiet --no-index --find-links {wheelhouse} -r {requirements_path}"
+			)
+		except CommandFailedError:
+			# apps still pull in what they need when they're installed
+			log("Couldn't install python packages from wheels, falling back to pip", level=3)
 
 
 def remove_backups_crontab(ocean_path="."):
@@ -1,5 +1,15 @@
 # imports - standard imports
+import inspect
+import json
+import logging
+import math
+import os
+import resource
+import shutil
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from io import StringIO
 
 # imports - third party imports
@@ -8,6 +18,14 @@ import click
 # imports - module imports
 import ocean
 
+logger = logging.getLogger(ocean.PROJECT_NAME)
+
+# timings of jobs & steps run in this process, in the order they started
+STEP_TIMINGS = []
+# thread ident: steps running in that thread, outermost first
+_running_steps = {}
+_step_lock = threading.Lock()
+
 
 class Capturing(list):
 	"""
@@ -31,6 +49,142 @@ class Capturing(list):
 		sys.stdout = self._stdout
 
 
+class DynamicFeed:
+	"""Prints jobs & steps of the dynamic feed, one line each, and marks them done.
+
+	On a terminal, a finished step's line is rewritten in place using cursor movement,
+	as long as nothing else was printed after it and it hasn't scrolled out of view.
+	Otherwise, and when stdout isn't a terminal, the finished step is printed as a new
+	line. Output not printed by the feed is detected by wrapping sys.stdout while the
+	feed is entered, as a context manager; output of child processes has to be flagged
+	with mark_foreign_output. Entries & LOG_BUFFER are only updated through the feed,
+	under its lock, so steps can be rendered from any thread.
+	"""
+
+	def __init__(self, stream=None):
+		self.stream = stream or sys.stdout
+		self.tty = self.stream.isatty()
+		# rows printed by the feed since anything else was printed
+		self.rows = 0
+		# bumped whenever anything else is printed, entries of older generations can't
+		# be reached with the cursor anymore
+		self.generation = 0
+		self.lock = threading.RLock()
+		# nested jobs & steps using the feed, sys.stdout is restored when none are left
+		self.users = 0
+		self._stdout = None
+
+	def __enter__(self):
+		with self.lock:
+			if self.tty and not self.users:
+				self._stdout, sys.stdout = sys.stdout, FeedStream(self.stream, self)
+			self.users += 1
+		return self
+
+	def __exit__(self, *args):
+		with self.lock:
+			self.users -= 1
+			if self._stdout and not self.users:
+				sys.stdout, self._stdout = self._stdout, None
+
+	def mark_foreign_output(self):
+		with self.lock:
+			self.generation += 1
+			self.rows = 0
+
+	def add(self, message, prefix, is_parent=False) -> dict:
+		entry = {"message": message, "prefix": prefix, "color": None, "is_parent": is_parent}
+		with self.lock:
+			ocean.LOG_BUFFER.append(entry)
+			self.print_entry(entry)
+		return entry
+
+	def log(self, message, prefix, color=None):
+		"""Records a message printed outside the feed, like by ocean.utils.log"""
+		entry = {"message": message, "prefix": prefix, "color": color, "is_parent": False}
+		with self.lock:
+			ocean.LOG_BUFFER.append(entry)
+
+	def done(self, entry, message, prefix):
+		with self.lock:
+			entry.update({"message": message, "prefix": prefix})
+			text = self.format_entry(entry)
+			up = self.rows - entry["row"]
+
+			if (
+				self.tty
+				and entry["generation"] == self.generation
+				and entry["height"] == self.get_height(text) == 1
+				and up < shutil.get_terminal_size().lines
+			):
+				self.write(f"\x1b[{up}A\r\x1b[2K{text}\x1b[{up}B\r")
+			else:
+				self.print_entry(entry)
+
+	def print_entry(self, entry):
+		text = self.format_entry(entry)
+		entry.update(
+			{"generation": self.generation, "row": self.rows, "height": self.get_height(text)}
+		)
+		self.write(f"{text}\n")
+		self.rows += entry["height"]
+
+	def write(self, text):
+		# straight to the terminal, so that it isn't taken for foreign output
+		self.stream.write(text)
+		self.stream.flush()
+
+	@staticmethod
+	def format_entry(entry) -> str:
+		hierarchy = "" if entry.get("is_parent") else "  "
+		message = entry["message"]
+		if entry["color"]:
+			message = click.style(message, fg=entry["color"])
+		return f"{hierarchy}{entry['prefix']} {message}"
+
+	@staticmethod
+	def get_height(text) -> int:
+		columns = shutil.get_terminal_size().columns
+		return sum(
+			max(math.ceil(len(line) / columns), 1) for line in click.unstyle(text).split("\n")
+		)
+
+
+class FeedStream:
+	"""Wraps sys.stdout, while the dynamic feed is entered, to let it know of output it
+	didn't print"""
+
+	def __init__(self, stream, feed):
+		self._stream = stream
+		self._feed = feed
+
+	def write(self, text):
+		if text:
+			self._feed.mark_foreign_output()
+		return self._stream.write(text)
+
+	def __getattr__(self, name):
+		return getattr(self._stream, name)
+
+
+_feed = None
+
+
+def get_feed() -> DynamicFeed:
+	global _feed
+
+	if not _feed:
+		_feed = DynamicFeed()
+	return _feed
+
+
+def mark_foreign_output():
+	"""Lets the dynamic feed, if in use, know that something like a child process printed
+	to the terminal directly"""
+	if _feed:
+		_feed.mark_foreign_output()
+
+
 class Rendering:
 	def __init__(self, success, title, is_parent, args, kwargs):
 		import ocean.cli
@@ -54,18 +208,9 @@ class Rendering:
 			return
 
 		_prefix = click.style("⏼", fg="bright_yellow")
-		_hierarchy = "" if self.is_parent else "  "
 		self._title = self.title.format(**self.kw)
-		click.secho(f"{_hierarchy}{_prefix} {self._title}")
-
-		ocean.LOG_BUFFER.append(
-			{
-				"message": self._title,
-				"prefix": _prefix,
-				"color": None,
-				"is_parent": self.is_parent,
-			}
-		)
+		self.feed = get_feed().__enter__()
+		self.entry = self.feed.add(self._title, _prefix, is_parent=self.is_parent)
 
 	def __exit__(self, *args, **kwargs):
 		if not self.dynamic_feed:
@@ -74,17 +219,159 @@ class Rendering:
 		self._prefix = click.style("✔", fg="green")
 		self._success = self.success.format(**self.kw)
 
-		self.render_screen()
+		try:
+			self.render_screen()
+		finally:
+			self.feed.__exit__(*args)
 
 	def render_screen(self):
-		click.clear()
+		self.feed.done(self.entry, self._success, self._prefix)
 
-		for l in ocean.LOG_BUFFER:
-			if l["message"] == self._title:
-				l["prefix"] = self._prefix
-				l["message"] = self._success
-			_hierarchy = "" if l.get("is_parent") else "  "
-			click.secho(f'{_hierarchy}{l["prefix"]} {l["message"]}', fg=l["color"])
+
+class StepTimer:
+	"""Records wall time, CPU time of this process & of waited for child processes, and
+	peak RSS of a job or step. Peak RSS is the high water mark when the step ended, as
+	getrusage can't attribute it to a step. CPU & RSS are of the whole process, steps
+	running concurrently in other threads are counted in each other's.
+
+	Steps nest per thread, a step started in a worker thread is nested under what the
+	main thread is running. Timings are logged to logs/ocean.log as steps finish and
+	appended to logs/timings.jsonl once no step is running in any thread."""
+
+	def __init__(self, title, is_parent=False, ocean_path=None):
+		self.record = {"title": title, "is_parent": is_parent}
+		self.ocean_path = ocean_path
+
+	def __enter__(self):
+		self.start = time.perf_counter()
+		self.self_usage = resource.getrusage(resource.RUSAGE_SELF)
+		self.children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+		with _step_lock:
+			running = _running_steps.setdefault(threading.get_ident(), [])
+			if running:
+				depth = running[-1].record["depth"] + 1
+			else:
+				depth = len(_running_steps.get(threading.main_thread().ident, []))
+
+			self.record.update({"depth": depth, "started_at": time.time()})
+			STEP_TIMINGS.append(self.record)
+			running.append(self)
+
+		return self
+
+	def __exit__(self, exc_type, *args):
+		self_usage = resource.getrusage(resource.RUSAGE_SELF)
+		children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+		with _step_lock:
+			running = _running_steps[threading.get_ident()]
+			running.remove(self)
+			if not running:
+				del _running_steps[threading.get_ident()]
+
+			self.record.update(
+				{
+					"wall": round(time.perf_counter() - self.start, 4),
+					"cpu": round(get_cpu_time(self_usage) - get_cpu_time(self.self_usage), 4),
+					"children_cpu": round(
+						get_cpu_time(children_usage) - get_cpu_time(self.children_usage), 4
+					),
+					"max_rss_kb": self_usage.ru_maxrss,
+					"children_max_rss_kb": children_usage.ru_maxrss,
+					"failed": exc_type is not None,
+				}
+			)
+
+			if not _running_steps:
+				write_step_timings(self.ocean_path or ".")
+
+		logger.info(
+			f"{self.record['title']} {'failed after' if exc_type else 'took'}"
+			f" {self.record['wall']:.2f}s (cpu {self.record['cpu']:.2f}s, child processes"
+			f" cpu {self.record['children_cpu']:.2f}s)"
+		)
+
+
+def get_cpu_time(usage) -> float:
+	return usage.ru_utime + usage.ru_stime
+
+
+def write_step_timings(ocean_path="."):
+	"""Appends timings of steps that ran in this process to logs/timings.jsonl, if the
+	ocean has a logs directory. Called with _step_lock held."""
+	logs_path = os.path.join(ocean_path, "logs")
+	if not os.path.isdir(logs_path):
+		return
+
+	command = " ".join(sys.argv)
+	try:
+		with open(os.path.join(logs_path, "timings.jsonl"), "a") as f:
+			for record in STEP_TIMINGS:
+				if not record.get("written") and "wall" in record:
+					f.write(json.dumps({"command": command, **record}) + "\n")
+					record["written"] = True
+	except OSError:
+		logger.warning("Couldn't write step timings", exc_info=True)
+
+
+def print_step_timings():
+	"""Prints timings of jobs & steps run in this process as a tree"""
+	with _step_lock:
+		records = list(STEP_TIMINGS)
+
+	rows = [
+		[
+			"  " * record["depth"] + record["title"] + (" (failed)" if record.get("failed") else ""),
+			f"{record['wall']:.2f}s",
+			f"{record['cpu']:.2f}s",
+			f"{record['children_cpu']:.2f}s",
+			f"{max(record['max_rss_kb'], record['children_max_rss_kb']) // 1024}MB",
+		]
+		for record in records
+		if "wall" in record
+	]
+
+	if rows:
+		click.echo(render_table(["Step", "Wall", "CPU", "Child CPU", "Peak RSS"], rows))
+		click.echo(
+			"CPU & peak RSS are of the whole process, steps that overlapped count each other's"
+		)
+
+
+@contextmanager
+def print_step_timings_on_exit(enabled=True):
+	"""Prints the step timings tree once the block exits, even if it failed"""
+	try:
+		yield
+	finally:
+		if enabled:
+			print_step_timings()
+
+
+def get_step_arguments(fn, args, kwargs) -> dict:
+	try:
+		return inspect.signature(fn).bind(*args, **kwargs).arguments
+	except TypeError:
+		return kwargs
+
+
+def get_step_title(title, arguments) -> str:
+	# methods' titles are formatted with attributes of the instance, as in Rendering
+	instance = arguments.get("self")
+	kw = instance.__dict__ if instance is not None else arguments
+
+	try:
+		return title.format(**kw)
+	except (KeyError, IndexError, AttributeError):
+		return title
+
+
+def get_step_ocean_path(arguments):
+	instance = arguments.get("self")
+	return (
+		arguments.get("ocean_path") or arguments.get("path") or getattr(instance, "cwd", None)
+	)
 
 
 def job(title: str = None, success: str = None):
@@ -95,7 +382,12 @@ def job(title: str = None, success: str = None):
 
 	def innfn(fn):
 		def wrapper_fn(*args, **kwargs):
-			with Rendering(
+			arguments = get_step_arguments(fn, args, kwargs)
+			with StepTimer(
+				get_step_title(title, arguments),
+				is_parent=True,
+				ocean_path=get_step_ocean_path(arguments),
+			), Rendering(
 				success=success,
 				title=title,
 				is_parent=True,
@@ -116,7 +408,10 @@ def step(title: str = None, success: str = None):
 
 	def innfn(fn):
 		def wrapper_fn(*args, **kwargs):
-			with Rendering(
+			arguments = get_step_arguments(fn, args, kwargs)
+			with StepTimer(
+				get_step_title(title, arguments), ocean_path=get_step_ocean_path(arguments)
+			), Rendering(
 				success=success,
 				title=title,
 				is_parent=False,
@@ -128,3 +423,20 @@ def step(title: str = None, success: str = None):
 		return wrapper_fn
 
 	return innfn
+
+
+def render_table(headers: list, rows: list) -> str:
+	"""Returns rows as a plain text table with columns aligned to the widest cell"""
+	rows = [[str(cell) for cell in row] for row in rows]
+	widths = [
+		max(len(str(header)), *(len(row[idx]) for row in rows)) if rows else len(str(header))
+		for idx, header in enumerate(headers)
+	]
+
+	def fmt(row):
+		return "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+
+	lines = [fmt([str(h) for h in headers]), fmt(["-" * width for width in widths])]
+	lines.extend(fmt(row) for row in rows)
+
+	return "\n".join(lines)
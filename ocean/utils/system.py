@@ -12,6 +12,7 @@ from ocean.utils import (
 	get_process_manager,
 	log,
 	run_frappe_cmd,
+	run_frappe_cmd_with_log,
 	sudoers_file,
 	which,
 	is_valid_frappe_branch,
@@ -19,6 +20,9 @@ from ocean.utils import (
 from ocean.utils.ocean import build_assets, clone_apps_from
 from ocean.utils.render import job
 
+# what follows the site in file names of frappe's backups
+BACKUP_KINDS = ("database", "files", "private-files", "site_config_backup")
+
 
 @job(title="Initializing Ocean {path}", success="Ocean {path} initialized")
 def init(
@@ -172,15 +176,140 @@ def migrate_site(site, ocean_path="."):
 	run_frappe_cmd("--site", site, "migrate", ocean_path=ocean_path)
 
 
+def migrate_sites(sites, jobs=4, ocean_path=".") -> dict:
+	"""Migrates sites concurrently, running at most `jobs` migrations at a time. Output of
+	each migration is written to logs/migrate/{site}.log"""
+	return run_on_sites("migrate", sites, jobs=jobs, ocean_path=ocean_path)
+
+
+def run_on_sites(command, sites, jobs=4, ocean_path=".", nice=None, ionice_class=None) -> dict:
+	"""Runs a framework command for each site, at most `jobs` at a time, optionally with
+	a lower CPU (nice) and I/O (ionice_class) scheduling priority. Output for each site is
+	written to logs/{command}/{site}.log, or printed if jobs is 1. Returns a dict of site
+	to (exit code, duration in seconds, log file or None)"""
+	from concurrent.futures import ThreadPoolExecutor
+	from time import monotonic
+
+	logs_path = os.path.join(ocean_path, "logs", command) if jobs > 1 else None
+
+	def _run(site):
+		log_file = os.path.join(logs_path, f"{site}.log") if logs_path else None
+		start = monotonic()
+		return_code = run_frappe_cmd_with_log(
+			"--site",
+			site,
+			command,
+			log_file=log_file,
+			ocean_path=ocean_path,
+			nice=nice,
+			ionice_class=ionice_class,
+		)
+		return return_code, monotonic() - start, log_file
+
+	if logs_path:
+		log(f"Running {command} for {len(sites)} sites, {jobs} at a time. Logs: {logs_path}")
+
+	with ThreadPoolExecutor(max_workers=jobs) as executor:
+		return dict(zip(sites, executor.map(_run, sites)))
+
+
 def backup_site(site, ocean_path="."):
 	run_frappe_cmd("--site", site, "backup", ocean_path=ocean_path)
 
 
-def backup_all_sites(ocean_path="."):
+def backup_all_sites(ocean_path=".", jobs=None, nice=None, ionice_class=None):
+	"""Backs up all sites, `jobs` at a time. Defaults for jobs, nice and ionice_class are
+	read from the backup_jobs, backup_nice and backup_ionice_class keys of
+	common_site_config.json. Every site is attempted, failures are raised at the end"""
+	from time import time
+
 	from ocean.ocean import Ocean
+	from ocean.exceptions import CommandFailedError, ValidationError
+	from ocean.utils.render import render_table
+
+	ocean = Ocean(ocean_path)
+	conf = ocean.conf
+	sites = ocean.sites
+
+	jobs = jobs or conf.get("backup_jobs") or 1
+	nice = nice if nice is not None else conf.get("backup_nice")
+	ionice_class = ionice_class or conf.get("backup_ionice_class")
+
+	# the realtime class (1) needs root & would starve everything else of I/O
+	if ionice_class and int(ionice_class) not in (2, 3):
+		raise ValidationError(f"ionice class for backups must be 2 or 3, not {ionice_class}")
+
+	if not sites:
+		return
+
+	started_at = time()
+	results = run_on_sites(
+		"backup",
+		sites,
+		jobs=jobs,
+		ocean_path=ocean_path,
+		nice=nice,
+		ionice_class=ionice_class,
+	)
+
+	rows = []
+	for site, (return_code, duration, log_file) in results.items():
+		size = get_backup_size(site, since=started_at, ocean_path=ocean_path)
+		rows.append(
+			[
+				site,
+				"failed" if return_code else "backed up",
+				f"{duration:.1f}s",
+				"-" if return_code else f"{size / 1024 ** 2:.1f} MB",
+				log_file or "-",
+			]
+		)
+	print("\n" + render_table(["Site", "Status", "Duration", "Size", "Log"], rows) + "\n")
+
+	failed = [site for site, (return_code, *_) in results.items() if return_code]
+	if failed:
+		raise CommandFailedError(f"Backup failed for {len(failed)} site(s): {', '.join(failed)}")
+
+
+def get_backup_size(site, since=0, ocean_path=".") -> int:
+	"""Returns total size in bytes of the site's backup files modified after `since`.
+	Files are matched by name as sites may share a backup_path"""
+	size = 0
+	backups_path = get_backup_path(site, ocean_path=ocean_path)
+	# frappe names them {timestamp}-{site with . replaced by _}-{kind}
+	prefix = f"{site.replace('.', '_')}-"
+
+	try:
+		entries = os.scandir(backups_path)
+	except FileNotFoundError:
+		return size
+
+	with entries:
+		for entry in entries:
+			name = entry.name.partition("-")[2]
+			if not (name.startswith(prefix) and name[len(prefix) :].startswith(BACKUP_KINDS)):
+				continue
+			if entry.is_file() and entry.stat().st_mtime >= since:
+				size += entry.stat().st_size
+
+	return size
+
+
+def get_backup_path(site, ocean_path=".") -> str:
+	"""Returns the directory the site is backed up to, backup_path from its site config or
+	common_site_config.json if set, relative to sites like the framework resolves it"""
+	from ocean.config.common_site_config import get_config
+	from ocean.config.site_config import get_site_config
+
+	sites_path = os.path.join(ocean_path, "sites")
+	backup_path = (
+		get_site_config(site, ocean_path=ocean_path).get("backup_path")
+		or get_config(ocean_path).get("backup_path")
+	)
 
-	for site in Ocean(ocean_path).sites:
-		backup_site(site, ocean_path=ocean_path)
+	if backup_path:
+		return os.path.join(sites_path, backup_path)
+	return os.path.join(sites_path, site, "private", "backups")
 
 
 def fix_prod_setup_perms(ocean_path=".", frappe_user=None):
@@ -0,0 +1,147 @@
+# imports - standard imports
+import hashlib
+import os
+import tempfile
+from shlex import quote
+from typing import List
+
+# imports - module imports
+from ocean.utils import canonicalize_name, get_cache_path
+
+# what pip assumes for projects that don't declare a build system
+DEFAULT_BUILD_REQUIREMENTS = ["setuptools>=40.8.0", "wheel"]
+# shared by all users of the host if it exists & is writable, it isn't created here as
+# making it writable for every user that runs ocean is up to the admin
+HOST_WHEELHOUSE = "/var/cache/ocean/wheels"
+
+
+def get_wheelhouse() -> str:
+	"""Returns OCEAN_WHEELHOUSE if set, else the host wide wheelhouse if it's writable,
+	else the user's. Wheels are stored once by content under sha256/ & linked by file
+	name at the top, which is what pip's --find-links looks at"""
+	if os.environ.get("OCEAN_WHEELHOUSE"):
+		return os.environ["OCEAN_WHEELHOUSE"]
+
+	if os.access(HOST_WHEELHOUSE, os.W_OK):
+		return HOST_WHEELHOUSE
+
+	return get_cache_path("wheels")
+
+
+def get_wheelhouse_args(conf) -> str:
+	"""Returns pip install args to install from the wheelhouse if use_wheelhouse is set in
+	common_site_config.json, with nothing from the index if wheelhouse_only is set too"""
+	if not conf.get("use_wheelhouse"):
+		return ""
+
+	args = f"--find-links {get_wheelhouse()}"
+	if conf.get("wheelhouse_only"):
+		args += " --no-index"
+
+	return args
+
+
+def build_wheels(ocean_path=".", apps=None, verbose=False) -> List[str]:
+	"""Builds wheels of everything apps need to be installed, their dependencies & build
+	systems, into the wheelhouse. Wheels already in it are reused, not rebuilt. Returns
+	file names of the wheels."""
+	from ocean.ocean import Ocean
+
+	ocean = Ocean(ocean_path)
+	apps = apps or list(ocean.apps)
+	app_paths = [os.path.abspath(os.path.join(ocean.name, "apps", app)) for app in apps]
+	app_names = {canonicalize_name(app) for app in apps}
+
+	wheelhouse = get_wheelhouse()
+	os.makedirs(wheelhouse, exist_ok=True)
+	requirements = " ".join(quote(r) for r in get_build_requirements(app_paths) + app_paths)
+	quiet_flag = "" if verbose else "--quiet"
+	wheels = []
+
+	# built next to the wheelhouse, so wheels can be moved in instead of copied
+	with tempfile.TemporaryDirectory(dir=wheelhouse) as wheel_dir:
+		ocean.run(
+			f"{ocean.python} -m pip wheel {quiet_flag} --find-links {wheelhouse} --wheel-dir {wheel_dir} {requirements}"
+		)
+
+		for filename in sorted(os.listdir(wheel_dir)):
+			# apps are installed editable, their own wheels are of no use
+			if canonicalize_name(filename.split("-", 1)[0]) in app_names:
+				continue
+
+			add_to_wheelhouse(os.path.join(wheel_dir, filename), wheelhouse)
+			wheels.append(filename)
+
+	prune_wheelhouse(wheelhouse)
+	return wheels
+
+
+def add_to_wheelhouse(wheel_path, wheelhouse) -> str:
+	"""Moves the wheel into the wheelhouse by its sha256 & links it by its file name,
+	returns the path it's stored at"""
+	sha256 = hashlib.sha256()
+	with open(wheel_path, "rb") as f:
+		for chunk in iter(lambda: f.read(1024 * 1024), b""):
+			sha256.update(chunk)
+	digest = sha256.hexdigest()
+
+	stored_path = os.path.join(wheelhouse, "sha256", digest[:2], f"{digest}.whl")
+	link_path = os.path.join(wheelhouse, os.path.basename(wheel_path))
+	tmp_path = f"{link_path}.{os.getpid()}.tmp"
+
+	# linked by name before it's stored, so prune_wheelhouse never sees it unlinked
+	try:
+		os.link(stored_path, tmp_path)
+	except FileNotFoundError:
+		os.makedirs(os.path.dirname(stored_path), exist_ok=True)
+		os.link(wheel_path, tmp_path)
+		os.replace(wheel_path, stored_path)
+	os.replace(tmp_path, link_path)
+
+	# renaming onto a link to the same file does nothing, leaving tmp_path behind
+	if os.path.lexists(tmp_path):
+		os.remove(tmp_path)
+
+	return stored_path
+
+
+def prune_wheelhouse(wheelhouse) -> int:
+	"""Removes stored wheels no file name links to anymore, like earlier builds of a
+	wheel that was rebuilt. Returns the number of bytes freed."""
+	freed = 0
+
+	for root, _, filenames in os.walk(os.path.join(wheelhouse, "sha256")):
+		for filename in filenames:
+			path = os.path.join(root, filename)
+			try:
+				stat = os.stat(path)
+				if stat.st_nlink == 1:
+					os.remove(path)
+					freed += stat.st_size
+			except FileNotFoundError:
+				continue
+
+	return freed
+
+
+def get_build_requirements(app_paths) -> List[str]:
+	"""Returns build system requirements of apps, from their pyproject.toml"""
+	try:
+		from tomli import load
+	except ImportError:
+		from tomllib import load
+
+	requirements = []
+
+	for app_path in app_paths:
+		try:
+			with open(os.path.join(app_path, "pyproject.toml"), "rb") as f:
+				build_system = load(f).get("build-system", {})
+		except FileNotFoundError:
+			build_system = {}
+
+		for requirement in build_system.get("requires", DEFAULT_BUILD_REQUIREMENTS):
+			if requirement not in requirements:
+				requirements.append(requirement)
+
+	return requirements